@@ -7,6 +7,7 @@ Usage:
     python3 fetch_sleeper.py --season 2024      # Fetch a specific season
     python3 fetch_sleeper.py --all              # Fetch all seasons (skips cached)
     python3 fetch_sleeper.py --all --force      # Re-fetch everything, ignore cache
+    python3 fetch_sleeper.py --live [--sim]     # Poll in-game win probabilities for the current week
 
 Past seasons are immutable — once cached, they are skipped automatically.
 Use --force to override this and re-fetch from the API.
@@ -15,17 +16,32 @@ Data is saved to ./data/ as JSON files that the season.html page can consume.
 No dependencies beyond the Python 3 standard library.
 """
 
+import array
+import hashlib
+import heapq
 import json
+import math
 import os
+import random
 import sys
 import time
 import urllib.request
 import urllib.error
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
 
 BASE_URL = "https://api.sleeper.app/v1"
 DATA_DIR = Path(__file__).parent / "data"
+HISTORY_DIR = DATA_DIR / "history"  # Sharded league history for lazy loading
+OWNERSHIP_INDEX = DATA_DIR / "ownership_index.json"  # player_id -> who held them, week by week
+PLAYER_POINTS = DATA_DIR / "player_points.bin"       # Every rostered player's points, every team-week
+TRADE_LEDGER = DATA_DIR / "trade_ledger.json"
+WAIVER_MARKET = DATA_DIR / "waiver_market.json"
+RECORD_WATCH = DATA_DIR / "record_watch.json"        # Record thresholds in force before every week
 
 # League IDs by season (dynasty league carries over each year)
 LEAGUE_IDS = {
@@ -40,6 +56,73 @@ LEAGUE_IDS = {
 # We'll detect the actual number from league settings
 DEFAULT_REG_WEEKS = 14
 PLAYOFF_WEEKS = 4  # Weeks after regular season
+DEFAULT_PLAYOFF_TEAMS = 6
+
+# Playoff-odds Monte Carlo
+PLAYOFF_SIMS = 20000       # Simulated seasons per week
+PLAYOFF_SIM_CHUNK = 5000   # Simulations per worker task
+SCORE_PRIOR_WEEKS = 3      # Pseudo-weeks of league-average scoring blended into each team's model
+
+# Schedule luck: random alternative schedules evaluated per season
+SCHEDULE_LUCK_SIMS = 20000
+
+# Live win probability: a starter's remaining-points SD as a fraction of their projection
+LIVE_POSITION_SD = {"QB": 0.40, "RB": 0.55, "WR": 0.60, "TE": 0.65, "K": 0.50, "DEF": 0.60}
+LIVE_DEFAULT_SD = 0.60
+LIVE_SIMS = 10000  # Draws per matchup when --sim is on
+
+# Trade ledger windows: name -> (first, last) season offsets from the trade.
+# Offset 0 starts at the trade's week; later offsets cover whole seasons.
+TRADE_WINDOWS = {
+    "rest_of_season": (0, 0),
+    "next_season": (1, 1),
+    "through_next_season": (0, 1),
+}
+TRADE_RANK_WINDOW = "through_next_season"  # Ledger is ranked by the points gap in this window
+
+# Waiver market: a pickup is a "hit" once it starts this many games for its new team that season
+WAIVER_HIT_STARTS = 3
+WAIVER_TOP_PICKUPS = 25
+
+# Record book: category -> True if bigger is better
+RECORD_CATEGORIES = {
+    "highest_score": True,
+    "lowest_winning_score": False,
+    "biggest_blowout": True,
+    "highest_combined": True,
+    "lowest_combined": False,
+    "longest_win_streak": True,
+    "longest_losing_streak": True,
+}
+# Placeholder shown when a category has no qualifying games yet
+RECORD_DEFAULTS = {
+    "highest_score": {"points": 0},
+    "lowest_winning_score": {"points": 99999},
+    "biggest_blowout": {"margin": 0},
+    "highest_combined": {"points": 0},
+    "lowest_combined": {"points": 99999},
+    "longest_win_streak": {"count": 0, "team": "?", "owner_id": ""},
+    "longest_losing_streak": {"count": 0, "team": "?", "owner_id": ""},
+}
+LEADERBOARD_SIZE = 25  # Entries kept per record leaderboard (ties at the cutoff included)
+# Per-franchise personal bests tracked by the record watch (True = higher is better)
+PERSONAL_RECORD_CATEGORIES = {
+    "highest_score": True,
+    "biggest_win": True,
+}
+RECORD_WATCH_MARGIN = 10.0  # A game this many points short of a record counts as "near"
+
+# Elo model (see scripts/backtest_elo.py for tuning these against history)
+ELO_BASE = 1500
+ELO_K = 32
+ELO_MEAN_REGRESSION = 0.15  # Regress 15% toward ELO_BASE between seasons
+ELO_MARGIN_SCALE = 20       # K multiplier is sqrt(margin / scale), floored at 1; 0 disables
+
+# Glicko-2 model (rated alongside Elo; scale matches Elo, 1500 = average)
+GLICKO_INITIAL_RD = 350
+GLICKO_VOLATILITY = 0.06
+GLICKO_TAU = 0.5               # Constrains volatility change per rating period
+GLICKO_OFFSEASON_PERIODS = 10  # Idle rating periods the offseason counts as
 
 
 def fetch_json(endpoint, retries=3, delay=1):
@@ -79,6 +162,14 @@ def fetch_players():
     return players
 
 
+def fetch_projections(season, week, season_type="regular"):
+    """Fetch one week of Sleeper player projections (not part of the v1 API)."""
+    proj_url = f"https://api.sleeper.app/projections/nfl/{season}/{week}?season_type={season_type}"
+    req = urllib.request.Request(proj_url, headers={"User-Agent": "JailyardDynasty/1.0"})
+    with urllib.request.urlopen(req, timeout=15) as resp:
+        return json.loads(resp.read().decode())
+
+
 def fetch_season(season, league_id):
     """Fetch all data for a single season and save to data/."""
     print(f"\n{'='*60}")
@@ -123,6 +214,7 @@ def fetch_season(season, league_id):
     # 4. Weekly matchups
     print(f"\n[4/6] Matchups (weeks 1-{total_weeks})...")
     all_matchups = {}
+    unplayed = []  # The first unscored week's matchups, reused for its pairings below
     for week in range(1, total_weeks + 1):
         matchups = fetch_json(f"/league/{league_id}/matchups/{week}")
         if matchups:
@@ -130,6 +222,7 @@ def fetch_season(season, league_id):
             has_data = any(m.get("points", 0) > 0 for m in matchups)
             if not has_data:
                 print(f"  Week {week}: no scores (season may not have reached this week)")
+                unplayed = matchups
                 break
             all_matchups[str(week)] = matchups
             total_pts = sum(m.get("points", 0) for m in matchups)
@@ -143,6 +236,21 @@ def fetch_season(season, league_id):
         json.dump(all_matchups, f, indent=2)
     print(f"  Saved {len(all_matchups)} weeks of matchups")
 
+    # Pairings for unplayed regular-season weeks (feeds the playoff-odds simulator)
+    future_schedule = {}
+    for week in range(len(all_matchups) + 1, reg_season_weeks + 1):
+        if week == len(all_matchups) + 1 and unplayed:
+            week_matchups = unplayed
+        else:
+            week_matchups = fetch_json(f"/league/{league_id}/matchups/{week}") or []
+            time.sleep(0.1)
+        pairs = matchup_pairings(week_matchups)
+        if not pairs:
+            break
+        future_schedule[str(week)] = pairs
+    if future_schedule:
+        print(f"  Found pairings for {len(future_schedule)} upcoming week(s)")
+
     # 5. Playoff brackets
     print("\n[5/6] Playoff brackets...")
     winners = fetch_json(f"/league/{league_id}/winners_bracket")
@@ -178,16 +286,13 @@ def fetch_season(season, league_id):
         season_type = "regular"
         if week >= playoff_week_start:
             season_type = "post"
-        proj_url = f"https://api.sleeper.app/projections/nfl/{season}/{week}?season_type={season_type}"
         try:
-            req = urllib.request.Request(proj_url, headers={"User-Agent": "JailyardDynasty/1.0"})
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                proj_data = json.loads(resp.read().decode())
-                if proj_data:
-                    all_projections[str(week)] = proj_data
-                    print(f"  Week {week}: {len(proj_data)} player projections")
-                else:
-                    print(f"  Week {week}: no projections available")
+            proj_data = fetch_projections(season, week, season_type)
+            if proj_data:
+                all_projections[str(week)] = proj_data
+                print(f"  Week {week}: {len(proj_data)} player projections")
+            else:
+                print(f"  Week {week}: no projections available")
         except Exception as e:
             print(f"  Week {week}: projections unavailable ({e})")
         time.sleep(0.1)
@@ -201,16 +306,55 @@ def fetch_season(season, league_id):
     # Build the combined data file for season.html
     print("\nBuilding combined season data...")
     build_season_data(season, season_dir, league, users, rosters, all_matchups,
-                      brackets=brackets, projections=all_projections)
+                      brackets=brackets, projections=all_projections,
+                      future_schedule=future_schedule)
 
     print(f"\nDone! Data saved to {season_dir}/")
 
 
+def fetch_game_status(season, week, season_type="regular"):
+    """
+    NFL team -> game status ("pre_game", "in_game" or "complete") for one
+    week, from Sleeper's NFL schedule (not part of the v1 API).
+    """
+    url = f"https://api.sleeper.app/schedule/nfl/{season_type}/{season}"
+    req = urllib.request.Request(url, headers={"User-Agent": "JailyardDynasty/1.0"})
+    with urllib.request.urlopen(req, timeout=15) as resp:
+        schedule = json.loads(resp.read().decode())
+    status = {}
+    for game in schedule or []:
+        if game.get("week") == week:
+            for side in ("home", "away"):
+                if game.get(side):
+                    status[game[side]] = game.get("status")
+    return status
+
+
+def projection_points(week_proj_data):
+    """Flatten one week of Sleeper projections into {player_id: projected points}."""
+    # Handle both dict and list formats from Sleeper API
+    if isinstance(week_proj_data, dict):
+        proj_iter = week_proj_data.items()
+    elif isinstance(week_proj_data, list):
+        proj_iter = ((item.get("player_id", ""), item) for item in week_proj_data if isinstance(item, dict))
+    else:
+        proj_iter = []
+    week_proj = {}
+    for pid, pdata in proj_iter:
+        if isinstance(pdata, dict):
+            # Sleeper projections use pts_ppr or pts_half_ppr or a generic pts field
+            proj_pts = pdata.get("pts_ppr", pdata.get("pts_half_ppr", pdata.get("pts_std", 0)))
+            if proj_pts:
+                week_proj[pid] = proj_pts
+    return week_proj
+
+
 def build_season_data(season, season_dir, league, users, rosters, all_matchups,
-                      brackets=None, projections=None):
+                      brackets=None, projections=None, future_schedule=None):
     """
     Build a single combined JSON file with everything the season.html page needs,
-    including computed power rankings for each week, projected scores, and bracket data.
+    including computed power rankings for each week, projected scores, bracket data
+    and simulated playoff odds after each regular-season week.
     """
     # Load players for name resolution
     players_db = fetch_players()
@@ -285,22 +429,7 @@ def build_season_data(season, season_dir, league, users, rosters, all_matchups,
             matchup_groups.setdefault(mid, []).append(m)
 
         # Get projections for this week (if available)
-        week_proj = {}
-        if projections and str(week) in projections:
-            week_proj_data = projections[str(week)]
-            # Handle both dict and list formats from Sleeper API
-            if isinstance(week_proj_data, dict):
-                proj_iter = week_proj_data.items()
-            elif isinstance(week_proj_data, list):
-                proj_iter = ((item.get("player_id", ""), item) for item in week_proj_data if isinstance(item, dict))
-            else:
-                proj_iter = []
-            for pid, pdata in proj_iter:
-                if isinstance(pdata, dict):
-                    # Sleeper projections use pts_ppr or pts_half_ppr or a generic pts field
-                    proj_pts = pdata.get("pts_ppr", pdata.get("pts_half_ppr", pdata.get("pts_std", 0)))
-                    if proj_pts:
-                        week_proj[pid] = proj_pts
+        week_proj = projection_points(projections.get(str(week))) if projections else {}
 
         # Build matchup results
         matchup_results = []
@@ -480,14 +609,1147 @@ def build_season_data(season, season_dir, league, users, rosters, all_matchups,
             "losers": brackets.get("losers") if brackets else None,
         },
         "has_projections": bool(projections),
+        "future_schedule": future_schedule or {},
     }
 
+    add_all_play(combined)
+    print("  Simulating playoff odds...")
+    add_playoff_odds(combined, settings.get("playoff_teams", DEFAULT_PLAYOFF_TEAMS))
+
     out_path = season_dir / "season_combined.json"
     with open(out_path, "w") as f:
         json.dump(combined, f, indent=2)
     print(f"  Combined data saved to {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB)")
 
 
+def matchup_pairings(matchups_raw):
+    """Group raw Sleeper matchup entries into [[roster_id, roster_id], ...] pairs."""
+    groups = {}
+    for m in matchups_raw:
+        mid = m.get("matchup_id")
+        if mid is not None:
+            groups.setdefault(mid, []).append(m["roster_id"])
+    return [pair for _, pair in sorted(groups.items()) if len(pair) == 2]
+
+
+def bracket_order(playoff_teams):
+    """
+    Seeds in first-round bracket order for a fixed (non-reseeding) bracket,
+    padded to a power of two. Seeds above playoff_teams are byes, e.g. six
+    teams -> [1, 8, 4, 5, 2, 7, 3, 6]: seeds 1 and 2 sit out round one.
+    """
+    order = [1]
+    while len(order) < playoff_teams:
+        size = len(order) * 2
+        order = [s for seed in order for s in (seed, size + 1 - seed)]
+    return order
+
+
+def _simulate_odds_chunk(job):
+    """
+    Play out the rest of a season `sims` times. Runs in a worker process.
+
+    Each team's weekly score is drawn from Normal(mean, sd); standings are
+    ordered by wins (ties count half) then points for, and the top seeds go
+    through a fixed bracket. Returns per-team counts of playoff berths, byes,
+    titles and the summed final seed.
+    """
+    wins, pf, means, sds, schedule, playoff_teams, sims, seed = job
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    n = len(wins)
+    order = bracket_order(playoff_teams)
+    bye_seeds = {order[i] for i in range(0, len(order), 2) if order[i + 1] > playoff_teams}
+    made, byes, titles, seed_sum = [0] * n, [0] * n, [0] * n, [0] * n
+
+    for _ in range(sims):
+        w = wins[:]
+        p = pf[:]
+        for week_pairs in schedule:
+            for a, b in week_pairs:
+                sa = gauss(means[a], sds[a])
+                sb = gauss(means[b], sds[b])
+                p[a] += sa
+                p[b] += sb
+                if sa > sb:
+                    w[a] += 1
+                else:
+                    w[b] += 1
+
+        standings = sorted(range(n), key=lambda i: (w[i], p[i]), reverse=True)
+        for rank, team in enumerate(standings, 1):
+            seed_sum[team] += rank
+        field = [standings[s - 1] if s <= playoff_teams else None for s in order]
+        for s in range(playoff_teams):
+            made[standings[s]] += 1
+            if s + 1 in bye_seeds:
+                byes[standings[s]] += 1
+
+        while len(field) > 1:
+            nxt = []
+            for i in range(0, len(field), 2):
+                a, b = field[i], field[i + 1]
+                if b is None or a is None:
+                    nxt.append(a if b is None else b)
+                else:
+                    nxt.append(a if gauss(means[a], sds[a]) > gauss(means[b], sds[b]) else b)
+            field = nxt
+        titles[field[0]] += 1
+
+    return made, byes, titles, seed_sum
+
+
+def simulate_playoff_odds(records, score_history, schedule, playoff_teams=DEFAULT_PLAYOFF_TEAMS,
+                          sims=PLAYOFF_SIMS, seed=0, workers=None):
+    """
+    Monte Carlo playoff, bye and championship odds.
+
+    records:       {roster_id: {"wins", "ties", "pf"}} as of now
+    score_history: {roster_id: [weekly points so far]}
+    schedule:      remaining regular-season weeks, each a list of (rid, rid) pairs
+
+    Team scoring is modelled from its own history, shrunk toward the league
+    average by SCORE_PRIOR_WEEKS pseudo-weeks. Simulations are split into
+    seeded chunks (so results are reproducible) and spread over a process pool.
+    Returns {roster_id: {"playoff", "bye", "championship", "avg_seed"}}.
+    """
+    teams = sorted(records)
+    idx = {rid: i for i, rid in enumerate(teams)}
+    all_scores = [pts for rid in teams for pts in score_history.get(rid, [])]
+    league_mean = sum(all_scores) / len(all_scores) if all_scores else 0.0
+    league_var = (sum((x - league_mean) ** 2 for x in all_scores) / max(len(all_scores) - 1, 1)
+                  if all_scores else 1.0)
+
+    means, sds = [], []
+    for rid in teams:
+        hist = score_history.get(rid, [])
+        k, n = SCORE_PRIOR_WEEKS, len(hist)
+        mean = (sum(hist) + k * league_mean) / (n + k)
+        var = (sum((x - mean) ** 2 for x in hist) + k * league_var) / (n + k)
+        means.append(mean)
+        sds.append(max(var, 1e-6) ** 0.5)
+
+    wins = [records[rid]["wins"] + 0.5 * records[rid].get("ties", 0) for rid in teams]
+    pf = [float(records[rid]["pf"]) for rid in teams]
+    sched = [[(idx[a], idx[b]) for a, b in week if a in idx and b in idx] for week in schedule]
+    playoff_teams = min(playoff_teams, len(teams))
+
+    chunks = [min(PLAYOFF_SIM_CHUNK, sims - start) for start in range(0, sims, PLAYOFF_SIM_CHUNK)]
+    jobs = [(wins, pf, means, sds, sched, playoff_teams, n, f"{seed}-{i}")
+            for i, n in enumerate(chunks)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_simulate_odds_chunk, jobs))
+    else:
+        results = [_simulate_odds_chunk(job) for job in jobs]
+
+    totals = [[sum(col) for col in zip(*(r[k] for r in results))] for k in range(4)]
+    made, byes, titles, seed_sum = totals
+    return {
+        rid: {
+            "playoff": round(made[i] / sims, 4),
+            "bye": round(byes[i] / sims, 4),
+            "championship": round(titles[i] / sims, 4),
+            "avg_seed": round(seed_sum[i] / sims, 2),
+        }
+        for rid, i in idx.items()
+    }
+
+
+def all_play_matrix(score_matrix):
+    """
+    All-play results for a weeks x teams score matrix.
+
+    score_matrix[w][t] is team t's score in week w (None if it didn't play).
+    Each week's scores are sorted once and every team's rank found by
+    bisection, so a week costs O(n log n) rather than n^2 comparisons.
+    Returns (wins, losses, ties) matrices of the same shape as score_matrix.
+    """
+    wins, losses, ties = [], [], []
+    for week in score_matrix:
+        played = sorted(pts for pts in week if pts is not None)
+        n = len(played)
+        w_row, l_row, t_row = [], [], []
+        for pts in week:
+            if pts is None:
+                w_row.append(0)
+                t_row.append(0)
+                l_row.append(0)
+                continue
+            below, upto = bisect_left(played, pts), bisect_right(played, pts)
+            w_row.append(below)
+            t_row.append(upto - below - 1)
+            l_row.append(n - upto)
+        wins.append(w_row)
+        losses.append(l_row)
+        ties.append(t_row)
+    return wins, losses, ties
+
+
+def add_all_play(combined):
+    """
+    Add cumulative all-play records, expected wins and luck to every week's standings.
+
+    A team's all-play record for a week is its score against every other
+    score that week; expected wins are the all-play win share (ties half)
+    summed over the regular season so far, and luck is actual wins (ties
+    half) minus expected wins. Playoff weeks carry the regular-season totals.
+    """
+    teams = sorted(int(rid) for rid in combined["roster_map"])
+    col = {rid: i for i, rid in enumerate(teams)}
+    reg_weeks = [w for w in combined["weeks"] if not w.get("is_playoff")]
+
+    score_matrix = []
+    for w in reg_weeks:
+        row = [None] * len(teams)
+        for m in w["matchups"]:
+            for side in ("team1", "team2"):
+                rid = m[side]["roster_id"]
+                if rid in col:
+                    row[col[rid]] = m[side]["points"]
+        score_matrix.append(row)
+    wins, losses, ties = all_play_matrix(score_matrix)
+
+    total = {"wins": [0] * len(teams), "losses": [0] * len(teams), "ties": [0] * len(teams)}
+    expected = [0.0] * len(teams)
+    week_all_play = {}
+    reg_index = {w["week"]: i for i, w in enumerate(reg_weeks)}
+    for w in combined["weeks"]:
+        k = reg_index.get(w["week"])
+        if k is not None:
+            for i in range(len(teams)):
+                opponents = wins[k][i] + losses[k][i] + ties[k][i]
+                total["wins"][i] += wins[k][i]
+                total["losses"][i] += losses[k][i]
+                total["ties"][i] += ties[k][i]
+                if opponents:
+                    expected[i] += (wins[k][i] + 0.5 * ties[k][i]) / opponents
+            week_all_play = {
+                rid: {"wins": wins[k][i], "losses": losses[k][i], "ties": ties[k][i]}
+                for i, rid in enumerate(teams)
+            }
+        for s in w["standings"]:
+            i = col.get(s["roster_id"])
+            if i is None:
+                continue
+            exp = round(expected[i], 2)
+            s["all_play"] = {key: total[key][i] for key in ("wins", "losses", "ties")}
+            s["week_all_play"] = week_all_play.get(s["roster_id"]) if k is not None else None
+            s["expected_wins"] = exp
+            s["luck"] = round(s["wins"] + 0.5 * s.get("ties", 0) - exp, 2)
+
+
+def add_playoff_odds(combined, playoff_teams=DEFAULT_PLAYOFF_TEAMS, sims=PLAYOFF_SIMS, workers=None):
+    """
+    Attach "playoff_odds" to every regular-season week of a combined season.
+
+    Odds after week N use records and scores through N, and play out the
+    remaining regular season from the real pairings: completed weeks' matchups
+    plus combined["future_schedule"] for weeks not yet played.
+    """
+    reg_weeks = [w for w in combined["weeks"] if not w.get("is_playoff")]
+    last_reg_week = combined.get("playoff_week_start", DEFAULT_REG_WEEKS + 1) - 1
+
+    pairings = {w["week"]: [(m["team1"]["roster_id"], m["team2"]["roster_id"]) for m in w["matchups"]]
+                for w in reg_weeks}
+    for wk, pairs in (combined.get("future_schedule") or {}).items():
+        pairings.setdefault(int(wk), [tuple(p) for p in pairs])
+
+    score_history = {int(rid): [] for rid in combined["roster_map"]}
+    for w in reg_weeks:
+        for m in w["matchups"]:
+            for side in ("team1", "team2"):
+                score_history.setdefault(m[side]["roster_id"], []).append(m[side]["points"])
+
+        records = {s["roster_id"]: s for s in w["standings"]}
+        history_so_far = {rid: pts[:] for rid, pts in score_history.items()}
+        schedule = [pairings[wk] for wk in range(w["week"] + 1, last_reg_week + 1) if wk in pairings]
+        odds = simulate_playoff_odds(records, history_so_far, schedule, playoff_teams,
+                                     sims=sims, seed=f"{combined['season']}-{w['week']}",
+                                     workers=workers)
+        w["playoff_odds"] = {
+            "sims": sims,
+            "remaining_weeks": len(schedule),
+            "teams": sorted(({"roster_id": rid, **o} for rid, o in odds.items()),
+                            key=lambda o: (-o["playoff"], o["avg_seed"])),
+        }
+
+
+def _luck_tables(weeks):
+    """
+    (teams, kept, beats, opponents) for schedule_luck(): the sorted teams,
+    the indices of the weeks where every team has a score (only those can be
+    re-paired), and for each kept week a team x team "beats" table (1 / 0.5
+    / 0) plus each team's actual opponent index.
+    """
+    teams = sorted({t for w in weeks for t in w["scores"]})
+    n = len(teams)
+    idx = {t: i for i, t in enumerate(teams)}
+    kept = [k for k, w in enumerate(weeks) if len(w["scores"]) == n]
+
+    beats = []
+    opponents = []
+    for k in kept:
+        w = weeks[k]
+        pts = [w["scores"][t] for t in teams]
+        beats.append([[1.0 if pi > pj else 0.5 if pi == pj else 0.0 for pj in pts] for pi in pts])
+        opp = [None] * n
+        for a, b in w["pairs"]:
+            if a in idx and b in idx:
+                opp[idx[a]], opp[idx[b]] = idx[b], idx[a]
+        opponents.append(opp)
+    return teams, kept, beats, opponents
+
+
+def _luck_result(teams, beats, opponents, hist, sims):
+    """schedule_luck()'s per-team result from the simulated half-win histograms."""
+    n = len(teams)
+    actual = [sum(beats[k][i][opp[i]] for k, opp in enumerate(opponents) if opp[i] is not None)
+              for i in range(n)]
+
+    result = {}
+    for i, team in enumerate(teams):
+        # Schedule swaps: team i plays team j's real opponents
+        swaps = {}
+        for j, other in enumerate(teams):
+            wins = 0.0
+            for k, opp in enumerate(opponents):
+                o = opp[j]
+                if o is None:
+                    continue
+                if o == i:
+                    o = j
+                wins += beats[k][i][o]
+            swaps[other] = wins
+
+        h = hist[i]
+        actual2 = int(round(2 * actual[i]))
+        below = sum(h[:actual2])
+        same = h[actual2] if actual2 < len(h) else 0
+        expected = sum(k * c for k, c in enumerate(h)) / (2 * sims)
+        result[team] = {
+            "actual_wins": actual[i],
+            "expected_wins": round(expected, 2),
+            "luck": round(actual[i] - expected, 2),
+            "percentile": round((below + 0.5 * same) / sims, 4),
+            "p_better_record": round(sum(h[actual2 + 1:]) / sims, 4),
+            "p_worse_record": round(below / sims, 4),
+            "distribution": {(k / 2 if k % 2 else k // 2): round(c / sims, 4)
+                             for k, c in enumerate(h) if c},
+            "schedule_swaps": swaps,
+            "best_schedule": max(swaps, key=swaps.get),
+            "worst_schedule": min(swaps, key=swaps.get),
+        }
+    return result
+
+
+def schedule_luck(weeks, sims=SCHEDULE_LUCK_SIMS, seed=0):
+    """
+    How much of each team's record came from its schedule.
+
+    weeks: regular-season weeks in order, each {"scores": {team: points},
+           "pairs": [(team, team), ...]} as actually played.
+
+    Two views of the same question:
+      * Random schedules — `sims` league schedules where every week is a
+        uniformly random pairing of all teams. Gives each team's distribution
+        of possible win totals and where its actual total falls in it.
+      * Schedule swaps — exhaustively, each team's wins had it played every
+        other team's real schedule (facing the swapped team where the
+        schedule would have it play itself).
+
+    Each week's results are precomputed as a team x team "beats" table, so a
+    simulated week is a shuffle plus six lookups. Ties count half a win.
+    Returns {team: {...}}.
+    """
+    teams, _, beats, opponents = _luck_tables(weeks)
+    n = len(teams)
+    if n < 2 or not beats:
+        return {}
+
+    # Random schedules: histogram of half-win counts per team
+    rng = random.Random(seed)
+    shuffle = rng.shuffle
+    order = list(range(n))
+    hist = [[0] * (2 * len(beats) + 1) for _ in range(n)]
+    for _ in range(sims):
+        wins2 = [0] * n
+        for table in beats:
+            shuffle(order)
+            for k in range(0, n - 1, 2):
+                a, b = order[k], order[k + 1]
+                r = table[a][b]
+                wins2[a] += int(2 * r)
+                wins2[b] += int(2 * (1 - r))
+        for i in range(n):
+            hist[i][wins2[i]] += 1
+    return _luck_result(teams, beats, opponents, hist, sims)
+
+
+def schedule_luck_by_week(weeks, sims=SCHEDULE_LUCK_SIMS, seed=0):
+    """
+    schedule_luck() through every week of a season from one set of simulated
+    schedules: entry k covers weeks[:k + 1] (teams are those of the whole
+    list). Each simulated schedule is drawn a week at a time and its running
+    win totals are histogrammed after every week, so a season costs as much
+    as simulating it once instead of once per week.
+    """
+    teams, kept, beats, opponents = _luck_tables(weeks)
+    n = len(teams)
+    if n < 2 or not beats:
+        return [{} for _ in weeks]
+
+    rng = random.Random(seed)
+    shuffle = rng.shuffle
+    order = list(range(n))
+    wins2 = [[0] * n for _ in range(sims)]  # Running half-wins per simulated schedule
+    kept = set(kept)
+    played = 0
+    current = {}
+    results = []
+    for k in range(len(weeks)):
+        if k in kept:
+            table = beats[played]
+            played += 1
+            for row in wins2:
+                shuffle(order)
+                for j in range(0, n - 1, 2):
+                    a, b = order[j], order[j + 1]
+                    r = table[a][b]
+                    row[a] += int(2 * r)
+                    row[b] += int(2 * (1 - r))
+            hist = [[0] * (2 * played + 1) for _ in range(n)]
+            for row in wins2:
+                for i in range(n):
+                    hist[i][row[i]] += 1
+            current = _luck_result(teams, beats[:played], opponents[:played], hist, sims)
+        results.append(current)
+    return results
+
+
+class OwnershipIndex:
+    """
+    Which franchise held each player, every week of every indexed season.
+
+    Stored run-length encoded: player_id -> intervals [season, first_week,
+    last_week, owner_id] sorted by (season, first_week), so a player who sat on
+    one roster all season is a single entry. Lookups bisect those intervals
+    (O(log n)); an owner -> player_ids map answers "everyone this franchise
+    has rostered". Weeks are added in order with add_week(), extending the
+    open interval when ownership didn't change, so new weeks cost only the
+    players on rosters that week.
+    """
+
+    def __init__(self, players=None, indexed=None):
+        self.players = players or {}   # pid -> [[season, first, last, owner_id], ...]
+        self.indexed = indexed or {}   # str(season) -> last indexed week
+        self._starts = {pid: [(iv[0], iv[1]) for iv in ivs] for pid, ivs in self.players.items()}
+        self._owners = {}
+        for pid, ivs in self.players.items():
+            for iv in ivs:
+                self._owners.setdefault(iv[3], set()).add(pid)
+
+    @classmethod
+    def load(cls, path=OWNERSHIP_INDEX):
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            raw = json.load(f)
+        return cls(raw.get("players"), raw.get("indexed"))
+
+    def save(self, path=OWNERSHIP_INDEX):
+        with open(path, "w") as f:
+            json.dump({"indexed": self.indexed, "players": self.players}, f,
+                      separators=(",", ":"), sort_keys=True)
+
+    def add_week(self, season, week, holdings):
+        """Record one week's ownership: holdings is {player_id: owner_id}."""
+        for pid, owner in holdings.items():
+            ivs = self.players.setdefault(pid, [])
+            starts = self._starts.setdefault(pid, [])
+            i = bisect_right(starts, (season, week))
+            prev = ivs[i - 1] if i else None
+            if prev and prev[0] == season and prev[3] == owner and prev[2] == week - 1:
+                prev[2] = week
+            elif not (prev and prev[0] == season and prev[1] <= week <= prev[2]):
+                ivs.insert(i, [season, week, week, owner])
+                starts.insert(i, (season, week))
+            self._owners.setdefault(owner, set()).add(pid)
+        self.indexed[str(season)] = max(week, self.indexed.get(str(season), 0))
+
+    def owner_at(self, player_id, season, week):
+        """owner_id holding the player that week, or None."""
+        starts = self._starts.get(player_id)
+        if not starts:
+            return None
+        i = bisect_right(starts, (season, week))
+        if not i:
+            return None
+        s, first, last, owner = self.players[player_id][i - 1]
+        return owner if s == season and first <= week <= last else None
+
+    def timeline(self, player_id):
+        """The player's ownership intervals, oldest first."""
+        return self.players.get(player_id, [])
+
+    def players_for_owner(self, owner_id):
+        """Every player_id the franchise has ever rostered, sorted."""
+        return sorted(self._owners.get(owner_id, ()))
+
+
+def season_holdings(season_dir):
+    """
+    Yield (week, {player_id: owner_id}) for every played week of a cached season.
+
+    Each week starts from the previous week's rosters, applies that week's
+    completed adds and drops from transactions.json, then takes the matchup
+    `players` lists (the full roster at kickoff, taxi and IR included) as
+    authoritative for every roster that played.
+    """
+    def load(name, default):
+        path = season_dir / name
+        if not path.exists():
+            return default
+        with open(path) as f:
+            return json.load(f)
+
+    rosters = load("rosters.json", [])
+    matchups = load("matchups.json", {})
+    transactions = load("transactions.json", {})
+    rid_to_owner = {r["roster_id"]: r.get("owner_id") or "" for r in rosters}
+
+    held = {}  # pid -> roster_id
+    for week in sorted(int(w) for w in matchups):
+        txns = sorted((t for t in transactions.get(str(week), []) if t.get("status") == "complete"),
+                      key=lambda t: t.get("status_updated") or 0)
+        for t in txns:
+            for pid, rid in (t.get("drops") or {}).items():
+                if held.get(pid) == rid:
+                    del held[pid]
+            for pid, rid in (t.get("adds") or {}).items():
+                held[pid] = rid
+        for entry in matchups[str(week)]:
+            rid = entry["roster_id"]
+            roster = set(entry.get("players") or [])
+            for pid in [p for p, r in held.items() if r == rid and p not in roster]:
+                del held[pid]
+            for pid in roster:
+                held[pid] = rid
+        yield week, {pid: rid_to_owner.get(rid, "") for pid, rid in held.items() if rid_to_owner.get(rid)}
+
+
+def update_ownership_index(seasons):
+    """Add any cached weeks not yet in data/ownership_index.json, then save it."""
+    index = OwnershipIndex.load()
+    added = 0
+    for season in sorted(seasons):
+        done = index.indexed.get(str(season), 0)
+        for week, holdings in season_holdings(DATA_DIR / str(season)):
+            if week > done:
+                index.add_week(season, week, holdings)
+                added += 1
+    if added or not OWNERSHIP_INDEX.exists():
+        index.save()
+    n_intervals = sum(len(ivs) for ivs in index.players.values())
+    print(f"  Ownership index: {added} new week(s), {len(index.players)} players, "
+          f"{n_intervals} ownership intervals")
+    return index
+
+
+class PlayerPointsTable:
+    """
+    Columnar table of every rostered player's points for every team-week.
+
+    One typed array per column, rows sorted by (player, season, week), so a
+    player's whole career in the league is one contiguous slice found by
+    bisection and league-wide scans touch only the columns they need.
+    Points and projections are stored in hundredths (Sleeper's precision) so
+    round trips are exact; NO_PROJECTION marks weeks without a projection.
+
+    On disk (data/player_points.bin): b"JYPP", a little-endian uint32 header
+    length, a JSON header (row count, column layout, player and owner string
+    tables), then each column's raw bytes.
+    """
+
+    MAGIC = b"JYPP"
+    NO_PROJECTION = -2 ** 31
+    COLUMNS = (  # name, array typecode
+        ("player", "I"), ("season", "H"), ("week", "B"), ("owner", "H"),
+        ("started", "B"), ("points", "i"), ("projection", "i"),
+    )
+
+    def __init__(self, columns, players, owners):
+        self.columns = columns  # name -> array.array
+        self.players = players  # sorted player_ids; column "player" indexes this
+        self.owners = owners    # owner_ids; column "owner" indexes this
+        self._player_idx = {pid: i for i, pid in enumerate(players)}
+        self._owner_idx = {oid: i for i, oid in enumerate(owners)}
+        # season * 100 + week per row: sorted within each player's slice, so
+        # date windows are found by bisection too
+        self._when = array.array("I", (s * 100 + w for s, w in zip(columns["season"], columns["week"])))
+
+    def __len__(self):
+        return len(self.columns["player"])
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (player_id, season, week, owner_id, started, points, projection|None) tuples."""
+        players = sorted({r[0] for r in rows})
+        owners = sorted({r[3] for r in rows})
+        p_idx = {pid: i for i, pid in enumerate(players)}
+        o_idx = {oid: i for i, oid in enumerate(owners)}
+        rows = sorted(rows, key=lambda r: (p_idx[r[0]], r[1], r[2]))
+        cols = {name: array.array(code) for name, code in cls.COLUMNS}
+        for pid, season, week, owner, started, pts, proj in rows:
+            cols["player"].append(p_idx[pid])
+            cols["season"].append(season)
+            cols["week"].append(week)
+            cols["owner"].append(o_idx[owner])
+            cols["started"].append(1 if started else 0)
+            cols["points"].append(int(round(pts * 100)))
+            cols["projection"].append(cls.NO_PROJECTION if proj is None else int(round(proj * 100)))
+        return cls(cols, players, owners)
+
+    def save(self, path=PLAYER_POINTS):
+        layout, blobs, offset = [], [], 0
+        for name, code in self.COLUMNS:
+            col = self.columns[name]
+            if sys.byteorder != "little":
+                col = array.array(code, col)
+                col.byteswap()
+            blob = col.tobytes()
+            layout.append({"name": name, "type": code, "offset": offset, "bytes": len(blob)})
+            blobs.append(blob)
+            offset += len(blob)
+        header = json.dumps({"version": 1, "rows": len(self), "columns": layout,
+                             "players": self.players, "owners": self.owners},
+                            separators=(",", ":")).encode()
+        with open(path, "wb") as f:
+            f.write(self.MAGIC + len(header).to_bytes(4, "little") + header)
+            for blob in blobs:
+                f.write(blob)
+
+    @classmethod
+    def load(cls, path=PLAYER_POINTS):
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw[:4] != cls.MAGIC:
+            raise ValueError(f"{path} is not a player points table")
+        size = int.from_bytes(raw[4:8], "little")
+        header = json.loads(raw[8:8 + size])
+        body = memoryview(raw)[8 + size:]
+        columns = {}
+        for c in header["columns"]:
+            col = array.array(c["type"])
+            col.frombytes(body[c["offset"]:c["offset"] + c["bytes"]])
+            if sys.byteorder != "little":
+                col.byteswap()
+            columns[c["name"]] = col
+        return cls(columns, header["players"], header["owners"])
+
+    def row(self, i):
+        c = self.columns
+        proj = c["projection"][i]
+        return {
+            "player_id": self.players[c["player"][i]],
+            "season": c["season"][i],
+            "week": c["week"][i],
+            "owner_id": self.owners[c["owner"][i]],
+            "started": bool(c["started"][i]),
+            "points": c["points"][i] / 100,
+            "projection": None if proj == self.NO_PROJECTION else proj / 100,
+        }
+
+    def player_rows(self, player_id):
+        """Row indices for one player, in (season, week) order."""
+        idx = self._player_idx.get(player_id)
+        if idx is None:
+            return range(0)
+        col = self.columns["player"]
+        return range(bisect_left(col, idx), bisect_right(col, idx))
+
+    def window_points(self, player_id, owner_id, start, end):
+        """
+        (points, starts) the player scored as a starter for owner_id between
+        (season, week) start and end inclusive.
+        """
+        rows = self.player_rows(player_id)
+        if not rows:
+            return 0.0, 0
+        lo = bisect_left(self._when, start[0] * 100 + start[1], rows.start, rows.stop)
+        hi = bisect_right(self._when, end[0] * 100 + end[1], lo, rows.stop)
+        owner = self._owner_idx.get(owner_id)
+        if owner is None:
+            return 0.0, 0
+        c = self.columns
+        total = starts = 0
+        for i in range(lo, hi):
+            if c["owner"][i] == owner and c["started"][i]:
+                total += c["points"][i]
+                starts += 1
+        return total / 100, starts
+
+    def career(self, player_id):
+        """Every team-week the player spent on a league roster."""
+        return [self.row(i) for i in self.player_rows(player_id)]
+
+    def best_games(self, n=10, started_only=True, season=None):
+        """Highest-scoring individual player-weeks (starters only by default)."""
+        pts, started, seasons = self.columns["points"], self.columns["started"], self.columns["season"]
+        rows = (i for i in range(len(self))
+                if (not started_only or started[i]) and (season is None or seasons[i] == season))
+        return [self.row(i) for i in heapq.nlargest(n, rows, key=pts.__getitem__)]
+
+
+def build_player_points(seasons):
+    """Rebuild data/player_points.bin from every cached season's raw matchups."""
+    rows = []
+    for season in sorted(seasons):
+        season_dir = DATA_DIR / str(season)
+        paths = {name: season_dir / f"{name}.json" for name in ("matchups", "rosters", "projections")}
+        if not paths["matchups"].exists() or not paths["rosters"].exists():
+            continue
+        with open(paths["matchups"]) as f:
+            matchups = json.load(f)
+        with open(paths["rosters"]) as f:
+            rid_to_owner = {r["roster_id"]: r.get("owner_id") or "" for r in json.load(f)}
+        projections = {}
+        if paths["projections"].exists():
+            with open(paths["projections"]) as f:
+                projections = json.load(f)
+
+        for week_key, entries in matchups.items():
+            week_proj = projection_points(projections.get(week_key))
+            for entry in entries:
+                owner = rid_to_owner.get(entry["roster_id"], "")
+                starters = set(entry.get("starters") or [])
+                for pid, pts in (entry.get("players_points") or {}).items():
+                    rows.append((pid, season, int(week_key), owner, pid in starters,
+                                 pts or 0, week_proj.get(pid)))
+
+    table = PlayerPointsTable.from_rows(rows)
+    table.save()
+    print(f"  Player points table: {len(table)} player-weeks, {len(table.players)} players "
+          f"({os.path.getsize(PLAYER_POINTS) / 1024:.0f} KB)")
+    return table
+
+
+def trade_sides(txn):
+    """Split one Sleeper trade into {roster_id: {"players": [...], "picks": [...]}} received."""
+    sides = {rid: {"players": [], "picks": []} for rid in txn.get("roster_ids") or []}
+    for pid, rid in (txn.get("adds") or {}).items():
+        sides.setdefault(rid, {"players": [], "picks": []})["players"].append(pid)
+    for pick in txn.get("draft_picks") or []:
+        # Sleeper: roster_id = original slot owner, owner_id = roster receiving it
+        sides.setdefault(pick["owner_id"], {"players": [], "picks": []})["picks"].append(pick)
+    return sides
+
+
+def analyze_trades(seasons, table=None, windows=TRADE_WINDOWS, rank_by=TRADE_RANK_WINDOW):
+    """
+    Score every completed trade by what each side's incoming players did for it.
+
+    For each window (see TRADE_WINDOWS) a side's value is the starter points
+    its acquired players scored for that franchise, looked up per player in
+    the PlayerPointsTable by bisection. Draft picks are listed with their
+    original slot; they carry no points until the drafted player is on a
+    roster, which the transaction log cannot tell us. Returns the ledger
+    ranked by the gap between the best and worst side in `rank_by`.
+    """
+    table = table or PlayerPointsTable.load()
+    players_path = DATA_DIR / "players.json"
+    players_db = {}
+    if players_path.exists():
+        with open(players_path) as f:
+            players_db = json.load(f)
+
+    def player_label(pid):
+        p = players_db.get(pid)
+        if not p:
+            return {"player_id": pid, "name": pid, "position": "?"}
+        return {"player_id": pid, "name": f"{p.get('first_name', '')} {p.get('last_name', '')}".strip(),
+                "position": p.get("position", "?")}
+
+    # Team names and owners per season (roster_ids are only stable within a season)
+    season_rosters = {}
+    trades = []
+    for season in sorted(seasons):
+        season_dir = DATA_DIR / str(season)
+        combined_path = season_dir / "season_combined.json"
+        txn_path = season_dir / "transactions.json"
+        if not combined_path.exists() or not txn_path.exists():
+            continue
+        with open(combined_path) as f:
+            season_rosters[season] = {int(rid): info for rid, info in json.load(f).get("roster_map", {}).items()}
+        with open(txn_path) as f:
+            for week, txns in json.load(f).items():
+                trades.extend((season, int(week), t) for t in txns
+                              if t.get("type") == "trade" and t.get("status") == "complete")
+
+    ledger = []
+    for season, week, txn in trades:
+        roster_map = season_rosters[season]
+        sides = []
+        for rid, got in sorted(trade_sides(txn).items()):
+            owner = roster_map.get(rid, {}).get("owner_id", "")
+            received = []
+            for pid in got["players"]:
+                entry = {**player_label(pid), "points": {}, "starts": {}}
+                for name, (first, last) in windows.items():
+                    start = (season + first, week if first == 0 else 1)
+                    pts, starts = table.window_points(pid, owner, start, (season + last, 99))
+                    entry["points"][name] = round(pts, 2)
+                    entry["starts"][name] = starts
+                received.append(entry)
+            received.sort(key=lambda e: e["points"].get(rank_by, 0), reverse=True)
+            sides.append({
+                "owner_id": owner,
+                "team_name": roster_map.get(rid, {}).get("team_name", "?"),
+                "players": received,
+                "picks": [
+                    {"season": p["season"], "round": p["round"],
+                     "original_team": roster_map.get(p["roster_id"], {}).get("team_name", "?")}
+                    for p in sorted(got["picks"], key=lambda p: (p["season"], p["round"]))
+                ],
+                "points": {name: round(sum((e["points"][name] for e in received), 0.0), 2) for name in windows},
+            })
+        if len(sides) < 2:
+            continue
+        ranked = sorted(sides, key=lambda sd: sd["points"].get(rank_by, 0), reverse=True)
+        margin = ranked[0]["points"].get(rank_by, 0) - ranked[-1]["points"].get(rank_by, 0)
+        ledger.append({
+            "transaction_id": txn.get("transaction_id"),
+            "season": season,
+            "week": week,
+            "created": txn.get("created"),
+            # Windows reaching into the current league year are still accruing
+            "complete": season + windows[rank_by][1] < max(LEAGUE_IDS),
+            "winner": ranked[0]["owner_id"] if margin > 0 else None,
+            "margin": round(margin, 2),
+            "sides": sides,
+        })
+
+    ledger.sort(key=lambda t: t["margin"], reverse=True)
+    for i, t in enumerate(ledger, 1):
+        t["rank"] = i
+    return ledger
+
+
+def build_trade_ledger(seasons, table=None):
+    """Write data/trade_ledger.json for every trade in the cached seasons."""
+    ledger = analyze_trades(seasons, table)
+    with open(TRADE_LEDGER, "w") as f:
+        json.dump({
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "windows": {name: list(span) for name, span in TRADE_WINDOWS.items()},
+            "rank_by": TRADE_RANK_WINDOW,
+            "trades": ledger,
+        }, f, separators=(",", ":"))
+    print(f"  Trade ledger: {len(ledger)} trades ({os.path.getsize(TRADE_LEDGER) / 1024:.0f} KB)")
+    return ledger
+
+
+def normal_cdf(x):
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def live_team_outlook(entry, week_proj, remaining, positions):
+    """
+    (current points, projected remaining mean, variance, per-starter remaining
+    [(mean, sd)]) for one raw Sleeper matchup entry mid-week.
+
+    remaining[pid] is the share of the player's game still to play (1 = not
+    started, 0 = finished); each starter's leftover points are modelled as
+    Normal(share * projection, sd) with the position's LIVE_POSITION_SD.
+    """
+    current = entry.get("points") or 0
+    mean = var = 0.0
+    parts = []
+    for pid in entry.get("starters") or []:
+        share = remaining.get(pid, 0)
+        proj = week_proj.get(pid, 0)
+        if share <= 0 or proj <= 0:
+            continue
+        mu = share * proj
+        sd = LIVE_POSITION_SD.get(positions.get(pid), LIVE_DEFAULT_SD) * proj * math.sqrt(share)
+        mean += mu
+        var += sd * sd
+        parts.append((mu, sd))
+    return current, mean, var, parts
+
+
+def remaining_share(points, projection, status=None):
+    """
+    Share of a starter's projection still to be played, from their NFL
+    game's status: all of it before kickoff, none once the game is final.
+    Mid-game, or when the status is unknown, the unscored part of the
+    projection is what remains, so a starter on 0 points has it all to play
+    and one already past their projection has nothing left.
+    """
+    if projection <= 0 or status == "complete":
+        return 0.0
+    if status == "pre_game":
+        return 1.0
+    return max(projection - points, 0) / projection
+
+
+def live_win_probabilities(matchups_raw, week_proj, remaining, positions=None, sims=0, seed=0):
+    """
+    Win probability for every matchup of an in-progress week.
+
+    Analytic by default: final margin ~ Normal(current margin + remaining
+    projection gap, summed variances), so a poll is a handful of sums per
+    team. With sims > 0, also draws each starter's remaining points (floored
+    at zero, which the normal approximation can't do) and reports the
+    simulated probability alongside.
+    """
+    positions = positions or {}
+    rng = random.Random(seed)
+    normals = []
+    out = []
+    for pair in matchup_pairings(matchups_raw):
+        entries = {m["roster_id"]: m for m in matchups_raw if m["roster_id"] in pair}
+        (cur1, mu1, var1, parts1), (cur2, mu2, var2, parts2) = (
+            live_team_outlook(entries[rid], week_proj, remaining, positions) for rid in pair)
+        gap = (cur1 + mu1) - (cur2 + mu2)
+        sd = math.sqrt(var1 + var2)
+        if sd > 0:
+            p1 = normal_cdf(gap / sd)
+        else:
+            p1 = 1.0 if gap > 0 else 0.0 if gap < 0 else 0.5
+        result = {
+            "roster_ids": list(pair),
+            "points": [round(cur1, 2), round(cur2, 2)],
+            "projected_final": [round(cur1 + mu1, 2), round(cur2 + mu2, 2)],
+            "win_prob": [round(p1, 4), round(1 - p1, 4)],
+        }
+        if sims and (parts1 or parts2):
+            # One block of standard normals per starter slot, drawn once per
+            # poll and shared by every matchup (common random numbers)
+            while len(normals) < len(parts1) + len(parts2):
+                normals.append([rng.gauss(0, 1) for _ in range(sims)])
+            t1 = [cur1] * sims
+            t2 = [cur2] * sims
+            for totals, parts, offset in ((t1, parts1, 0), (t2, parts2, len(parts1))):
+                for k, (mu, s) in enumerate(parts):
+                    z = normals[offset + k]
+                    for i in range(sims):
+                        x = mu + s * z[i]
+                        if x > 0:
+                            totals[i] += x
+            wins = sum(1.0 if a > b else 0.5 if a == b else 0.0 for a, b in zip(t1, t2))
+            result["sim_win_prob"] = [round(wins / sims, 4), round(1 - wins / sims, 4)]
+        out.append(result)
+    return out
+
+
+def live_poll(season=None, week=None, sims=0):
+    """
+    One live poll: fetch the week's matchups and projections, compute win
+    probabilities and append them to data/<season>/live_week<N>.json so the
+    week keeps a probability-over-time series.
+
+    Sleeper's public API has no per-game clock, so each starter's remaining
+    share comes from remaining_share(): their NFL game's status from the
+    schedule, and mid-game the part of their projection not yet scored.
+    """
+    state = fetch_json("/state/nfl") or {}
+    season = season or int(state.get("season") or max(LEAGUE_IDS))
+    week = week or int(state.get("week") or 1)
+    league_id = LEAGUE_IDS.get(season)
+    if not league_id:
+        print(f"Unknown season {season}. Available: {list(LEAGUE_IDS.keys())}")
+        return None
+
+    matchups_raw = [m for m in fetch_json(f"/league/{league_id}/matchups/{week}") or []
+                    if m.get("matchup_id") is not None]
+    try:
+        week_proj_data = fetch_projections(season, week)
+    except Exception as e:
+        print(f"  Projections unavailable ({e}); treating every unplayed starter as 0")
+        week_proj_data = None
+    week_proj = projection_points(week_proj_data)
+    positions = {}
+    nfl_teams = {}
+    if isinstance(week_proj_data, list):
+        for p in week_proj_data:
+            if isinstance(p, dict):
+                positions[p.get("player_id")] = (p.get("player") or {}).get("position")
+                nfl_teams[p.get("player_id")] = p.get("team")
+    players_path = DATA_DIR / "players.json"
+    if not positions and players_path.exists():
+        with open(players_path) as f:
+            players = json.load(f)
+        positions = {pid: p.get("position") for pid, p in players.items()}
+        nfl_teams = {pid: p.get("team") for pid, p in players.items()}
+    try:
+        game_status = fetch_game_status(season, week)
+    except Exception as e:
+        print(f"  NFL schedule unavailable ({e}); estimating remaining play from points scored")
+        game_status = {}
+
+    remaining = {}
+    for m in matchups_raw:
+        pts = m.get("players_points") or {}
+        for pid in m.get("starters") or []:
+            remaining[pid] = remaining_share(pts.get(pid) or 0, week_proj.get(pid, 0),
+                                             game_status.get(nfl_teams.get(pid)))
+
+    started = time.perf_counter()
+    probs = live_win_probabilities(matchups_raw, week_proj, remaining, positions, sims=sims,
+                                   seed=f"{season}-{week}-{int(time.time())}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    season_dir = DATA_DIR / str(season)
+    season_dir.mkdir(parents=True, exist_ok=True)
+    out_path = season_dir / f"live_week{week}.json"
+    series = {"season": season, "week": week, "polls": []}
+    if out_path.exists():
+        with open(out_path) as f:
+            series = json.load(f)
+    series["polls"].append({"at": time.strftime("%Y-%m-%d %H:%M:%S"), "matchups": probs})
+    with open(out_path, "w") as f:
+        json.dump(series, f, separators=(",", ":"))
+
+    print(f"  Week {week} live odds ({len(probs)} matchups, {elapsed_ms:.1f} ms"
+          f"{f', {sims} sims each' if sims else ''}):")
+    for p in probs:
+        print(f"    {p['roster_ids'][0]:>2} {p['points'][0]:>7.2f} ({p['win_prob'][0]:.0%})  vs  "
+              f"{p['roster_ids'][1]:>2} {p['points'][1]:>7.2f} ({p['win_prob'][1]:.0%})")
+    print(f"  Saved poll {len(series['polls'])} to {out_path}")
+    return probs
+
+
+def analyze_waiver_market(seasons, table=None):
+    """
+    FAAB and free-agent market stats per season and franchise, in one pass
+    over every cached transaction.
+
+    Each added player's value is the starter points they scored for the
+    claiming franchise from the claim's week to the end of that season (one
+    bisected PlayerPointsTable lookup per add). Per franchise: claims won and
+    lost, FAAB spent, points bought, points per FAAB dollar (paid claims
+    only), hit rate (adds reaching WAIVER_HIT_STARTS starts) and a
+    cumulative spending curve by week.
+    """
+    table = table or PlayerPointsTable.load()
+
+    def new_bucket():
+        return {"claims_won": 0, "claims_lost": 0, "free_agent_adds": 0, "faab_spent": 0,
+                "paid_points": 0.0, "points": 0.0, "adds": 0, "hits": 0, "spend_by_week": {}}
+
+    seasons_out = {}
+    pickups = []
+    for season in sorted(seasons):
+        season_dir = DATA_DIR / str(season)
+        combined_path = season_dir / "season_combined.json"
+        txn_path = season_dir / "transactions.json"
+        if not combined_path.exists() or not txn_path.exists():
+            continue
+        with open(combined_path) as f:
+            roster_map = {int(rid): info for rid, info in json.load(f).get("roster_map", {}).items()}
+        with open(txn_path) as f:
+            transactions = json.load(f)
+
+        league = new_bucket()
+        franchises = {}
+        for week_key, txns in transactions.items():
+            week = int(week_key)
+            for t in txns:
+                kind = t.get("type")
+                if kind not in ("waiver", "free_agent"):
+                    continue
+                rid = (t.get("roster_ids") or [None])[0]
+                owner = roster_map.get(rid, {}).get("owner_id", "")
+                if not owner:
+                    continue
+                fr = franchises.setdefault(owner, new_bucket())
+                if t.get("status") != "complete":
+                    if kind == "waiver":
+                        fr["claims_lost"] += 1
+                        league["claims_lost"] += 1
+                    continue
+                if not t.get("adds"):
+                    continue  # Drop-only move: nothing was added or bought
+                bid = (t.get("settings") or {}).get("waiver_bid") or 0
+                counter = "claims_won" if kind == "waiver" else "free_agent_adds"
+                for bucket in (fr, league):
+                    bucket[counter] += 1
+                    bucket["faab_spent"] += bid
+                    bucket["spend_by_week"][week] = bucket["spend_by_week"].get(week, 0) + bid
+
+                for pid in (t.get("adds") or {}):
+                    pts, starts = table.window_points(pid, owner, (season, week), (season, 99))
+                    hit = starts >= WAIVER_HIT_STARTS
+                    for bucket in (fr, league):
+                        bucket["adds"] += 1
+                        bucket["hits"] += hit
+                        bucket["points"] += pts
+                        if bid:
+                            bucket["paid_points"] += pts
+                    pickups.append({"season": season, "week": week, "player_id": pid, "owner_id": owner,
+                                    "team_name": roster_map.get(rid, {}).get("team_name", "?"),
+                                    "type": kind, "bid": bid, "points": round(pts, 2), "starts": starts})
+
+        last_week = max((int(w) for w in transactions), default=0)
+        seasons_out[str(season)] = {
+            "league": finish_waiver_bucket(league, last_week),
+            "franchises": {
+                oid: {"team_name": next((i.get("team_name", "?") for i in roster_map.values()
+                                         if i.get("owner_id") == oid), "?"),
+                      **finish_waiver_bucket(b, last_week)}
+                for oid, b in sorted(franchises.items())
+            },
+        }
+
+    top = heapq.nlargest(WAIVER_TOP_PICKUPS, pickups, key=lambda p: p["points"])
+    return {"hit_starts": WAIVER_HIT_STARTS, "seasons": seasons_out, "top_pickups": top}
+
+
+def finish_waiver_bucket(b, last_week):
+    """Turn running waiver totals into the published per-franchise summary."""
+    curve, spent = [], 0
+    for week in range(1, last_week + 1):
+        spent += b["spend_by_week"].get(week, 0)
+        curve.append(spent)
+    claims = b["claims_won"] + b["claims_lost"]
+    return {
+        "claims_won": b["claims_won"],
+        "claims_lost": b["claims_lost"],
+        "claim_win_rate": round(b["claims_won"] / claims, 3) if claims else None,
+        "free_agent_adds": b["free_agent_adds"],
+        "faab_spent": b["faab_spent"],
+        "adds": b["adds"],
+        "points": round(b["points"], 2),
+        "points_per_dollar": round(b["paid_points"] / b["faab_spent"], 2) if b["faab_spent"] else None,
+        "hits": b["hits"],
+        "hit_rate": round(b["hits"] / b["adds"], 3) if b["adds"] else None,
+        "spend_curve": curve,
+    }
+
+
+def build_waiver_market(seasons, table=None):
+    """Write data/waiver_market.json for the cached seasons."""
+    market = analyze_waiver_market(seasons, table)
+    with open(WAIVER_MARKET, "w") as f:
+        json.dump({"generated_at": time.strftime("%Y-%m-%d %H:%M:%S"), **market}, f, separators=(",", ":"))
+    print(f"  Waiver market: {len(market['seasons'])} season(s) "
+          f"({os.path.getsize(WAIVER_MARKET) / 1024:.0f} KB)")
+    return market
+
+
+def build_player_tables(fetched, seasons):
+    """
+    Index ownership for the fetched seasons, then rebuild the all-season
+    player points table, trade ledger and waiver market across seasons.
+    """
+    update_ownership_index(fetched)
+    table = build_player_points(seasons)
+    build_trade_ledger(seasons, table)
+    build_waiver_market(seasons, table)
+
+
 def is_season_cached(season):
     """Check if a season already has a complete cached dataset."""
     combined = DATA_DIR / str(season) / "season_combined.json"
@@ -500,6 +1762,12 @@ def main():
     args = sys.argv[1:]
     force = "--force" in args
 
+    if "--live" in args:
+        week = int(args[args.index("--week") + 1]) if "--week" in args else None
+        sims = LIVE_SIMS if "--sim" in args else 0
+        live_poll(week=week, sims=sims)
+        return
+
     # Determine which season(s) are the current/active ones
     # (these always get re-fetched because data may have changed)
     current_year = max(LEAGUE_IDS.keys())
@@ -534,6 +1802,7 @@ def main():
         # Still rebuild history if we have multiple seasons of cached data
         if len(requested) > 1:
             print("\nRebuilding cross-season league history from cache...")
+            build_player_tables(requested, requested)
             build_league_history(requested)
         return
 
@@ -554,6 +1823,11 @@ def main():
 
     successful = [s for s in seasons if s not in failed_seasons]
 
+    # All-season tables are rebuilt once, after every fetched season is saved
+    if successful:
+        print("\nBuilding cross-season player tables...")
+        build_player_tables(successful, sorted(LEAGUE_IDS))
+
     print(f"\n{'='*60}")
     if failed_seasons:
         print(f"Completed with errors. Failed seasons: {failed_seasons}")
@@ -572,270 +1846,745 @@ def main():
             build_league_history(all_available)
 
 
-def build_league_history(seasons):
+def iter_history_weeks(seasons):
     """
-    Build a comprehensive cross-season dataset for history.html.
-    Computes: Elo ratings, all-time records, H2H rivalry matrix,
-    franchise career stats, and record book entries.
+    Stream league history one week at a time as (season, week, roster_map,
+    games), in season/week order.
+
+    Each season_combined.json is parsed, cut down to its roster map and
+    weekly matchups, and released before the next season is read, so peak
+    memory is one season file however many seasons (or leagues) history
+    spans. games are slim owner-keyed records ({season, week, o1, o2, p1, p2,
+    winner_owner, is_playoff}); owners, not roster_ids, are the stable
+    franchise key across seasons. A season with no weeks yet is yielded once
+    with week None and no games, so its roster still registers.
     """
-    # Load each season's combined data
-    all_seasons = {}
-    for s in seasons:
+    for s in sorted(seasons):
         path = DATA_DIR / str(s) / "season_combined.json"
-        if path.exists():
-            with open(path) as f:
-                all_seasons[s] = json.load(f)
-            print(f"  Loaded {s} season data")
-        else:
+        if not path.exists():
             print(f"  WARNING: No data for {s}, skipping")
-
-    if not all_seasons:
-        print("  No season data found. Run fetch for individual seasons first.")
-        return
-
-    # ---------------------------------------------------------------
-    # 1. Identify franchises across seasons using owner_id
-    # ---------------------------------------------------------------
-    franchise_map = {}  # owner_id -> {username, team_name, seasons}
-    for s, data in sorted(all_seasons.items()):
-        for rid_str, info in data.get("roster_map", {}).items():
-            oid = info.get("owner_id", "")
-            if oid not in franchise_map:
-                franchise_map[oid] = {
-                    "owner_id": oid,
-                    "username": info.get("username", "Unknown"),
-                    "team_name": info.get("team_name", ""),
-                    "seasons": {},
-                }
-            franchise_map[oid]["seasons"][s] = int(rid_str)
-            # Update display name to latest
-            if info.get("username"):
-                franchise_map[oid]["username"] = info["username"]
-            if info.get("team_name"):
-                franchise_map[oid]["team_name"] = info["team_name"]
-
-    print(f"  Identified {len(franchise_map)} franchises across {len(all_seasons)} seasons")
-
-    # ---------------------------------------------------------------
-    # 2. Gather all matchups across all seasons
-    # ---------------------------------------------------------------
-    all_games = []  # [{season, week, r1_owner, r2_owner, p1, p2, winner_owner, is_playoff}]
-    for s, data in sorted(all_seasons.items()):
-        rid_to_owner = {}
-        for rid_str, info in data.get("roster_map", {}).items():
-            rid_to_owner[int(rid_str)] = info.get("owner_id", "")
-
-        for week_data in data.get("weeks", []):
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        roster_map = data.get("roster_map", {})
+        weeks = data.get("weeks", [])
+        del data
+        rid_to_owner = {int(rid_str): info.get("owner_id", "") for rid_str, info in roster_map.items()}
+
+        if not weeks:
+            yield s, None, roster_map, []
+        for week_data in weeks:
             week = week_data["week"]
             is_playoff = week_data.get("is_playoff", False)
+            games = []
             for m in week_data.get("matchups", []):
                 r1 = m["team1"]["roster_id"]
                 r2 = m["team2"]["roster_id"]
-                p1 = m["team1"]["points"]
-                p2 = m["team2"]["points"]
-                o1 = rid_to_owner.get(r1, "")
-                o2 = rid_to_owner.get(r2, "")
                 w = m.get("winner")
-                winner_owner = rid_to_owner.get(w, "") if w else None
-
-                all_games.append({
+                games.append({
                     "season": s, "week": week,
-                    "o1": o1, "o2": o2,
-                    "p1": p1, "p2": p2,
-                    "winner_owner": winner_owner,
+                    "o1": rid_to_owner.get(r1, ""), "o2": rid_to_owner.get(r2, ""),
+                    "p1": m["team1"]["points"], "p2": m["team2"]["points"],
+                    "winner_owner": rid_to_owner.get(w, "") if w else None,
                     "is_playoff": is_playoff,
                 })
+            yield s, week, roster_map, games
 
-    print(f"  Processed {len(all_games)} total matchups")
 
-    # ---------------------------------------------------------------
-    # 3. Elo Rating System
-    # ---------------------------------------------------------------
-    K = 32
-    MEAN_REGRESSION = 0.15  # Regress 15% toward 1500 between seasons
+def elo_expected(rating, opp_rating):
+    """Win probability implied by two Elo ratings."""
+    return 1 / (1 + 10 ** ((opp_rating - rating) / 400))
 
-    elo = {oid: 1500.0 for oid in franchise_map}
-    elo_history = {oid: [] for oid in franchise_map}
-    prev_season = None
 
-    for game in all_games:
-        # Regress toward mean between seasons
-        if prev_season is not None and game["season"] != prev_season:
-            for oid in elo:
-                elo[oid] = elo[oid] + MEAN_REGRESSION * (1500 - elo[oid])
-        prev_season = game["season"]
+def elo_margin_multiplier(margin, scale=ELO_MARGIN_SCALE):
+    """K multiplier for a win of this margin (sqrt scaling, never below 1)."""
+    if not scale:
+        return 1
+    return max(1, (margin / scale) ** 0.5)
 
-        o1, o2 = game["o1"], game["o2"]
-        if not o1 or not o2 or o1 not in elo or o2 not in elo:
-            continue
 
-        # Expected scores
-        e1 = 1 / (1 + 10 ** ((elo[o2] - elo[o1]) / 400))
-        e2 = 1 - e1
+class RatingEngine(ABC):
+    """
+    Franchise ratings updated one week (rating period) at a time.
+
+    Subclasses implement update_week(), which receives every rated game of a
+    week and must compute all updates from the ratings as they stood before
+    the week, plus snapshot() for the per-week history entry. An engine
+    missing either cannot be instantiated. Franchises join through
+    add_franchise() as history reaches them, starting where an idle franchise
+    rated from the beginning would stand.
+    """
+
+    def __init__(self, franchises=()):
+        self.ratings = {}
+        for oid in franchises:
+            self.add_franchise(oid)
+
+    def add_franchise(self, oid):
+        """Start a franchise at the base rating (no-op if already rated)."""
+        self.ratings.setdefault(oid, float(ELO_BASE))
+
+    def new_season(self):
+        """Hook for between-season adjustments."""
+
+    @abstractmethod
+    def update_week(self, games):
+        """Apply one week's games, all computed from pre-week ratings."""
+
+    @abstractmethod
+    def snapshot(self, oid):
+        """One franchise's rating fields for the per-week history entry."""
+
+    def current(self):
+        return {oid: self.snapshot(oid) for oid in self.ratings}
+
+
+def _outcome(game):
+    """Team1's result as 1 / 0 / 0.5."""
+    if game["winner_owner"] == game["o1"]:
+        return 1.0
+    if game["winner_owner"] == game["o2"]:
+        return 0.0
+    return 0.5
 
-        # Actual scores (margin-weighted: bigger wins move Elo more)
-        margin = abs(game["p1"] - game["p2"])
-        margin_mult = max(1, (margin / 20) ** 0.5)  # sqrt scaling
-        k_adj = K * margin_mult
 
-        if game["winner_owner"] == o1:
-            s1, s2 = 1, 0
-        elif game["winner_owner"] == o2:
-            s1, s2 = 0, 1
+class EloEngine(RatingEngine):
+    """Margin-weighted Elo with mean regression between seasons."""
+
+    def __init__(self, franchises=(), k=ELO_K, regression=ELO_MEAN_REGRESSION,
+                 margin_scale=ELO_MARGIN_SCALE):
+        super().__init__(franchises)
+        self.k = k
+        self.regression = regression
+        self.margin_scale = margin_scale
+
+    def new_season(self):
+        for oid, r in self.ratings.items():
+            self.ratings[oid] = r + self.regression * (ELO_BASE - r)
+
+    def update_week(self, games):
+        r = self.ratings
+        deltas = []
+        for g in games:
+            o1, o2 = g["o1"], g["o2"]
+            e1 = elo_expected(r[o1], r[o2])
+            e2 = 1 - e1
+            k_adj = self.k * elo_margin_multiplier(abs(g["p1"] - g["p2"]), self.margin_scale)
+            s1 = _outcome(g)
+            deltas.append((o1, k_adj * (s1 - e1)))
+            deltas.append((o2, k_adj * ((1 - s1) - e2)))
+        for oid, d in deltas:
+            r[oid] += d
+
+    def snapshot(self, oid):
+        return {"elo": round(self.ratings[oid], 1)}
+
+
+class Glicko2Engine(RatingEngine):
+    """
+    Glicko-2 (Glickman, 2012): a rating plus a rating deviation (RD) that
+    shrinks as a franchise plays and grows while it sits idle, and a
+    volatility that tracks how erratic its results are. Each week is one
+    rating period; the offseason counts as GLICKO_OFFSEASON_PERIODS idle ones.
+    """
+
+    SCALE = 173.7178  # Glicko-2 internal scale factor
+
+    def __init__(self, franchises=(), rd=GLICKO_INITIAL_RD, volatility=GLICKO_VOLATILITY,
+                 tau=GLICKO_TAU, offseason_periods=GLICKO_OFFSEASON_PERIODS):
+        self.initial_rd = rd
+        self.initial_volatility = volatility
+        self.rd = {}
+        self.vol = {}
+        self.tau = tau
+        self.offseason_periods = offseason_periods
+        super().__init__(franchises)
+
+    def add_franchise(self, oid):
+        super().add_franchise(oid)
+        self.rd.setdefault(oid, float(self.initial_rd))
+        self.vol.setdefault(oid, float(self.initial_volatility))
+
+    def _idle(self, oid, periods=1):
+        phi = self.rd[oid] / self.SCALE
+        phi = math.sqrt(phi ** 2 + periods * self.vol[oid] ** 2)
+        self.rd[oid] = min(phi * self.SCALE, self.initial_rd)
+
+    def new_season(self):
+        for oid in self.ratings:
+            self._idle(oid, self.offseason_periods)
+
+    def _new_volatility(self, phi, sigma, v, delta):
+        """Illinois-method solve for the updated volatility (step 5 of the paper)."""
+        a = math.log(sigma ** 2)
+        tau = self.tau
+
+        def f(x):
+            ex = math.exp(x)
+            return (ex * (delta ** 2 - phi ** 2 - v - ex) / (2 * (phi ** 2 + v + ex) ** 2)
+                    - (x - a) / tau ** 2)
+
+        big_a = a
+        if delta ** 2 > phi ** 2 + v:
+            big_b = math.log(delta ** 2 - phi ** 2 - v)
         else:
-            s1, s2 = 0.5, 0.5
+            k = 1
+            while f(a - k * tau) < 0:
+                k += 1
+            big_b = a - k * tau
+        fa, fb = f(big_a), f(big_b)
+        while abs(big_b - big_a) > 1e-6:
+            big_c = big_a + (big_a - big_b) * fa / (fb - fa)
+            fc = f(big_c)
+            if fc * fb <= 0:
+                big_a, fa = big_b, fb
+            else:
+                fa /= 2
+            big_b, fb = big_c, fc
+        return math.exp(big_a / 2)
+
+    def update_week(self, games):
+        # Collect each franchise's results for the period from pre-week state
+        mu = {oid: (r - ELO_BASE) / self.SCALE for oid, r in self.ratings.items()}
+        phi = {oid: rd / self.SCALE for oid, rd in self.rd.items()}
+        results = {}
+        for g in games:
+            s1 = _outcome(g)
+            results.setdefault(g["o1"], []).append((g["o2"], s1))
+            results.setdefault(g["o2"], []).append((g["o1"], 1 - s1))
+
+        updates = {}
+        for oid, opponents in results.items():
+            v_inv = 0.0
+            score = 0.0
+            for opp, s in opponents:
+                g_phi = 1 / math.sqrt(1 + 3 * phi[opp] ** 2 / math.pi ** 2)
+                e = 1 / (1 + math.exp(-g_phi * (mu[oid] - mu[opp])))
+                v_inv += g_phi ** 2 * e * (1 - e)
+                score += g_phi * (s - e)
+            v = 1 / v_inv
+            sigma = self._new_volatility(phi[oid], self.vol[oid], v, v * score)
+            phi_star = math.sqrt(phi[oid] ** 2 + sigma ** 2)
+            new_phi = 1 / math.sqrt(1 / phi_star ** 2 + 1 / v)
+            new_mu = mu[oid] + new_phi ** 2 * score
+            updates[oid] = (new_mu, new_phi, sigma)
+
+        for oid in self.ratings:
+            if oid in updates:
+                new_mu, new_phi, sigma = updates[oid]
+                self.ratings[oid] = ELO_BASE + new_mu * self.SCALE
+                self.rd[oid] = new_phi * self.SCALE
+                self.vol[oid] = sigma
+            else:
+                self._idle(oid)
 
-        elo[o1] += k_adj * (s1 - e1)
-        elo[o2] += k_adj * (s2 - e2)
+    def snapshot(self, oid):
+        return {"rating": round(self.ratings[oid], 1), "rd": round(self.rd[oid], 1)}
 
-        elo_history[o1].append({
-            "season": game["season"], "week": game["week"],
-            "elo": round(elo[o1], 1),
-        })
-        elo_history[o2].append({
-            "season": game["season"], "week": game["week"],
-            "elo": round(elo[o2], 1),
-        })
+    def current(self):
+        return {oid: {**self.snapshot(oid), "volatility": round(self.vol[oid], 5)}
+                for oid in self.ratings}
 
-    print(f"  Elo ratings computed (top: {max(elo.values()):.0f}, bottom: {min(elo.values()):.0f})")
 
-    # ---------------------------------------------------------------
-    # 4. Head-to-Head Rivalry Matrix
-    # ---------------------------------------------------------------
-    h2h = {}  # (o1, o2) -> {wins, losses, pf, pa, games: [{season, week, p1, p2}]}
-    for game in all_games:
-        o1, o2 = game["o1"], game["o2"]
-        if not o1 or not o2:
-            continue
-        # Store BOTH directions so every matrix cell is populated
-        for a, b, pa_, pb_ in [(o1, o2, game["p1"], game["p2"]),
-                                (o2, o1, game["p2"], game["p1"])]:
-            key = (a, b)
-            if key not in h2h:
-                h2h[key] = {"wins": 0, "losses": 0, "pf": 0, "pa": 0, "games": []}
-            h2h[key]["pf"] += pa_
-            h2h[key]["pa"] += pb_
-            h2h[key]["games"].append({
-                "season": game["season"], "week": game["week"],
-                "pts": pa_, "opp_pts": pb_,
-            })
-            if game["winner_owner"] == a:
-                h2h[key]["wins"] += 1
-            elif game["winner_owner"] == b:
-                h2h[key]["losses"] += 1
+# Engines rated side by side in league history ("elo" feeds elo_current/elo_history)
+RATING_ENGINES = {"elo": EloEngine, "glicko2": Glicko2Engine}
 
-    # Convert to serializable format
-    h2h_serial = {}
-    for (o1, o2), data in h2h.items():
-        h2h_serial[f"{o1}|{o2}"] = data
 
-    # ---------------------------------------------------------------
-    # 5. All-Time Records Book
-    # ---------------------------------------------------------------
-    records = {
-        "highest_score": {"points": 0},
-        "lowest_winning_score": {"points": 99999},
-        "biggest_blowout": {"margin": 0},
-        "highest_combined": {"points": 0},
-        "lowest_combined": {"points": 99999},
-    }
+class Leaderboard:
+    """
+    Bounded top-N leaderboard fed one value at a time.
+
+    A min-heap holds the N best entries seen so far (heap[0] is the weakest),
+    so each push is O(log N) and memory stays O(N) however long history gets.
+    Entries that tie the cutoff are kept aside, so "top 25" includes every
+    entry tied for 25th. Values are compared at 2-decimal precision, which is
+    what Sleeper reports, and earlier entries rank ahead of later ties.
+    """
+
+    def __init__(self, size, largest=True):
+        self.size = size
+        self.sign = 1 if largest else -1
+        self._heap = []   # (signed value, -seq, entry) — weakest entry on top
+        self._ties = []   # entries equal to the cutoff pushed out of the heap
+        self._seq = 0
+
+    def push(self, value, entry):
+        key = self.sign * round(value, 2)
+        item = (key, -self._seq, entry)
+        self._seq += 1
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+            return
+        cutoff = self._heap[0][0]
+        if key > cutoff:
+            dropped = heapq.heapreplace(self._heap, item)
+            if self._heap[0][0] == dropped[0]:
+                self._ties.append(dropped)
+            else:
+                self._ties = []
+        elif key == cutoff:
+            self._ties.append(item)
+
+    def ranked(self):
+        """Entries best-first with competition ranks (ties share a rank)."""
+        items = sorted(self._heap + self._ties, key=lambda x: (-x[0], -x[1]))
+        out = []
+        prev_key, rank = None, 0
+        for i, (key, _, entry) in enumerate(items, 1):
+            if key != prev_key:
+                rank, prev_key = i, key
+            out.append({"rank": rank, **entry})
+        return out
+
+
+def game_record_values(game):
+    """
+    The record-book values one game produces, as [(scope, category, value,
+    owner_ids)] with scope "league" or "personal". Qualifying rules match the
+    records section of build_league_history(); streaks aren't game values and
+    are left out.
+    """
+    o1, o2 = game["o1"], game["o2"]
+    p1, p2 = game["p1"], game["p2"]
+    if not o1 or not o2:
+        return []
+    values = [("league", "highest_score", p1, [o1]), ("league", "highest_score", p2, [o2]),
+              ("personal", "highest_score", p1, [o1]), ("personal", "highest_score", p2, [o2])]
+    if p1 != p2:
+        winner, loser = (o1, o2) if p1 > p2 else (o2, o1)
+        margin = round(abs(p1 - p2), 2)
+        values += [("league", "lowest_winning_score", max(p1, p2), [winner]),
+                   ("league", "biggest_blowout", margin, [winner, loser]),
+                   ("personal", "biggest_win", margin, [winner])]
+    combined = round(p1 + p2, 2)
+    if combined > 0:
+        values += [("league", "highest_combined", combined, [o1, o2]),
+                   ("league", "lowest_combined", combined, [o1, o2])]
+    return values
+
+
+class RecordWatchIndex:
+    """
+    Every record's standing mark as it was going into any week of history.
+
+    League records (the game categories of RECORD_CATEGORIES) and each
+    franchise's PERSONAL_RECORD_CATEGORIES are kept as step lists: a step is
+    appended only when a week sets a new mark, so the lists stay short however
+    many seasons accumulate. League steps are [when, value, owner_ids] and
+    personal steps [when, value], with when = season * 100 + week; a mark tied
+    later keeps its first holder. thresholds() bisects each list once per week
+    and caches the result, after which watch_game() checks a matchup against
+    every record in constant time.
+    """
+
+    def __init__(self, league=None, personal=None):
+        self.league = league or {}      # category -> [[when, value, owner_ids], ...]
+        self.personal = personal or {}  # owner_id -> {category -> [[when, value], ...]}
+        self._cache = {}
+
+    def __bool__(self):
+        return bool(self.league)
+
+    @classmethod
+    def build(cls, games):
+        """Index games (in season/week order, as iter_history_weeks() yields them)."""
+        index = cls()
+        for (season, week), week_games in groupby(games, key=lambda g: (g["season"], g["week"])):
+            index.add_week(season, week, week_games)
+        return index
+
+    def add_week(self, season, week, games):
+        """Extend the step lists with one week's games; weeks must arrive in order."""
+        when = season * 100 + week
+        # Every game in a week is judged against the marks from before it,
+        # so the week's best is only committed once the week is done
+        week_best = {}
+        for g in games:
+            for scope, cat, value, oids in game_record_values(g):
+                largest = RECORD_CATEGORIES[cat] if scope == "league" else PERSONAL_RECORD_CATEGORIES[cat]
+                key = (scope, cat, oids[0] if scope == "personal" else None)
+                best = week_best.get(key)
+                if best is None or (value > best[0] if largest else value < best[0]):
+                    week_best[key] = (value, oids)
+        for (scope, cat, oid), (value, oids) in week_best.items():
+            if scope == "league":
+                steps, largest = self.league.setdefault(cat, []), RECORD_CATEGORIES[cat]
+            else:
+                steps = self.personal.setdefault(oid, {}).setdefault(cat, [])
+                largest = PERSONAL_RECORD_CATEGORIES[cat]
+            if steps and not (value > steps[-1][1] if largest else value < steps[-1][1]):
+                continue
+            steps.append([when, value, oids] if scope == "league" else [when, value])
+        self._cache.clear()
+
+    @classmethod
+    def load(cls, path=RECORD_WATCH):
+        if not path.exists():
+            return cls()
+        with open(path) as f:
+            raw = json.load(f)
+        return cls(raw.get("league"), raw.get("personal"))
+
+    def save(self, path=RECORD_WATCH):
+        with open(path, "w") as f:
+            json.dump({"generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "league": self.league, "personal": self.personal}, f, separators=(",", ":"))
+
+    @staticmethod
+    def _before(steps, when):
+        i = bisect_left(steps, [when])
+        return steps[i - 1] if i else None
+
+    def thresholds(self, season, week):
+        """
+        The marks standing before (season, week): ({category: step},
+        {owner_id: {category: step}}). Categories with no qualifying game yet
+        are absent.
+        """
+        when = season * 100 + week
+        if when not in self._cache:
+            league = {}
+            for cat, steps in self.league.items():
+                step = self._before(steps, when)
+                if step:
+                    league[cat] = step
+            personal = {}
+            for oid, cats in self.personal.items():
+                for cat, steps in cats.items():
+                    step = self._before(steps, when)
+                    if step:
+                        personal.setdefault(oid, {})[cat] = step
+            self._cache[when] = (league, personal)
+        return self._cache[when]
+
+    def watch_game(self, game, near=RECORD_WATCH_MARGIN):
+        """
+        Records a game broke, tied or came within `near` points of, judged
+        against the marks standing before its week. Returns [{scope,
+        category, status, value, mark, by, owner_ids, mark_when, mark_holders}]
+        (mark_holders for league records only); status is "broken", "tied" or
+        "near", and `by` is how far past (or short of) the mark it was.
+        """
+        league, personal = self.thresholds(game["season"], game["week"])
+        flags = []
+        for scope, cat, value, oids in game_record_values(game):
+            if scope == "league":
+                step, largest = league.get(cat), RECORD_CATEGORIES[cat]
+            else:
+                step = personal.get(oids[0], {}).get(cat)
+                largest = PERSONAL_RECORD_CATEGORIES[cat]
+            if not step:
+                continue
+            value = round(value, 2)
+            gap = round(value - step[1] if largest else step[1] - value, 2)
+            if gap > 0:
+                status = "broken"
+            elif gap == 0:
+                status = "tied"
+            elif -gap <= near:
+                status = "near"
+            else:
+                continue
+            flag = {"scope": scope, "category": cat, "status": status, "value": value,
+                    "mark": step[1], "by": abs(gap), "owner_ids": oids, "mark_when": step[0]}
+            if scope == "league":
+                flag["mark_holders"] = step[2]
+            flags.append(flag)
+        return flags
+
+
+def write_record_watch(index):
+    """Write data/record_watch.json from an index fed every week of league history."""
+    index.save()
+    n_steps = sum(len(s) for s in index.league.values()) + sum(
+        len(s) for cats in index.personal.values() for s in cats.values())
+    print(f"  Record watch: {len(index.league)} league records, {len(index.personal)} franchises, "
+          f"{n_steps} record-setting weeks ({os.path.getsize(RECORD_WATCH) / 1024:.0f} KB)")
+    return index
 
-    # Streak tracking
-    streaks = {oid: {"current_w": 0, "current_l": 0, "best_w": 0, "best_l": 0}
-               for oid in franchise_map}
 
-    for game in all_games:
-        o1, o2 = game["o1"], game["o2"]
-        p1, p2 = game["p1"], game["p2"]
-        if not o1 or not o2:
+class _Team:
+    """Franchise-name placeholder in a record entry, named once history is done."""
+
+    __slots__ = ("oids",)
+
+    def __init__(self, *oids):
+        self.oids = oids
+
+
+def build_league_history(seasons, leaderboard_size=LEADERBOARD_SIZE):
+    """
+    Build a comprehensive cross-season dataset for history.html.
+    Computes: Elo ratings, all-time records, H2H rivalry matrix,
+    franchise career stats, and record book entries (plus top-N
+    leaderboards per category, all-time / per season / per franchise).
+    """
+    # Stream history one week at a time: franchises register as their first
+    # season arrives, and every per-game structure below is fed week by week,
+    # so no season file or global game list is held beyond the week at hand.
+    # Only the (small) roster maps are kept, for career stats and brackets.
+    season_rosters = {}  # season -> roster_map
+    franchise_map = {}  # owner_id -> {username, team_name, seasons}
+
+    # Record entries name franchises through _Team placeholders, resolved
+    # once history is done so every entry shows the latest team name
+    def team_name(oid):
+        f = franchise_map.get(oid, {})
+        return f.get("team_name") or f.get("username", "?")
+
+    def named(entry):
+        return {k: " vs ".join(team_name(o) for o in v.oids) if isinstance(v, _Team) else v
+                for k, v in entry.items()}
+
+    # Rating engines (Elo, Glicko-2). Every matchup in a week is simultaneous,
+    # so each engine rates the whole week from pre-week ratings. Each
+    # franchise plays once per week, which is why batched Elo reproduces the
+    # old game-by-game numbers exactly.
+    engines = {name: cls() for name, cls in RATING_ENGINES.items()}
+    rating_history = {name: {} for name in engines}
+
+    # Head-to-head rivalry matrix: (o1, o2) -> {wins, losses, pf, pa, games}
+    h2h = {}
+
+    # All-time records book. Every category keeps a bounded top-N leaderboard
+    # (ties at the cutoff included) all-time, per season and per franchise,
+    # filled in a single streaming pass. The classic single-holder records
+    # are each board's #1.
+    boards = {
+        cat: {"all_time": Leaderboard(leaderboard_size, largest), "by_season": {}, "by_franchise": {}}
+        for cat, largest in RECORD_CATEGORIES.items()
+    }
+
+    def push(cat, value, entry, season, oids):
+        board = boards[cat]
+        largest = RECORD_CATEGORIES[cat]
+        board["all_time"].push(value, entry)
+        board["by_season"].setdefault(season, Leaderboard(leaderboard_size, largest)).push(value, entry)
+        for oid in oids:
+            board["by_franchise"].setdefault(oid, Leaderboard(leaderboard_size, largest)).push(value, entry)
+
+    # Streak tracking: current run lengths plus where each run started
+    streaks = {}
+
+    def close_streak(oid, active=False):
+        st = streaks[oid]
+        if not st["start"]:
+            return
+        won_run = st["current_w"] > 0
+        count = st["current_w"] if won_run else st["current_l"]
+        entry = {
+            "count": count,
+            "team": _Team(oid),
+            "owner_id": oid,
+            "start": st["start"], "end": st["end"],
+        }
+        if active:
+            entry["active"] = True
+        cat = "longest_win_streak" if won_run else "longest_losing_streak"
+        push(cat, count, entry, st["start"]["season"], [oid])
+
+    # Record thresholds going into every week, for the week extracts
+    watch = RecordWatchIndex()
+
+    # Schedule luck per season (regular season, franchises as teams),
+    # simulated as each season finishes
+    luck_by_season = {}
+    luck_weeks = []
+
+    def finish_season(season):
+        luck = schedule_luck(luck_weeks, seed=f"luck-{season}")
+        if luck:
+            luck_by_season[season] = luck
+        luck_weeks.clear()
+
+    total_games = 0
+    prev_season = None
+    rated_season = None  # Last season whose games reached the rating engines
+
+    for season, week, roster_map, games in iter_history_weeks(seasons):
+        if season != prev_season:
+            if prev_season is not None:
+                finish_season(prev_season)
+            prev_season = season
+            season_rosters[season] = roster_map
+            for rid_str, info in roster_map.items():
+                oid = info.get("owner_id", "")
+                if oid not in franchise_map:
+                    franchise_map[oid] = {
+                        "owner_id": oid,
+                        "username": info.get("username", "Unknown"),
+                        "team_name": info.get("team_name", ""),
+                        "seasons": {},
+                    }
+                    for name, engine in engines.items():
+                        engine.add_franchise(oid)
+                        rating_history[name][oid] = []
+                    streaks[oid] = {"current_w": 0, "current_l": 0, "best_w": 0, "best_l": 0,
+                                    "start": None}
+                franchise_map[oid]["seasons"][season] = int(rid_str)
+                # Update display name to latest
+                if info.get("username"):
+                    franchise_map[oid]["username"] = info["username"]
+                if info.get("team_name"):
+                    franchise_map[oid]["team_name"] = info["team_name"]
+            print(f"  Loaded {season} season data")
+        if not games:
             continue
+        total_games += len(games)
+
+        # Ratings
+        if rated_season is not None and season != rated_season:
+            for engine in engines.values():
+                engine.new_season()
+        rated_season = season
+        rated = [g for g in games
+                 if g["o1"] and g["o2"] and g["o1"] in franchise_map and g["o2"] in franchise_map]
+        for name, engine in engines.items():
+            engine.update_week(rated)
+            for g in rated:
+                for oid in (g["o1"], g["o2"]):
+                    rating_history[name][oid].append({"season": season, "week": week,
+                                                      **engine.snapshot(oid)})
+
+        watch.add_week(season, week, games)
+
+        luck_games = [g for g in games if not g["is_playoff"] and g["o1"] and g["o2"]]
+        if luck_games:
+            scores = {}
+            for g in luck_games:
+                scores[g["o1"]], scores[g["o2"]] = g["p1"], g["p2"]
+            luck_weeks.append({"scores": scores, "pairs": [(g["o1"], g["o2"]) for g in luck_games]})
+
+        for game in games:
+            o1, o2 = game["o1"], game["o2"]
+            p1, p2 = game["p1"], game["p2"]
+            if not o1 or not o2:
+                continue
 
-        combined = p1 + p2
-        margin = abs(p1 - p2)
-        f1 = franchise_map.get(o1, {})
-        f2 = franchise_map.get(o2, {})
-        name1 = f1.get("team_name") or f1.get("username", "?")
-        name2 = f2.get("team_name") or f2.get("username", "?")
-
-        # Highest single-week score
-        for pts, name, opp_name, oid in [(p1, name1, name2, o1), (p2, name2, name1, o2)]:
-            if pts > records["highest_score"]["points"]:
-                records["highest_score"] = {
-                    "points": pts, "team": name, "opponent": opp_name,
-                    "season": game["season"], "week": game["week"], "owner_id": oid,
+            # Head-to-head: store BOTH directions so every matrix cell is populated
+            for a, b, pa_, pb_ in [(o1, o2, p1, p2), (o2, o1, p2, p1)]:
+                key = (a, b)
+                if key not in h2h:
+                    h2h[key] = {"wins": 0, "losses": 0, "pf": 0, "pa": 0, "games": []}
+                h2h[key]["pf"] += pa_
+                h2h[key]["pa"] += pb_
+                h2h[key]["games"].append({
+                    "season": season, "week": week,
+                    "pts": pa_, "opp_pts": pb_,
+                })
+                if game["winner_owner"] == a:
+                    h2h[key]["wins"] += 1
+                elif game["winner_owner"] == b:
+                    h2h[key]["losses"] += 1
+
+            combined = p1 + p2
+            margin = abs(p1 - p2)
+
+            # Highest single-week score
+            for pts, oid, opp in [(p1, o1, o2), (p2, o2, o1)]:
+                push("highest_score", pts, {
+                    "points": pts, "team": _Team(oid), "opponent": _Team(opp),
+                    "season": season, "week": week, "owner_id": oid,
+                }, season, [oid])
+
+            # Lowest winning score
+            if p1 != p2:
+                winner_pts = max(p1, p2)
+                winner_oid, loser_oid = (o1, o2) if p1 > p2 else (o2, o1)
+                push("lowest_winning_score", winner_pts, {
+                    "points": winner_pts, "team": _Team(winner_oid), "opponent": _Team(loser_oid),
+                    "season": season, "week": week, "owner_id": winner_oid,
+                }, season, [winner_oid])
+
+            # Biggest blowout
+            if margin > 0:
+                push("biggest_blowout", margin, {
+                    "margin": round(margin, 2),
+                    "winner": _Team(o1 if p1 > p2 else o2), "loser": _Team(o2 if p1 > p2 else o1),
+                    "score": f"{max(p1,p2):.1f}-{min(p1,p2):.1f}",
+                    "season": season, "week": week,
+                }, season, [o1, o2])
+
+            # Combined scores
+            if combined > 0:
+                combined_entry = {
+                    "points": round(combined, 2), "teams": _Team(o1, o2),
+                    "score": f"{p1:.1f}-{p2:.1f}",
+                    "season": season, "week": week,
                 }
+                push("highest_combined", combined, combined_entry, season, [o1, o2])
+                push("lowest_combined", combined, combined_entry, season, [o1, o2])
+
+            # Win/loss streaks (a tie breaks a win streak and extends a losing one)
+            if not game["is_playoff"]:
+                for oid in [o1, o2]:
+                    if oid not in streaks:
+                        continue
+                    st = streaks[oid]
+                    won = game["winner_owner"] == oid
+                    if st["start"] is None or won != (st["current_w"] > 0):
+                        close_streak(oid)
+                        st["start"] = {"season": season, "week": week}
+                    st["end"] = {"season": season, "week": week}
+                    if won:
+                        st["current_w"] += 1
+                        st["current_l"] = 0
+                        st["best_w"] = max(st["best_w"], st["current_w"])
+                    else:
+                        st["current_l"] += 1
+                        st["current_w"] = 0
+                        st["best_l"] = max(st["best_l"], st["current_l"])
+
+    if not season_rosters:
+        print("  No season data found. Run fetch for individual seasons first.")
+        return
+    finish_season(prev_season)
 
-        # Lowest winning score
-        if p1 != p2:
-            winner_pts = max(p1, p2)
-            winner_name = name1 if p1 > p2 else name2
-            loser_name = name2 if p1 > p2 else name1
-            winner_oid = o1 if p1 > p2 else o2
-            if winner_pts < records["lowest_winning_score"]["points"]:
-                records["lowest_winning_score"] = {
-                    "points": winner_pts, "team": winner_name, "opponent": loser_name,
-                    "season": game["season"], "week": game["week"], "owner_id": winner_oid,
-                }
+    # Runs still going at the end of history count too
+    for oid in streaks:
+        close_streak(oid, active=True)
 
-        # Biggest blowout
-        if margin > records["biggest_blowout"]["margin"]:
-            records["biggest_blowout"] = {
-                "margin": round(margin, 2), "winner": name1 if p1 > p2 else name2,
-                "loser": name2 if p1 > p2 else name1,
-                "score": f"{max(p1,p2):.1f}-{min(p1,p2):.1f}",
-                "season": game["season"], "week": game["week"],
-            }
+    print(f"  Identified {len(franchise_map)} franchises across {len(season_rosters)} seasons")
+    print(f"  Processed {total_games} total matchups")
 
-        # Combined scores
-        if combined > records["highest_combined"]["points"]:
-            records["highest_combined"] = {
-                "points": round(combined, 2), "teams": f"{name1} vs {name2}",
-                "score": f"{p1:.1f}-{p2:.1f}",
-                "season": game["season"], "week": game["week"],
-            }
-        if combined < records["lowest_combined"]["points"] and combined > 0:
-            records["lowest_combined"] = {
-                "points": round(combined, 2), "teams": f"{name1} vs {name2}",
-                "score": f"{p1:.1f}-{p2:.1f}",
-                "season": game["season"], "week": game["week"],
-            }
+    elo = engines["elo"].ratings
+    elo_history = rating_history["elo"]
 
-        # Win/loss streaks
-        if not game["is_playoff"]:
-            for oid in [o1, o2]:
-                if oid not in streaks:
-                    continue
-                won = game["winner_owner"] == oid
-                if won:
-                    streaks[oid]["current_w"] += 1
-                    streaks[oid]["current_l"] = 0
-                    streaks[oid]["best_w"] = max(streaks[oid]["best_w"], streaks[oid]["current_w"])
-                else:
-                    streaks[oid]["current_l"] += 1
-                    streaks[oid]["current_w"] = 0
-                    streaks[oid]["best_l"] = max(streaks[oid]["best_l"], streaks[oid]["current_l"])
-
-    # Find longest streaks
-    best_win_streak = max(streaks.values(), key=lambda x: x["best_w"])
-    best_win_oid = [oid for oid, s in streaks.items() if s["best_w"] == best_win_streak["best_w"]][0]
-    f = franchise_map.get(best_win_oid, {})
-    records["longest_win_streak"] = {
-        "count": best_win_streak["best_w"],
-        "team": f.get("team_name") or f.get("username", "?"),
-        "owner_id": best_win_oid,
-    }
+    print(f"  Elo ratings computed (top: {max(elo.values()):.0f}, bottom: {min(elo.values()):.0f})")
+    glicko = engines["glicko2"]
+    print(f"  Glicko-2 ratings computed (top: {max(glicko.ratings.values()):.0f}, "
+          f"bottom: {min(glicko.ratings.values()):.0f})")
+    print(f"  Schedule luck simulated for {len(luck_by_season)} season(s) "
+          f"({SCHEDULE_LUCK_SIMS} schedules each)")
+
+    # Convert to serializable format
+    h2h_serial = {}
+    for (o1, o2), data in h2h.items():
+        h2h_serial[f"{o1}|{o2}"] = data
 
-    best_loss_streak = max(streaks.values(), key=lambda x: x["best_l"])
-    best_loss_oid = [oid for oid, s in streaks.items() if s["best_l"] == best_loss_streak["best_l"]][0]
-    f = franchise_map.get(best_loss_oid, {})
-    records["longest_losing_streak"] = {
-        "count": best_loss_streak["best_l"],
-        "team": f.get("team_name") or f.get("username", "?"),
-        "owner_id": best_loss_oid,
+    # All-time boards ship in league_history.json; the per-season and
+    # per-franchise boards only go to the lazily-loaded history shards
+    record_leaderboards = {
+        "size": leaderboard_size,
+        "all_time": {cat: [named(e) for e in b["all_time"].ranked()] for cat, b in boards.items()},
     }
+    scoped_leaderboards = {
+        "by_season": {cat: {s: [named(e) for e in lb.ranked()] for s, lb in b["by_season"].items()}
+                      for cat, b in boards.items()},
+        "by_franchise": {cat: {oid: [named(e) for e in lb.ranked()] for oid, lb in b["by_franchise"].items()}
+                         for cat, b in boards.items()},
+    }
+
+    records = {}
+    for cat, empty in RECORD_DEFAULTS.items():
+        top = record_leaderboards["all_time"][cat]
+        records[cat] = {k: v for k, v in top[0].items() if k != "rank"} if top else dict(empty)
+    for cat in ("longest_win_streak", "longest_losing_streak"):
+        # Keep the compact {count, team, owner_id} shape the pages already read
+        records[cat] = {k: records[cat].get(k) for k in ("count", "team", "owner_id")}
 
     # ---------------------------------------------------------------
-    # 6. Franchise Career Stats
+    # Franchise Career Stats
     # ---------------------------------------------------------------
     franchise_stats = {}
     for oid, info in franchise_map.items():
@@ -859,10 +2608,10 @@ def build_league_history(seasons):
             stats["peak_elo"] = max((e["elo"] for e in elo_history[oid]), default=1500)
 
         # Per-season results
-        for s, data in sorted(all_seasons.items()):
+        for s, roster_map in season_rosters.items():
             rid_str = str(info["seasons"].get(s, ""))
-            if rid_str in data.get("roster_map", {}):
-                r = data["roster_map"][rid_str]
+            if rid_str in roster_map:
+                r = roster_map[rid_str]
                 rec = r.get("final_record", {})
                 w, l, t = rec.get("wins", 0), rec.get("losses", 0), rec.get("ties", 0)
                 pf = rec.get("fpts", 0)
@@ -884,7 +2633,7 @@ def build_league_history(seasons):
         franchise_stats[oid] = stats
 
     # Detect championships and finals from bracket data
-    for s, data in sorted(all_seasons.items()):
+    for s, roster_map in season_rosters.items():
         brackets_path = DATA_DIR / str(s) / "brackets.json"
         if brackets_path.exists():
             with open(brackets_path) as f:
@@ -896,7 +2645,7 @@ def build_league_history(seasons):
                 for game in winners:
                     if game.get("r") == max_round:
                         rid_to_owner = {}
-                        for rid_str, info in all_seasons[s].get("roster_map", {}).items():
+                        for rid_str, info in roster_map.items():
                             rid_to_owner[int(rid_str)] = info.get("owner_id", "")
                         champ_rid = game.get("w")
                         r1 = game.get("t1")
@@ -910,27 +2659,144 @@ def build_league_history(seasons):
                             franchise_stats[champ_oid]["championships"] += 1
 
     # ---------------------------------------------------------------
-    # 7. Build final output
+    # Build final output
     # ---------------------------------------------------------------
     history = {
         "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-        "seasons": list(all_seasons.keys()),
-        "total_games": len(all_games),
+        "seasons": list(season_rosters),
+        "total_games": total_games,
         "franchise_map": {oid: {"username": f["username"], "team_name": f.get("team_name", "")}
                           for oid, f in franchise_map.items()},
         "records": records,
+        "record_leaderboards": record_leaderboards,
         "elo_current": {oid: round(e, 1) for oid, e in elo.items()},
         "elo_history": elo_history,
+        "rating_engines": list(engines),
+        **{f"{name}_current": engine.current()
+           for name, engine in engines.items() if name != "elo"},
+        **{f"{name}_history": rating_history[name] for name in engines if name != "elo"},
         "h2h": h2h_serial,
         "franchise_stats": franchise_stats,
+        "schedule_luck": luck_by_season,
     }
 
     out_path = DATA_DIR / "league_history.json"
     with open(out_path, "w") as f:
         json.dump(history, f, indent=2)
     print(f"  League history saved to {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB)")
+
+    write_history_shards(history, scoped_leaderboards)
+    write_record_watch(watch)
     print(f"  Open history.html in a browser to explore.")
 
 
+def _write_shard(path_stem, payload):
+    """
+    Write a JSON shard whose filename carries a hash of its content.
+    Returns the index entry: path relative to HISTORY_DIR, hash and byte size.
+    """
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    rel = f"{path_stem}.{digest}.json"
+    out_path = HISTORY_DIR / rel
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(body)
+    return {"path": rel, "hash": digest, "bytes": len(body)}
+
+
+def write_history_shards(history, scoped_leaderboards=None):
+    """
+    Split league history into a small landing index plus lazily-loaded shards.
+
+    data/history/index.json              seasons, records, current Elo, franchise
+                                         list/stats and H2H summary (no game logs)
+    data/history/franchises/<oid>.<hash>.json   Elo history, season results and
+                                                the franchise's record leaderboards
+    data/history/pairs/<a>_<b>.<hash>.json      both directions of one rivalry
+    data/history/leaderboards.<hash>.json       all-time + per-season leaderboards
+    data/history/schedule_luck.<hash>.json      per-season schedule luck
+
+    Shard filenames embed a content hash, so unchanged shards keep their URL
+    (and browser cache) across rebuilds. history.html renders the landing view
+    from the index and only fetches the shards a visitor actually opens.
+    """
+    # Content hashes change filenames, so clear out the previous build's shards
+    for sub in ("franchises", "pairs"):
+        shard_dir = HISTORY_DIR / sub
+        if shard_dir.exists():
+            for old in shard_dir.glob("*.json"):
+                old.unlink()
+    for stem in ("leaderboards", "schedule_luck"):
+        for old in HISTORY_DIR.glob(f"{stem}.*.json"):
+            old.unlink()
+    scoped = scoped_leaderboards or {"by_season": {}, "by_franchise": {}}
+
+    franchise_shards = {}
+    franchise_summary = {}
+    for oid, stats in history["franchise_stats"].items():
+        franchise_shards[oid] = _write_shard(f"franchises/{oid}", {
+            "owner_id": oid,
+            "elo_history": history["elo_history"].get(oid, []),
+            **{f"{name}_history": history[f"{name}_history"].get(oid, [])
+               for name in history.get("rating_engines", []) if name != "elo"},
+            "season_results": stats.get("season_results", []),
+            "record_leaderboards": {cat: boards.get(oid, [])
+                                    for cat, boards in scoped["by_franchise"].items()},
+        })
+        franchise_summary[oid] = {k: v for k, v in stats.items() if k != "season_results"}
+
+    # One shard per unordered pair holds both perspectives of the rivalry
+    pair_shards = {}
+    h2h_summary = {}
+    for key, rec in history["h2h"].items():
+        h2h_summary[key] = {
+            "wins": rec["wins"], "losses": rec["losses"],
+            "pf": round(rec["pf"], 1), "pa": round(rec["pa"], 1),
+            "n_games": len(rec["games"]),
+        }
+        a, b = key.split("|")
+        pair_key = "|".join(sorted((a, b)))
+        if pair_key in pair_shards:
+            continue
+        lo, hi = pair_key.split("|")
+        pair_shards[pair_key] = _write_shard(f"pairs/{lo}_{hi}", {
+            "pair": [lo, hi],
+            "h2h": {k: history["h2h"][k] for k in (f"{lo}|{hi}", f"{hi}|{lo}")
+                    if k in history["h2h"]},
+        })
+
+    luck_shard = _write_shard("schedule_luck", history.get("schedule_luck", {}))
+    leaderboard_shard = _write_shard("leaderboards", {
+        "size": history.get("record_leaderboards", {}).get("size"),
+        "all_time": history.get("record_leaderboards", {}).get("all_time", {}),
+        "by_season": scoped["by_season"],
+    })
+
+    index = {
+        "generated_at": history["generated_at"],
+        "seasons": history["seasons"],
+        "total_games": history["total_games"],
+        "franchise_map": history["franchise_map"],
+        "records": history["records"],
+        "elo_current": history["elo_current"],
+        **{f"{name}_current": history[f"{name}_current"]
+           for name in history.get("rating_engines", []) if name != "elo"},
+        "franchise_stats": franchise_summary,
+        "h2h_summary": h2h_summary,
+        "shards": {"franchises": franchise_shards, "pairs": pair_shards,
+                   "leaderboards": leaderboard_shard, "schedule_luck": luck_shard},
+    }
+
+    index_path = HISTORY_DIR / "index.json"
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    shard_bytes = sum(e["bytes"] for e in franchise_shards.values()) + \
+        sum(e["bytes"] for e in pair_shards.values()) + leaderboard_shard["bytes"] + luck_shard["bytes"]
+    print(f"  History index saved to {index_path} ({os.path.getsize(index_path) / 1024:.0f} KB), "
+          f"{len(franchise_shards)} franchise + {len(pair_shards)} rivalry shards "
+          f"({shard_bytes / 1024:.0f} KB)")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Backtest the league Elo model against every game in league history.
+
+Replays all cached games under a grid of (K, mean regression, margin scale)
+settings and scores each configuration on how well its pre-game ratings
+predicted the result: log-loss and Brier score (lower is better). The grid is
+split across a process pool, so a few thousand configurations finish in
+seconds.
+
+Usage:
+    python scripts/backtest_elo.py                        # Default grid, all cached seasons
+    python scripts/backtest_elo.py --k 16:48:4 --regression 0:0.4:0.05 --margin 0,10,20,40
+    python scripts/backtest_elo.py --skip-first-season    # Don't score games played from 1500 starts
+    python scripts/backtest_elo.py --top 20 --out data/elo_backtest.json
+
+Grid values are either comma lists (8,16,32) or start:stop:step ranges
+(inclusive). A margin scale of 0 turns margin weighting off.
+
+No dependencies beyond the Python 3 standard library.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from fetch_sleeper import (  # noqa: E402
+    ELO_BASE, ELO_K, ELO_MARGIN_SCALE, ELO_MEAN_REGRESSION, LEAGUE_IDS,
+    iter_history_weeks,
+)
+
+DEFAULT_K = "8:64:4"
+DEFAULT_REGRESSION = "0:0.5:0.05"
+DEFAULT_MARGIN = "0,5,10,15,20,25,30,40,50,60,80,100"
+EPS = 1e-12  # Clamp probabilities so log-loss stays finite
+
+
+def parse_grid(spec):
+    """Parse '8,16,32' or an inclusive 'start:stop:step' range into floats."""
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        n = int(round((stop - start) / step))
+        return [round(start + i * step, 6) for i in range(n + 1)]
+    return [float(x) for x in spec.split(",") if x.strip()]
+
+
+def load_games(seasons=None):
+    """
+    Load every cached season and compact its games for fast replay.
+
+    Returns (games, n_franchises, first_season_games) where each game is a
+    tuple (new_season, i1, i2, outcome, margin): franchise indices, outcome
+    1 / 0 / 0.5 from team1's side, and the absolute point margin.
+    """
+    seasons = sorted(seasons or LEAGUE_IDS)
+    index = {}
+    games = []
+    first_season_games = 0
+    first_season = prev_season = None
+    for s, _, _, week_games in iter_history_weeks(seasons):
+        for g in week_games:
+            o1, o2 = g["o1"], g["o2"]
+            if not o1 or not o2:
+                continue
+            new_season = prev_season is not None and s != prev_season
+            prev_season = s
+            if first_season is None:
+                first_season = s
+            if s == first_season:
+                first_season_games += 1
+            i1 = index.setdefault(o1, len(index))
+            i2 = index.setdefault(o2, len(index))
+            if g["winner_owner"] == o1:
+                outcome = 1.0
+            elif g["winner_owner"] == o2:
+                outcome = 0.0
+            else:
+                outcome = 0.5
+            games.append((new_season, i1, i2, outcome, abs(g["p1"] - g["p2"])))
+    return games, len(index), first_season_games
+
+
+# Worker state — set once per process so tasks only ship parameter tuples
+_GAMES = None
+_N_FRANCHISES = 0
+_SKIP = 0
+
+
+def _init_worker(games, n_franchises, skip):
+    global _GAMES, _N_FRANCHISES, _SKIP
+    _GAMES, _N_FRANCHISES, _SKIP = games, n_franchises, skip
+
+
+def replay(games, n_franchises, k, regression, margin_scale, skip=0):
+    """
+    Replay games under one Elo configuration.
+
+    Mirrors EloEngine in fetch_sleeper.py exactly (same expected-score
+    formula, between-season regression and margin multiplier) and scores the
+    pre-game expectation of every game after the first `skip`.
+    Returns (log_loss, brier, accuracy, n_scored).
+    """
+    elo = [float(ELO_BASE)] * n_franchises
+    log_loss = brier = correct = 0.0
+    scored = 0
+    for i, (new_season, i1, i2, outcome, margin) in enumerate(games):
+        if new_season:
+            for j in range(n_franchises):
+                elo[j] += regression * (ELO_BASE - elo[j])
+        e1 = 1 / (1 + 10 ** ((elo[i2] - elo[i1]) / 400))
+
+        if i >= skip:
+            p = min(max(e1, EPS), 1 - EPS)
+            log_loss -= outcome * math.log(p) + (1 - outcome) * math.log(1 - p)
+            brier += (e1 - outcome) ** 2
+            if e1 == 0.5:
+                correct += 0.5  # No favourite: call it a coin flip
+            elif outcome != 0.5 and (e1 > 0.5) == (outcome == 1.0):
+                correct += 1
+            scored += 1
+
+        mult = max(1, (margin / margin_scale) ** 0.5) if margin_scale else 1
+        delta = k * mult * (outcome - e1)
+        elo[i1] += delta
+        elo[i2] -= delta
+    if not scored:
+        return float("nan"), float("nan"), float("nan"), 0
+    return log_loss / scored, brier / scored, correct / scored, scored
+
+
+def _run_chunk(configs):
+    return [
+        (k, r, m, *replay(_GAMES, _N_FRANCHISES, k, r, m, _SKIP))
+        for k, r, m in configs
+    ]
+
+
+def run_grid(games, n_franchises, configs, skip=0, workers=None):
+    """Evaluate every (k, regression, margin_scale) config, in parallel chunks."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(configs) < 50:
+        _init_worker(games, n_franchises, skip)
+        return _run_chunk(configs)
+
+    chunk = max(1, len(configs) // (workers * 4))
+    chunks = [configs[i:i + chunk] for i in range(0, len(configs), chunk)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(games, n_franchises, skip)) as pool:
+        for part in pool.map(_run_chunk, chunks):
+            results.extend(part)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest Elo parameters against league history.")
+    parser.add_argument("--k", default=DEFAULT_K, help=f"K-factor grid (default {DEFAULT_K})")
+    parser.add_argument("--regression", default=DEFAULT_REGRESSION,
+                        help=f"Between-season mean regression grid (default {DEFAULT_REGRESSION})")
+    parser.add_argument("--margin", default=DEFAULT_MARGIN,
+                        help=f"Margin scale grid, 0 = no margin weighting (default {DEFAULT_MARGIN})")
+    parser.add_argument("--seasons", help="Comma-separated seasons (default: all cached)")
+    parser.add_argument("--skip-first-season", action="store_true",
+                        help="Score only games after the first season (ratings have warmed up)")
+    parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="How many configurations to print")
+    parser.add_argument("--out", type=Path, help="Write the full ranked grid to this JSON file")
+    args = parser.parse_args()
+
+    seasons = [int(s) for s in args.seasons.split(",")] if args.seasons else None
+    games, n_franchises, first_season_games = load_games(seasons)
+    if not games:
+        print("No cached season data found. Run fetch_sleeper.py --all first.")
+        sys.exit(1)
+    skip = first_season_games if args.skip_first_season else 0
+
+    configs = [
+        (k, r, m)
+        for k in parse_grid(args.k)
+        for r in parse_grid(args.regression)
+        for m in parse_grid(args.margin)
+    ]
+    print(f"Backtesting {len(configs)} Elo configurations over {len(games)} games "
+          f"({len(games) - skip} scored, {n_franchises} franchises)...")
+
+    started = time.perf_counter()
+    results = run_grid(games, n_franchises, configs, skip, args.workers)
+    elapsed = time.perf_counter() - started
+    results.sort(key=lambda r: (r[3], r[4]))
+
+    _init_worker(games, n_franchises, skip)
+    current = replay(games, n_franchises, ELO_K, ELO_MEAN_REGRESSION, ELO_MARGIN_SCALE, skip)
+    current_rank = 1 + sum(1 for r in results if r[3] < current[0])
+
+    print(f"  Done in {elapsed:.2f}s ({len(configs) / max(elapsed, 1e-9):.0f} configs/s)\n")
+    print(f"  {'Rank':>4}  {'K':>6}  {'Regr':>5}  {'Margin':>6}  {'LogLoss':>8}  {'Brier':>7}  {'Acc':>6}")
+    for i, (k, r, m, ll, br, acc, _) in enumerate(results[:args.top], 1):
+        print(f"  {i:>4}  {k:>6g}  {r:>5.2f}  {m:>6g}  {ll:>8.4f}  {br:>7.4f}  {acc:>6.1%}")
+    print(f"\n  Current (K={ELO_K}, regression={ELO_MEAN_REGRESSION}, margin={ELO_MARGIN_SCALE}): "
+          f"log-loss {current[0]:.4f}, Brier {current[1]:.4f}, accuracy {current[2]:.1%} "
+          f"— rank ~{current_rank} of {len(results)}")
+    print(f"  Coin-flip baseline: log-loss {math.log(2):.4f}, Brier 0.2500")
+
+    if args.out:
+        payload = {
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "games": len(games),
+            "scored_games": len(games) - skip,
+            "current": {"k": ELO_K, "regression": ELO_MEAN_REGRESSION, "margin_scale": ELO_MARGIN_SCALE,
+                        "log_loss": round(current[0], 5), "brier": round(current[1], 5),
+                        "accuracy": round(current[2], 4)},
+            "results": [
+                {"k": k, "regression": r, "margin_scale": m, "log_loss": round(ll, 5),
+                 "brier": round(br, 5), "accuracy": round(acc, 4)}
+                for k, r, m, ll, br, acc, _ in results
+            ],
+        }
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"  Full grid written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,44 @@ Extract clean, AI-ready JSON for a specific week from season_combined.json.
 Usage:
     python scripts/extract_week_data.py --week 1
     python scripts/extract_week_data.py --week 1 --season 2025
-    python scripts/extract_week_data.py --all                   # Extract all weeks
+    python scripts/extract_week_data.py --all                   # Extract all weeks (in parallel)
+    python scripts/extract_week_data.py --all --workers 1       # ...one week at a time
     python scripts/extract_week_data.py --week 1 --pretty       # Pretty-print output
-
-Output is saved to content/weeks/week{N}_data.json
+    python scripts/extract_week_data.py --week 1 --budget 3000  # Compact payload, ~3000 tokens max
+    python scripts/extract_week_data.py --all-seasons           # Every cached season in one run
+    python scripts/extract_week_data.py --seasons 2022,2023     # Just these seasons
+
+Output is saved to content/weeks/week{N}_data.json. Multi-season runs write
+content/weeks/{season}/week{N}_data.json instead, plus
+content/weeks/manifest.json.
+
+Context that is the same every week (that season's preseason team profiles,
+all-time records as they stood at the end of the season) goes to
+season_context.json next to the week files, written only when it changes;
+each week file points at it by hash under "context_ref". Pass
+--inline-context to embed it in every week file as before.
 """
 
+import hashlib
 import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 PROJECT_DIR = Path(__file__).parent.parent
 DATA_DIR = PROJECT_DIR / "data"
 OUTPUT_DIR = PROJECT_DIR / "content" / "weeks"
 TEAM_PROFILES = PROJECT_DIR / "content" / "team-profiles.json"
+LUCK_SIMS = 5000  # Random schedules per season of extracts (the history page uses more)
+CHARS_PER_TOKEN = 4  # Rough LLM token estimate for compact JSON
+SEASON_CONTEXT_FILE = "season_context.json"
+
+sys.path.insert(0, str(PROJECT_DIR))
+from fetch_sleeper import (  # noqa: E402
+    RECORD_CATEGORIES, RECORD_DEFAULTS, RecordWatchIndex, add_all_play, schedule_luck_by_week,
+)
 
 
 def load_season_data(season=2025):
@@ -29,7 +52,10 @@ def load_season_data(season=2025):
         print(f"ERROR: {path} not found. Run fetch_sleeper.py --season {season} first.")
         sys.exit(1)
     with open(path) as f:
-        return json.load(f)
+        data = json.load(f)
+    # Files built before all-play standings existed get them filled in here
+    add_all_play(data)
+    return data
 
 
 def load_team_profiles():
@@ -49,6 +75,21 @@ def load_history_data():
     return None
 
 
+def build_elo_index(history_data):
+    """
+    (owner_id, season, week) -> Elo after that week, built once per run.
+
+    Replaces per-team scans of elo_history so Elo lookups stay constant-time
+    however many seasons of history accumulate. The first entry wins if a
+    week somehow appears twice, as the old scan did.
+    """
+    index = {}
+    for oid, entries in (history_data or {}).get("elo_history", {}).items():
+        for e in entries:
+            index.setdefault((oid, e["season"], e["week"]), e["elo"])
+    return index
+
+
 def build_roster_lookup(data):
     """Build roster_id -> team info lookup from roster_map."""
     lookup = {}
@@ -64,7 +105,9 @@ def build_roster_lookup(data):
     return lookup
 
 
-def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=None, history_data=None):
+def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=None, history_data=None,
+                 streaks=None, elo_index=None, prev_summaries=None, token_budget=None,
+                 inline_context=True, record_watch=None, luck=None, static_context=None):
     """
     Extract all AI-ready data for a single week.
 
@@ -73,10 +116,27 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
     - matchups: detailed matchup results with team names, scores, top scorers
     - standings: full standings with movement tracking
     - awards: weekly superlatives
+    - record_watch: league records and personal bests broken, tied or nearly
+      reached this week (with league history)
     - previous_rankings: last week's power rankings (for movement arrows)
     - next_matchups: next week's scheduled matchups (if available)
     - season_context: running stats, streaks, trends
     - team_profiles_summary: condensed preseason context per team
+
+    streaks is a StreakTracker shared across calls when extracting weeks in
+    order; without one, a fresh tracker replays the season up to week_num.
+    elo_index is build_elo_index(history_data), likewise built once per run,
+    as is record_watch (a RecordWatchIndex, loaded from data/record_watch.json
+    when not given). luck is this week's entry of season_schedule_luck(data),
+    also computed once per season by the caller; without it the season's
+    schedules are simulated here. static_context is the season's
+    (context, hash) from season_static_context(), likewise built once per
+    season; without it, it is built here from team_profiles and history_data.
+    prev_summaries, if given, replaces the summaries derived from prev_weeks
+    (see week_summary()). With token_budget, the result is pruned by
+    compact_payload() to fit that many estimated tokens. With
+    inline_context=False, team_profiles_summary and historical_context are
+    left to season_context.json and replaced by a "context_ref" hash.
     """
     weeks = data["weeks"]
     week_idx = None
@@ -184,6 +244,18 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
     # Sort matchups by closest margin first (for narrative interest)
     matchups.sort(key=lambda x: x["margin"])
 
+    if streaks is None:
+        streaks = StreakTracker(data)
+    if elo_index is None and history_data:
+        elo_index = build_elo_index(history_data)
+    if record_watch is None and history_data:
+        record_watch = RecordWatchIndex.load()
+    streaks.advance_to(week_num)
+
+    # --- Schedule luck to date ---
+    if luck is None:
+        luck = season_schedule_luck(data).get(week_num, {})
+
     # --- Standings ---
     standings = []
     for s in week_data["standings"]:
@@ -197,8 +269,7 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
         else:
             movement = 0
 
-        # Compute streak from previous weeks
-        streak = compute_streak(data, week_num, rid, roster_lookup)
+        streak = streaks.streak(rid)
 
         standing_entry = {
             "rank": current_rank,
@@ -214,14 +285,28 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
             "power_score": s["power_score"],
             "week_points": s["week_points"],
             "streak": streak,
+            "all_play_record": "{wins}-{losses}".format(**s["all_play"])
+                               + (f"-{s['all_play']['ties']}" if s["all_play"]["ties"] else ""),
+            "expected_wins": s["expected_wins"],
+            "luck": s["luck"],
         }
+        if s.get("week_all_play"):
+            standing_entry["week_all_play"] = f"{s['week_all_play']['wins']}-{s['week_all_play']['losses']}"
+
+        # expected_wins / luck above are all-play (every team faced every
+        # week); these come from randomly permuted schedules instead
+        if rid in luck:
+            standing_entry["schedule_luck"] = {
+                "perm_expected_wins": luck[rid]["expected_wins"],
+                "perm_luck": luck[rid]["luck"],
+                "percentile": luck[rid]["percentile"],
+            }
 
         # Inject Elo + franchise stats if history data available
         if history_data:
             oid = rid_to_owner.get(rid, "")
             elo_current = history_data.get("elo_current", {})
             franchise_stats = history_data.get("franchise_stats", {})
-            elo_history = history_data.get("elo_history", {})
 
             if oid in elo_current:
                 standing_entry["current_elo"] = elo_current[oid]
@@ -236,12 +321,10 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
 
             # Compute elo_change for this week
             elo_change = None
-            if oid in elo_history:
-                entries = [e for e in elo_history[oid] if e["season"] == data["season"]]
-                this_elo = next((e["elo"] for e in entries if e["week"] == week_num), None)
-                prev_elo = next((e["elo"] for e in entries if e["week"] == week_num - 1), None)
-                if this_elo is not None and prev_elo is not None:
-                    elo_change = round(this_elo - prev_elo, 1)
+            this_elo = elo_index.get((oid, data["season"], week_num))
+            prev_elo = elo_index.get((oid, data["season"], week_num - 1))
+            if this_elo is not None and prev_elo is not None:
+                elo_change = round(this_elo - prev_elo, 1)
             standing_entry["elo_change"] = elo_change
 
         standings.append(standing_entry)
@@ -295,6 +378,12 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
         } if top_performer else None,
     }
 
+    # --- Record Watch ---
+    watch = None
+    if history_data and record_watch:
+        watch = watch_week(record_watch, data["season"], week_data, roster_lookup,
+                           history_data.get("franchise_map", {}))
+
     # --- Season Context ---
     total_weeks_played = week_num
     all_weekly_totals = []
@@ -334,12 +423,15 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
     # --- Next Week Matchups ---
     next_matchups = []
     if next_week_data:
+        rank_by_name = {}
+        for s in standings:
+            rank_by_name.setdefault(s["team_name"], s["rank"])
         for m in next_week_data["matchups"]:
             r1_info = roster_lookup.get(m["team1"]["roster_id"], {})
             r2_info = roster_lookup.get(m["team2"]["roster_id"], {})
             # Find current ranks for each team
-            r1_rank = next((s["rank"] for s in standings if s["team_name"] == r1_info.get("team_name")), "?")
-            r2_rank = next((s["rank"] for s in standings if s["team_name"] == r2_info.get("team_name")), "?")
+            r1_rank = rank_by_name.get(r1_info.get("team_name"), "?")
+            r2_rank = rank_by_name.get(r2_info.get("team_name"), "?")
             next_matchups.append({
                 "team1": r1_info.get("team_name", "?"),
                 "team1_rank": r1_rank,
@@ -347,24 +439,10 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
                 "team2_rank": r2_rank,
             })
 
-    # --- Team Profiles Summary (for callbacks) ---
-    profiles_summary = {}
-    if team_profiles:
-        for team in team_profiles.get("teams", []):
-            profiles_summary[team["name"]] = {
-                "preseason_rank": team["rank"],
-                "tier": team["tier"],
-                "roast": team["roast"],
-                "needs": team["needs"],
-                "weeklyPoints_projected": team["weeklyPoints"],
-                "essay_snippet": team["preseasonEssay"][:500] + "...",
-                "ranks": team.get("ranks", {}),
-            }
-
     # --- Previous Weeks Summary (for callbacks) ---
-    prev_summaries = []
-    if prev_weeks:
-        for pw in prev_weeks:
+    if prev_summaries is None:
+        prev_summaries = []
+        for pw in prev_weeks or []:
             prev_summaries.append({
                 "week": pw["meta"]["week"],
                 "high_scorer": pw["awards"]["high_scorer"]["team_name"],
@@ -387,103 +465,656 @@ def extract_week(data, week_num, roster_lookup, team_profiles=None, prev_weeks=N
         "season_context": season_context,
         "next_matchups": next_matchups,
         "previous_weeks_summary": prev_summaries,
-        "team_profiles_summary": profiles_summary,
     }
+    if watch is not None:
+        result["record_watch"] = watch
+
+    # Static context: inline, or a pointer to the shared season_context.json
+    if static_context is None:
+        static_context = season_static_context(data, team_profiles, history_data)
+    static, digest = static_context
+    if inline_context:
+        result.update(static)
+    else:
+        result["context_ref"] = {"file": SEASON_CONTEXT_FILE, "hash": digest}
+
+    if token_budget:
+        result = compact_payload(result, token_budget, None if inline_context else static)
+    return result
+
+
+WATCH_ORDER = {"broken": 0, "tied": 1, "near": 2}
+
+
+def watch_week(record_watch, season, week_data, roster_lookup, franchise_map):
+    """
+    The record_watch section: every league record and personal best this
+    week's games broke, tied or came within RECORD_WATCH_MARGIN points of,
+    judged against the marks standing before the week. Broken first, league
+    records before personal bests.
+    """
+    names = {oid: f.get("team_name") or f.get("username", "?") for oid, f in franchise_map.items()}
+    names.update({info["owner_id"]: info.get("team_name") or info.get("owner", "?")
+                  for info in roster_lookup.values() if info.get("owner_id")})
 
+    def label(category, oids):
+        # Combined-score records belong to both teams; the rest to the first
+        if category in ("highest_combined", "lowest_combined"):
+            return " vs ".join(names.get(oid, "?") for oid in oids)
+        return names.get(oids[0], "?")
+
+    watch = []
+    for m in week_data["matchups"]:
+        o1 = roster_lookup.get(m["team1"]["roster_id"], {}).get("owner_id", "")
+        o2 = roster_lookup.get(m["team2"]["roster_id"], {}).get("owner_id", "")
+        game = {"season": season, "week": week_data["week"], "o1": o1, "o2": o2,
+                "p1": m["team1"]["points"], "p2": m["team2"]["points"]}
+        for flag in record_watch.watch_game(game):
+            entry = {
+                "status": flag["status"],
+                "scope": flag["scope"],
+                "category": flag["category"],
+                "team": label(flag["category"], flag["owner_ids"]),
+                "value": flag["value"],
+                "mark": flag["mark"],
+                "by": flag["by"],
+                "mark_set": f"{flag['mark_when'] // 100} W{flag['mark_when'] % 100}",
+            }
+            if flag["scope"] == "league":
+                entry["mark_holder"] = label(flag["category"], flag["mark_holders"])
+            watch.append(entry)
+    # Biggest breaks first, then the nearest misses
+    watch.sort(key=lambda e: (WATCH_ORDER[e["status"]], e["scope"] != "league",
+                              e["by"] if e["status"] == "near" else -e["by"]))
+    return watch
+
+
+def build_static_context(team_profiles, history_data, season):
+    """
+    The parts of a week extract that don't change week to week: condensed
+    preseason team profiles (for callbacks) and the all-time records, both as
+    of `season`. Profiles are only included when they were written for that
+    season, and records come from records_through(), so back-filled seasons
+    don't see later preseasons or records set after them.
+    """
+    profiles_summary = {}
+    if team_profiles and str(team_profiles.get("season")) == str(season):
+        for team in team_profiles.get("teams", []):
+            profiles_summary[team["name"]] = {
+                "preseason_rank": team["rank"],
+                "tier": team["tier"],
+                "roast": team["roast"],
+                "needs": team["needs"],
+                "weeklyPoints_projected": team["weeklyPoints"],
+                "essay_snippet": team["preseasonEssay"][:500] + "...",
+                "ranks": team.get("ranks", {}),
+            }
+    context = {"team_profiles_summary": profiles_summary}
     # Inject historical context (all-time records) if available
     if history_data:
-        result["historical_context"] = history_data.get("records")
+        context["historical_context"] = records_through(history_data, season)
+    return context
 
-    return result
 
+def _record_season(entry):
+    """The season a record leaderboard entry belongs to (a streak's by its end)."""
+    return entry["end"]["season"] if "end" in entry else entry["season"]
 
-def compute_streak(data, up_to_week, roster_id, roster_lookup):
-    """Compute current win/loss streak for a team up to a given week."""
-    streak_type = None  # 'W' or 'L'
-    streak_count = 0
 
-    for w in reversed(data["weeks"]):
-        if w["week"] > up_to_week:
-            continue
-        if w.get("is_playoff", False):
+def _season_leaderboards():
+    """Per-season record leaderboards from the history shards ({} if not built)."""
+    index_path = DATA_DIR / "history" / "index.json"
+    if not index_path.exists():
+        return {}
+    with open(index_path) as f:
+        shard = json.load(f).get("shards", {}).get("leaderboards")
+    if not shard:
+        return {}
+    with open(DATA_DIR / "history" / shard["path"]) as f:
+        return json.load(f).get("by_season", {})
+
+
+def records_through(history_data, season):
+    """
+    League history's all-time records as they stood at the end of `season`:
+    each category's best entry from that season or earlier (a streak counts
+    once it has ended). The latest season gets history's records unchanged.
+    Categories whose all-time top-N holds nothing that old fall back to the
+    per-season leaderboards shard.
+    """
+    records = history_data.get("records")
+    if not records or season >= max(history_data.get("seasons") or [season]):
+        return records
+    boards = (history_data.get("record_leaderboards") or {}).get("all_time", {})
+    by_season = None
+    out = {}
+    for cat, current in records.items():
+        entry = next((e for e in boards.get(cat, []) if _record_season(e) <= season), None)
+        if entry is None:
+            if by_season is None:
+                by_season = _season_leaderboards()
+            sign = 1 if RECORD_CATEGORIES[cat] else -1
+            tops = [next((e for e in b if _record_season(e) <= season), None)
+                    for _, b in sorted(by_season.get(cat, {}).items(), key=lambda x: int(x[0]))]
+            tops = [e for e in tops if e]
+            value = next((k for k in ("points", "margin", "count") if k in current), None)
+            entry = max(tops, key=lambda e: sign * e[value], default=None) if value else None
+        if entry is None:
+            out[cat] = dict(RECORD_DEFAULTS[cat])
             continue
+        # Keep the shape of history's records (compact for streaks, no rank)
+        out[cat] = {k: entry.get(k) for k in current} if "count" in current else \
+            {k: v for k, v in entry.items() if k != "rank"}
+    return out
+
+
+def context_hash(season, context):
+    """Short content hash of a season's static context (stable across runs for the same content)."""
+    blob = json.dumps({"season": season, **context}, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:12]
+
+
+def season_static_context(data, team_profiles, history_data):
+    """(context, hash) for every week extract of data's season; build it once per season."""
+    context = build_static_context(team_profiles, history_data, data["season"])
+    return context, context_hash(data["season"], context)
+
+
+def write_season_context(out_dir, season, context, digest):
+    """
+    Write out_dir/season_context.json unless it already holds this content.
+    Returns (path, written).
+    """
+    path = out_dir / SEASON_CONTEXT_FILE
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                if json.load(f).get("hash") == digest:
+                    return path, False
+        except (OSError, ValueError):
+            pass
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"season": season, "hash": digest, **context}, f, ensure_ascii=False)
+    return path, True
+
+
+def estimate_tokens(payload):
+    """Rough token count of a payload as compact JSON (CHARS_PER_TOKEN chars per token)."""
+    text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _record_brief(rec):
+    """One all-time record reduced to value, holder and when."""
+    brief = {k: rec[k] for k in ("points", "margin", "count") if k in rec}
+    holder = rec.get("team") or rec.get("winner") or rec.get("teams")
+    if holder:
+        brief["holder"] = holder
+    if "season" in rec:
+        brief["when"] = f"{rec['season']} W{rec.get('week', '?')}"
+    return brief
+
+
+def _trim_scorers(n):
+    def step(p):
+        for m in p["matchups"]:
+            for side in ("team1", "team2"):
+                m[side]["top_scorers"] = m[side]["top_scorers"][:n]
+    return step
+
+
+def _set_essays(length):
+    def step(p):
+        for prof in (p.get("team_profiles_summary") or {}).values():
+            if length:
+                snippet = prof.get("essay_snippet", "")
+                if len(snippet) > length:
+                    prof["essay_snippet"] = snippet[:length].rstrip(". ") + "..."
+            else:
+                prof.pop("essay_snippet", None)
+    return step
+
+
+def _profiles_core(p):
+    if p.get("team_profiles_summary"):
+        p["team_profiles_summary"] = {
+            name: {k: prof[k] for k in ("preseason_rank", "tier", "roast") if k in prof}
+            for name, prof in p["team_profiles_summary"].items()
+        }
+
+
+def _historical_brief(p):
+    if p.get("historical_context"):
+        p["historical_context"] = {cat: _record_brief(rec) for cat, rec in p["historical_context"].items()}
+
+
+STANDINGS_CORE = ("rank", "movement", "team_name", "record", "pf", "week_points", "streak",
+                  "current_elo", "elo_change", "luck")
+
+
+def _standings_core(p):
+    p["standings"] = [{k: s[k] for k in STANDINGS_CORE if k in s} for s in p["standings"]]
+
+
+def _matchups_core(p):
+    for m in p["matchups"]:
+        m.pop("h2h", None)
+        for side in ("team1", "team2"):
+            m[side].pop("projected", None)
+            m[side]["top_scorers"] = [{"name": t["name"], "points": t["points"]} for t in m[side]["top_scorers"]]
+
+
+def _drop(key):
+    def step(p):
+        p.pop(key, None)
+    return step
+
+
+def _keep_last_weeks(n):
+    def step(p):
+        p["previous_weeks_summary"] = p.get("previous_weeks_summary", [])[-n:]
+    return step
+
+
+def _watch_records_only(p):
+    if "record_watch" in p:
+        p["record_watch"] = [e for e in p["record_watch"] if e["status"] != "near"]
+
 
+# Pruning ladder for compact payloads, least important first. Each step is
+# applied (cumulatively) only while the payload is still over budget; meta,
+# scores, results, core standings and awards are never removed.
+COMPACT_STEPS = (
+    ("essay_snippets_200", _set_essays(200)),
+    ("historical_context_brief", _historical_brief),
+    ("top_scorers_3", _trim_scorers(3)),
+    ("drop_essay_snippets", _set_essays(0)),
+    ("previous_weeks_last_3", _keep_last_weeks(3)),
+    ("record_watch_no_near_misses", _watch_records_only),
+    ("team_profiles_core", _profiles_core),
+    ("standings_core", _standings_core),
+    ("top_scorers_1", _trim_scorers(1)),
+    ("drop_team_profiles", _drop("team_profiles_summary")),
+    ("drop_historical_context", _drop("historical_context")),
+    ("drop_previous_weeks", _drop("previous_weeks_summary")),
+    ("matchups_core", _matchups_core),
+    ("drop_next_matchups", _drop("next_matchups")),
+)
+
+
+def compact_payload(result, token_budget, referenced_context=None):
+    """
+    Prune a week extract to fit token_budget estimated tokens.
+
+    Walks COMPACT_STEPS in priority order until the payload fits (or the
+    ladder runs out), and records what was done in meta["compact"]:
+    estimated tokens before and after, tokens saved and the steps that
+    actually shrank the payload. referenced_context is the static context a
+    by-reference extract points at instead of embedding; its tokens are
+    reported on their own as context_ref_tokens, since a consumer still
+    loads that file, and are not counted as saved.
+    """
+    payload = json.loads(json.dumps(result))
+    ref_tokens = estimate_tokens(referenced_context) if referenced_context else 0
+    full_tokens = estimate_tokens(result)
+    # The report is part of the payload, so it is counted while pruning
+    report = payload["meta"]["compact"] = {
+        "token_budget": token_budget, "full_tokens": full_tokens, "context_ref_tokens": ref_tokens,
+        "tokens": full_tokens, "tokens_saved": 0, "pruned": [], "over_budget": False,
+    }
+    tokens = estimate_tokens(payload)
+    for name, step in COMPACT_STEPS:
+        if tokens <= token_budget:
+            break
+        step(payload)
+        pruned = estimate_tokens(payload)
+        if pruned < tokens:
+            report["pruned"].append(name)
+        tokens = pruned
+
+    report.update(tokens=tokens, tokens_saved=full_tokens - tokens, over_budget=tokens > token_budget)
+    return payload
+
+
+def season_schedule_luck(data, sims=LUCK_SIMS):
+    """
+    Schedule luck to date for every week of a season, keyed by week then
+    roster_id. One set of simulated schedules covers the whole regular
+    season; each week reads the running totals through it, and playoff weeks
+    keep the regular season's final figures.
+    """
+    regular = [w for w in data["weeks"] if not w.get("is_playoff", False)]
+    weeks = []
+    for w in regular:
+        scores = {}
+        pairs = []
         for m in w["matchups"]:
-            t1_rid = m["team1"]["roster_id"]
-            t2_rid = m["team2"]["roster_id"]
-            winner_rid = m.get("winner")
+            r1, r2 = m["team1"]["roster_id"], m["team2"]["roster_id"]
+            scores[r1], scores[r2] = m["team1"]["points"], m["team2"]["points"]
+            pairs.append((r1, r2))
+        weeks.append({"scores": scores, "pairs": pairs})
+    to_date = dict(zip((w["week"] for w in regular),
+                       schedule_luck_by_week(weeks, sims=sims, seed=f"luck-{data['season']}")))
+    by_week = {}
+    current = {}
+    for w in data["weeks"]:
+        current = to_date.get(w["week"], current)
+        by_week[w["week"]] = current
+    return by_week
+
+
+class StreakTracker:
+    """
+    Rolling regular-season win/loss streak per team.
+
+    Weeks are folded in once, in order, so each week costs O(teams) however
+    many weeks came before. Strings match the old reverse scan exactly: a
+    tie breaks any streak and reads "T1" that week (never "T2"), the next
+    win or loss starts again at 1, and playoff weeks leave streaks as they
+    were at the end of the regular season.
+    """
 
-            if roster_id not in (t1_rid, t2_rid):
+    def __init__(self, data):
+        self.weeks = data["weeks"]
+        self.next_idx = 0
+        self.state = {}  # roster_id -> (type, count)
+
+    def advance_to(self, week_num):
+        """Fold in every week up to and including week_num not yet seen."""
+        while self.next_idx < len(self.weeks) and self.weeks[self.next_idx]["week"] <= week_num:
+            w = self.weeks[self.next_idx]
+            self.next_idx += 1
+            if w.get("is_playoff", False):
                 continue
+            for m in w["matchups"]:
+                winner_rid = m.get("winner")
+                for rid in (m["team1"]["roster_id"], m["team2"]["roster_id"]):
+                    if winner_rid is None:
+                        self.state[rid] = ("T", 1)
+                        continue
+                    result = "W" if winner_rid == rid else "L"
+                    kind, count = self.state.get(rid, (None, 0))
+                    self.state[rid] = (result, count + 1 if kind == result else 1)
+
+    def streak(self, roster_id):
+        kind, count = self.state.get(roster_id, (None, 0))
+        return f"{kind}{count}" if kind else "—"
+
+
+def week_summary(week_data, roster_lookup):
+    """
+    The previous_weeks_summary entry for a week, straight from season data.
 
-            if winner_rid == roster_id:
-                result = "W"
-            elif winner_rid is None:
-                return f"T1" if streak_count == 0 else f"{streak_type}{streak_count}"
-            else:
-                result = "L"
+    Same values extract_week derives from a finished extract (awards high
+    scorer, power-rank leader), without running the rest of the extraction.
+    """
+    leader = min(week_data["standings"], key=lambda s: s["power_rank"])
+    return {
+        "week": week_data["week"],
+        "high_scorer": roster_lookup.get(week_data["highest_scorer"]["roster_id"], {}).get("team_name", "?"),
+        "high_score": week_data["highest_scorer"]["points"],
+        "leader": roster_lookup.get(leader["roster_id"], {}).get("team_name", "?"),
+        "leader_record": f"{leader['wins']}-{leader['losses']}"
+                         + (f"-{leader['ties']}" if leader.get("ties", 0) > 0 else ""),
+    }
 
-            if streak_type is None:
-                streak_type = result
-                streak_count = 1
-            elif result == streak_type:
-                streak_count += 1
-            else:
-                return f"{streak_type}{streak_count}"
 
-    return f"{streak_type}{streak_count}" if streak_type else "—"
+def write_week(result, week_num, pretty, out_dir=OUTPUT_DIR):
+    out_path = out_dir / f"week{week_num}_data.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2 if pretty else None, ensure_ascii=False)
+    return out_path
+
+
+def cached_seasons():
+    """Every season under data/ with at least one week of combined data."""
+    seasons = []
+    for path in sorted(DATA_DIR.glob("*/season_combined.json")):
+        if not path.parent.name.isdigit():
+            continue
+        with open(path) as f:
+            if json.load(f).get("weeks"):
+                seasons.append(int(path.parent.name))
+    return seasons
+
+
+def load_shared_context():
+    """Team profiles, league history and its Elo index — loaded once per run, read-only after."""
+    history_data = load_history_data()
+    return {
+        "team_profiles": load_team_profiles(),
+        "history_data": history_data,
+        "elo_index": build_elo_index(history_data),
+        "record_watch": RecordWatchIndex.load(),
+    }
+
+
+def describe_output(out_path, result):
+    size_kb = os.path.getsize(out_path) / 1024
+    compact = result["meta"].get("compact")
+    if not compact:
+        return f"{out_path} ({size_kb:.1f} KB)"
+    return (f"{out_path} ({size_kb:.1f} KB, ~{compact['tokens']} tokens, "
+            f"saved ~{compact['tokens_saved']}{', OVER BUDGET' if compact['over_budget'] else ''})")
+
+
+def prepare_context(data, static_context, out_dir, inline_context):
+    """Write the season's shared context file unless contexts are inlined."""
+    if inline_context:
+        return None
+    context, digest = static_context
+    path, written = write_season_context(out_dir, data["season"], context, digest)
+    print(f"{'Wrote' if written else 'Unchanged'} {path} ({digest})")
+    return {"path": path, "hash": digest}
+
+
+def extract_sequential(data, weeks, shared, pretty, out_dir, token_budget=None, inline_context=True,
+                       static_context=None):
+    """
+    Extract weeks in order, carrying streaks and previous-week summaries
+    forward. Season-wide state (schedule luck, the static context unless
+    given) is computed once up front.
+    """
+    roster_lookup = build_roster_lookup(data)
+    prev_weeks = []
+    written = []
+    streaks = StreakTracker(data)
+    luck = season_schedule_luck(data)
+    if static_context is None:
+        static_context = season_static_context(data, shared["team_profiles"], shared["history_data"])
+    for week_num in weeks:
+        print(f"Extracting {data['season']} Week {week_num}...")
+        result = extract_week(data, week_num, roster_lookup, shared["team_profiles"], prev_weeks,
+                              shared["history_data"], streaks, shared["elo_index"],
+                              token_budget=token_budget, inline_context=inline_context,
+                              record_watch=shared["record_watch"], luck=luck.get(week_num, {}),
+                              static_context=static_context)
+        if result is None:
+            continue
+
+        out_path = write_week(result, week_num, pretty, out_dir)
+        print(f"  -> {describe_output(out_path, result)}")
+        written.append((week_num, out_path))
+
+        # Keep a running summary for subsequent weeks
+        prev_weeks.append(result)
+    return written
+
+
+# Worker state for parallel extraction: shared context is loaded once per
+# process (with each season's static context, built once by the parent), each
+# season's data on first use, and all of it is only read afterwards
+_WORKER = {"seasons": {}}
+
+
+def _init_worker(pretty, token_budget, inline_context, statics):
+    _WORKER.update(load_shared_context(), pretty=pretty, token_budget=token_budget,
+                   inline_context=inline_context, statics=statics)
+
+
+def _worker_season(season):
+    if season not in _WORKER["seasons"]:
+        data = load_season_data(season)
+        _WORKER["seasons"][season] = (data, build_roster_lookup(data))
+    return _WORKER["seasons"][season]
+
+
+def _extract_one(job):
+    season, week_num, prev_summaries, luck, out_dir = job
+    w = _WORKER
+    data, roster_lookup = _worker_season(season)
+    result = extract_week(data, week_num, roster_lookup, w["team_profiles"],
+                          history_data=w["history_data"], elo_index=w["elo_index"],
+                          prev_summaries=prev_summaries, token_budget=w["token_budget"],
+                          inline_context=w["inline_context"], record_watch=w["record_watch"], luck=luck,
+                          static_context=w["statics"][season])
+    if result is None:
+        return season, week_num, None, None
+    out_path = write_week(result, week_num, w["pretty"], Path(out_dir))
+    return season, week_num, out_path, describe_output(out_path, result)
+
+
+def extract_parallel(season_weeks, pretty, workers, token_budget=None, inline_context=True, statics=None):
+    """
+    Two-phase extraction: cheap per-week summaries and the season's schedule
+    luck first, then every full extraction in one process pool (across all
+    seasons). Each week gets the summaries of the weeks before it and its
+    slice of the luck, so files match the sequential run byte for byte.
+    statics maps season -> season_static_context() (built here if not
+    given). season_weeks is [(data, weeks, out_dir)]; returns
+    {season: [(week, path)]}.
+    """
+    if statics is None:
+        shared = load_shared_context()
+        statics = {data["season"]: season_static_context(data, shared["team_profiles"], shared["history_data"])
+                   for data, _, _ in season_weeks}
+    jobs = []
+    for data, weeks, out_dir in season_weeks:
+        roster_lookup = build_roster_lookup(data)
+        by_week = {w["week"]: w for w in data["weeks"]}
+        summaries = [week_summary(by_week[wk], roster_lookup) for wk in weeks]
+        luck = season_schedule_luck(data)
+        jobs.extend((data["season"], wk, summaries[:i], luck.get(wk, {}), str(out_dir))
+                    for i, wk in enumerate(weeks))
+
+    written = {data["season"]: [] for data, _, _ in season_weeks}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pretty, token_budget, inline_context, statics)) as pool:
+        for season, week_num, out_path, described in pool.map(_extract_one, jobs):
+            if out_path is None:
+                continue
+            written[season].append((week_num, out_path))
+            print(f"Extracted {season} Week {week_num} -> {described}")
+    return written
+
+
+def write_manifest(written, contexts=None, out_root=OUTPUT_DIR):
+    """content/weeks/manifest.json: every season-namespaced week file from a batch run."""
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "season_context": {
+            str(season): {"path": str(Path(ctx["path"]).relative_to(PROJECT_DIR)), "hash": ctx["hash"]}
+            for season, ctx in sorted((contexts or {}).items()) if ctx
+        },
+        "seasons": {
+            str(season): [
+                {"week": week, "path": str(Path(path).relative_to(PROJECT_DIR)),
+                 "bytes": os.path.getsize(path)}
+                for week, path in sorted(files)
+            ]
+            for season, files in sorted(written.items())
+        },
+    }
+    path = out_root / "manifest.json"
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def arg_value(args, flag):
+    if flag in args:
+        idx = args.index(flag)
+        if idx + 1 < len(args):
+            return args[idx + 1]
+        print(f"{flag} requires a value")
+        sys.exit(1)
+    return None
 
 
 def main():
     args = sys.argv[1:]
-    season = 2025
     pretty = "--pretty" in args
     extract_all = "--all" in args
-
-    if "--season" in args:
-        idx = args.index("--season")
-        if idx + 1 < len(args):
-            season = int(args[idx + 1])
-
+    workers = max(1, int(arg_value(args, "--workers") or os.cpu_count() or 1))
+    budget = int(arg_value(args, "--budget") or 0) or None
+    inline_context = "--inline-context" in args
+
+    # Batch mode: several seasons, each into content/weeks/<season>/, plus a manifest
+    batch = None
+    if "--all-seasons" in args:
+        batch = cached_seasons()
+    elif arg_value(args, "--seasons"):
+        batch = [int(x) for x in arg_value(args, "--seasons").split(",") if x.strip()]
+
+    if batch is not None:
+        if not batch:
+            print("No cached seasons found. Run fetch_sleeper.py --all first.")
+            sys.exit(1)
+        started = time.perf_counter()
+        shared = load_shared_context()
+        season_weeks = []
+        for season in batch:
+            data = load_season_data(season)
+            out_dir = OUTPUT_DIR / str(season)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            season_weeks.append((data, sorted(w["week"] for w in data["weeks"]), out_dir))
+        statics = {data["season"]: season_static_context(data, shared["team_profiles"], shared["history_data"])
+                   for data, _, _ in season_weeks}
+        contexts = {data["season"]: prepare_context(data, statics[data["season"]], out_dir, inline_context)
+                    for data, _, out_dir in season_weeks}
+        total = sum(len(weeks) for _, weeks, _ in season_weeks)
+        print(f"Extracting {total} weeks across {len(batch)} season(s) with {workers} worker(s)...")
+
+        if workers > 1:
+            written = extract_parallel(season_weeks, pretty, workers, budget, inline_context, statics)
+        else:
+            written = {data["season"]: extract_sequential(data, weeks, shared, pretty, out_dir, budget,
+                                                          inline_context, statics[data["season"]])
+                       for data, weeks, out_dir in season_weeks}
+        manifest = write_manifest(written, contexts)
+        done = sum(len(files) for files in written.values())
+        print(f"\nDone! Extracted {done} week(s) in {time.perf_counter() - started:.1f}s. Manifest: {manifest}")
+        return
+
+    season = int(arg_value(args, "--season") or 2025)
     data = load_season_data(season)
-    roster_lookup = build_roster_lookup(data)
-    team_profiles = load_team_profiles()
-    history_data = load_history_data()
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     if extract_all:
         weeks_to_extract = [w["week"] for w in data["weeks"]]
     elif "--week" in args:
-        idx = args.index("--week")
-        if idx + 1 < len(args):
-            weeks_to_extract = [int(args[idx + 1])]
-        else:
-            print("--week requires a number")
-            sys.exit(1)
+        weeks_to_extract = [int(arg_value(args, "--week"))]
     else:
-        print("Usage: python extract_week_data.py --week N [--season YYYY] [--all] [--pretty]")
+        print("Usage: python extract_week_data.py --week N [--season YYYY] [--all [--workers N]] [--budget TOKENS] [--inline-context] [--pretty]")
+        print("       python extract_week_data.py --seasons 2022,2023 | --all-seasons [--workers N] [--budget TOKENS] [--inline-context] [--pretty]")
         sys.exit(1)
 
-    # Extract sequentially so each week can reference previous weeks
-    prev_weeks = []
-    for week_num in sorted(weeks_to_extract):
-        print(f"Extracting Week {week_num}...")
-        result = extract_week(data, week_num, roster_lookup, team_profiles, prev_weeks, history_data)
-        if result is None:
-            continue
-
-        out_path = OUTPUT_DIR / f"week{week_num}_data.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2 if pretty else None, ensure_ascii=False)
-
-        size_kb = os.path.getsize(out_path) / 1024
-        print(f"  -> {out_path} ({size_kb:.1f} KB)")
-
-        # Keep a running summary for subsequent weeks
-        prev_weeks.append(result)
+    weeks_to_extract = sorted(weeks_to_extract)
+    shared = load_shared_context()
+    static_context = season_static_context(data, shared["team_profiles"], shared["history_data"])
+    prepare_context(data, static_context, OUTPUT_DIR, inline_context)
+    if extract_all and workers > 1 and len(weeks_to_extract) > 1:
+        print(f"Extracting {len(weeks_to_extract)} weeks with {workers} workers...")
+        written = extract_parallel([(data, weeks_to_extract, OUTPUT_DIR)], pretty, workers, budget,
+                                   inline_context, {season: static_context})[season]
+    else:
+        # Sequential so each week can reference previous weeks
+        written = extract_sequential(data, weeks_to_extract, shared, pretty, OUTPUT_DIR, budget,
+                                     inline_context, static_context)
 
-    print(f"\nDone! Extracted {len(weeks_to_extract)} week(s).")
+    print(f"\nDone! Extracted {len(written)} week(s).")
 
 
 if __name__ == "__main__":
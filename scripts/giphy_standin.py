@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""Local stand-in for the Giphy API, for exercising resolve_media.py offline.
+
+Usage:
+  python scripts/giphy_standin.py                          # http://127.0.0.1:8765
+  python scripts/giphy_standin.py --latency 0.3            # Simulate a slow network
+  python scripts/giphy_standin.py --fixtures fixtures.json # Serve recorded responses
+
+Then point resolve_media.py at it (no GIPHY_API_KEY needed):
+  python scripts/resolve_media.py --api-base http://127.0.0.1:8765/v1/gifs --content ... --preview
+
+Serves the endpoints resolve_media.py uses:
+  /v1/gifs/search?q=&limit=&offset=   search
+  /v1/gifs/<id>                       one GIF by ID
+  /v1/gifs?ids=a,b,c                  several GIFs by ID
+  /media/<id>/<file>                  media bytes, standing in for Giphy's CDN
+  /__stats                            request counts per endpoint (for benchmarks)
+
+Fixtures are {"searches": {query: [gif_id, ...]}, "gifs": {gif_id: <Giphy GIF
+object>}}. Queries and IDs not in the fixtures get deterministic synthetic
+GIFs (SYNTHETIC_RESULTS per query), so any content file resolves. Synthetic
+GIFs come in the RENDITIONS sizes, and their media URLs point back here with
+deterministic bytes of the advertised size.
+
+Dependencies: stdlib only
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+SYNTHETIC_RESULTS = 25  # search results available for a query not in the fixtures
+# Synthetic renditions: Giphy image key -> (file name, width, height, bytes)
+RENDITIONS = {
+    "original_mp4": ("giphy.mp4", 480, 270, 96_000),
+    "downsized_small": ("giphy-downsized-small.mp4", 480, 270, 48_000),
+    "fixed_height": ("200.mp4", 356, 200, 30_000),
+    "fixed_width": ("200w.mp4", 200, 113, 14_000),
+    "original_still": ("giphy_s.gif", 480, 270, 40_000),
+    "480w_still": ("480w_s.jpg", 480, 270, 12_000),
+    "fixed_width_still": ("200w_s.gif", 200, 113, 6_000),
+}
+MEDIA_SIZES = {name: size for name, _, _, size in RENDITIONS.values()}
+
+
+class StandinState:
+    """Fixtures plus request counters, shared by the handler threads."""
+
+    def __init__(self, fixtures: dict, latency: float, base_url: str):
+        self.searches = fixtures.get("searches", {})
+        self.gifs = fixtures.get("gifs", {})
+        self.latency = latency
+        self.base_url = base_url
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def count(self, endpoint: str) -> None:
+        with self.lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def gif(self, giphy_id: str) -> dict:
+        """The fixture GIF, or a synthetic one whose media URLs point back here."""
+        if giphy_id in self.gifs:
+            return self.gifs[giphy_id]
+        media = f"{self.base_url}/media/{giphy_id}"
+        images = {"original": {"url": f"{media}/giphy.gif", "width": "480", "height": "270"}}
+        for key, (name, width, height, size) in RENDITIONS.items():
+            kind, size_key = ("mp4", "mp4_size") if name.endswith(".mp4") else ("url", "size")
+            images[key] = {kind: f"{media}/{name}", "width": str(width), "height": str(height),
+                           size_key: str(size)}
+        return {
+            "id": giphy_id,
+            "title": f"Stand-in GIF {giphy_id}",
+            "url": f"https://giphy.com/gifs/{giphy_id}",
+            "rating": "g",
+            "images": images,
+        }
+
+    def search(self, query: str) -> list[str]:
+        if query in self.searches:
+            return self.searches[query]
+        return [hashlib.sha1(f"{query}:{i}".encode()).hexdigest()[:12] for i in range(SYNTHETIC_RESULTS)]
+
+
+def media_bytes(giphy_id: str, name: str) -> bytes:
+    """Deterministic bytes for one synthetic media file, at its advertised size."""
+    seed = hashlib.sha256(f"{giphy_id}/{name}".encode()).digest()
+    size = MEDIA_SIZES.get(name, 10_000)
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+MEDIA_TYPES = {".mp4": "video/mp4", ".gif": "image/gif", ".jpg": "image/jpeg", ".webp": "image/webp"}
+
+
+def make_handler(state: StandinState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def send_json(self, payload: dict, status: int = 200) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            path = url.path.rstrip("/")
+
+            if path == "/__stats":
+                with state.lock:
+                    counts = dict(state.counts)
+                self.send_json({"requests": sum(counts.values()), "by_endpoint": counts})
+                return
+
+            if state.latency:
+                time.sleep(state.latency)
+
+            if path == "/v1/gifs/search":
+                state.count("search")
+                offset = int(query.get("offset", 0))
+                limit = int(query.get("limit", 25))
+                ids = state.search(query.get("q", ""))[offset:offset + limit]
+                self.send_json({"data": [state.gif(i) for i in ids],
+                                "pagination": {"offset": offset, "count": len(ids)}})
+            elif path == "/v1/gifs" and "ids" in query:
+                state.count("ids")
+                ids = [i for i in query["ids"].split(",") if i]
+                self.send_json({"data": [state.gif(i) for i in ids]})
+            elif path.startswith("/media/") and path.count("/") == 3:
+                state.count("media")
+                _, _, giphy_id, name = path.split("/")
+                body = media_bytes(giphy_id, name)
+                self.send_response(200)
+                self.send_header("Content-Type", MEDIA_TYPES.get(Path(name).suffix, "application/octet-stream"))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif path.startswith("/v1/gifs/"):
+                state.count("gif")
+                self.send_json({"data": state.gif(path.rsplit("/", 1)[-1])})
+            else:
+                state.count("other")
+                self.send_json({"message": "Not found"}, status=404)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Giphy API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every API response")
+    parser.add_argument("--fixtures", type=Path, help="JSON fixtures: {searches: {...}, gifs: {...}}")
+    args = parser.parse_args()
+
+    fixtures = json.loads(args.fixtures.read_text(encoding="utf-8")) if args.fixtures else {}
+    base_url = f"http://{args.host}:{args.port}"
+    state = StandinState(fixtures, args.latency, base_url)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Giphy stand-in on {base_url}/v1/gifs (latency {args.latency}s, "
+          f"{len(state.searches)} fixture queries, {len(state.gifs)} fixture GIFs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Query the per-player weekly points table (data/player_points.bin).
+
+Usage:
+    python scripts/player_points.py --best 10                 # Best individual starts ever
+    python scripts/player_points.py --best 10 --season 2024   # ...in one season
+    python scripts/player_points.py --best 10 --bench         # Include bench weeks
+    python scripts/player_points.py --player 4881             # A player's career in the league
+    python scripts/player_points.py --player "Josh Allen"     # Name lookup needs data/players.json
+
+The table is written by fetch_sleeper.py; run it first if the file is missing.
+No dependencies beyond the Python 3 standard library.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from fetch_sleeper import DATA_DIR, PLAYER_POINTS, PlayerPointsTable  # noqa: E402
+
+
+def load_names():
+    """player_id -> display name from the cached Sleeper players database, if present."""
+    path = DATA_DIR / "players.json"
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        players = json.load(f)
+    return {pid: p.get("full_name") or f"{p.get('first_name', '')} {p.get('last_name', '')}".strip() or pid
+            for pid, p in players.items()}
+
+
+def load_owner_names():
+    """owner_id -> latest team name from league history, if built."""
+    path = DATA_DIR / "league_history.json"
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        fmap = json.load(f).get("franchise_map", {})
+    return {oid: f.get("team_name") or f.get("username") or oid for oid, f in fmap.items()}
+
+
+def print_rows(rows, names, owners):
+    print(f"  {'Season':>6}  {'Wk':>3}  {'Player':<24}  {'Team':<24}  {'Pts':>6}  {'Proj':>6}")
+    for r in rows:
+        proj = f"{r['projection']:.2f}" if r["projection"] is not None else "—"
+        name = names.get(r["player_id"], r["player_id"]) + ("" if r["started"] else " (BN)")
+        team = owners.get(r["owner_id"], r["owner_id"])
+        print(f"  {r['season']:>6}  {r['week']:>3}  {name[:24]:<24}  {team[:24]:<24}  "
+              f"{r['points']:>6.2f}  {proj:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query per-player weekly points across seasons.")
+    parser.add_argument("--best", type=int, help="Show the N best individual games")
+    parser.add_argument("--season", type=int, help="Limit --best to one season")
+    parser.add_argument("--bench", action="store_true", help="Include bench weeks in --best")
+    parser.add_argument("--player", help="Player ID or exact full name")
+    args = parser.parse_args()
+    if not args.best and not args.player:
+        parser.error("choose --best N and/or --player")
+
+    if not PLAYER_POINTS.exists():
+        print(f"ERROR: {PLAYER_POINTS} not found. Run fetch_sleeper.py first.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    table = PlayerPointsTable.load()
+    print(f"Loaded {len(table)} player-weeks in {(time.perf_counter() - started) * 1000:.1f} ms")
+    names, owners = load_names(), load_owner_names()
+
+    if args.best:
+        started = time.perf_counter()
+        rows = table.best_games(args.best, started_only=not args.bench, season=args.season)
+        print(f"\nBest individual games ({(time.perf_counter() - started) * 1000:.1f} ms):")
+        print_rows(rows, names, owners)
+
+    if args.player:
+        pid = args.player
+        if pid not in table.players:
+            matches = [p for p, n in names.items() if n.lower() == args.player.lower() and p in table.players]
+            if not matches:
+                print(f"\nNo league history for player {args.player!r}")
+                sys.exit(1)
+            pid = matches[0]
+        started = time.perf_counter()
+        rows = table.career(pid)
+        elapsed = (time.perf_counter() - started) * 1000
+        starts = [r for r in rows if r["started"]]
+        print(f"\n{names.get(pid, pid)}: {len(rows)} rostered weeks, {len(starts)} starts, "
+              f"{sum(r['points'] for r in starts):.2f} points as a starter ({elapsed:.2f} ms)")
+        print_rows(rows, names, owners)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,34 +6,87 @@ Modes:
   --more ID     Fetch next 3 candidates for a specific slot
   --pick ID GID Write a Giphy pick to media_picks.json (never touches content JSON)
   --resolve     Produce final media_cache.json with resolved URLs
+  --all-content --resolve
+                Resolve every *_content.json under content/ in one run, with
+                shared, deduplicated lookups; also writes content/media_index.json
 
 The content JSON is NEVER modified. Picks live in media_picks.json.
-Resolved URLs live in media_cache.json. Both are gitignored.
+Resolved URLs live in media_cache.json. Both are gitignored. Each content
+file gets its own, stem-prefixed copies next to it: week3_content.json has
+week3_media_picks.json, week3_media_cache.json, ... Sidecars still under the
+old plain names are moved to the prefixed ones on the next run.
 
 Requires GIPHY_API_KEY in environment for --preview/--resolve/--more.
 Falls back to existing media_cache.json for rendering if key is absent.
 
+Slot searches run concurrently (SEARCH_WORKERS at a time) over one pooled
+HTTP session, spaced to stay under GIPHY_MAX_RPS requests per second. Giphy
+meters keys by the hour, so requests are also budgeted against
+GIPHY_HOURLY_QUOTA per rolling hour (--hourly-quota or $GIPHY_HOURLY_QUOTA;
+beta keys get 100, 0 turns the budget off), with request times kept in
+.giphy_quota.json across runs. A slot that can't be served within the quota,
+or that Giphy still answers 429 for after GIPHY_MAX_RETRIES, is skipped and
+reported; the rest of the batch carries on.
+
+Search results are cached on disk (.giphy_cache.json at the project root) by
+query, offset, limit and rating for GIPHY_CACHE_TTL seconds, least recently
+used entries evicted past GIPHY_CACHE_MAX_ENTRIES; --no-cache bypasses it.
+Point --api-base (or GIPHY_API_BASE) at scripts/giphy_standin.py to run
+against local fixtures; no API key is needed then.
+
+--resolve --mirror also downloads each Giphy slot's MP4 and poster into
+media/giphy/, named by content hash so shared GIFs are stored once. Each slot
+gets the smallest rendition at least its display width wide, recorded with
+its path, byte size and dimensions under "local" in media_cache.json.
+
 Dependencies: stdlib + requests
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+import threading
+import time
 import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("ERROR: 'requests' library required. Install with: pip install requests")
     sys.exit(2)
 
-GIPHY_API_BASE = "https://api.giphy.com/v1/gifs"
+PROJECT_DIR = Path(__file__).parent.parent
+CONTENT_ROOT = PROJECT_DIR / "content"
+DEFAULT_GIPHY_API_BASE = "https://api.giphy.com/v1/gifs"
+GIPHY_API_BASE = os.environ.get("GIPHY_API_BASE", "").rstrip("/") or DEFAULT_GIPHY_API_BASE
+GIPHY_CACHE_PATH = Path(os.environ.get("GIPHY_CACHE_PATH", "") or PROJECT_DIR / ".giphy_cache.json")
+GIPHY_CACHE_TTL = 24 * 3600        # seconds a cached search stays fresh
+GIPHY_CACHE_MAX_ENTRIES = 2000     # least recently used searches evicted beyond this
 CANDIDATES_PER_SLOT = 3
 GIPHY_RATING = "pg-13"  # filter out explicit content
+SEARCH_WORKERS = 8      # concurrent Giphy requests (also the connection pool size)
+GIPHY_MAX_RPS = float(os.environ.get("GIPHY_MAX_RPS", "") or 10)  # burst rate cap across all workers
+GIPHY_HOURLY_QUOTA = int(os.environ.get("GIPHY_HOURLY_QUOTA", "") or 100)  # per key per rolling hour; 0 = off
+GIPHY_QUOTA_PATH = Path(os.environ.get("GIPHY_QUOTA_PATH", "") or PROJECT_DIR / ".giphy_quota.json")
+GIPHY_MAX_RETRIES = 3   # retries on HTTP 429, honouring Retry-After
+GIPHY_IDS_PER_REQUEST = 100  # GIF IDs per multi-ID lookup
+# Full-loop MP4 and poster renditions considered for the local mirror
+MP4_RENDITIONS = ("original_mp4", "hd", "downsized_small", "fixed_width", "fixed_height",
+                  "fixed_width_small", "fixed_height_small")
+STILL_RENDITIONS = ("original_still", "480w_still", "fixed_width_still", "fixed_height_still",
+                    "fixed_width_small_still", "fixed_height_small_still")
+MEDIA_STORE = PROJECT_DIR / "media" / "giphy"     # content-addressed local mirror
+MEDIA_MANIFEST = MEDIA_STORE / "manifest.json"    # source URL -> mirrored file
+MEDIA_DISPLAY_WIDTH = 480  # CSS px a .media-slot shows at; a slot's "display_width" overrides
+MEDIA_EXTENSIONS = {"video/mp4": ".mp4", "image/gif": ".gif", "image/webp": ".webp", "image/jpeg": ".jpg"}
 
 
 # ── Giphy API ────────────────────────────────────────────────────────
@@ -41,6 +94,8 @@ GIPHY_RATING = "pg-13"  # filter out explicit content
 def get_api_key() -> str:
     """Read GIPHY_API_KEY from environment."""
     key = os.environ.get("GIPHY_API_KEY", "").strip()
+    if not key and GIPHY_API_BASE != DEFAULT_GIPHY_API_BASE:
+        return "standin"  # a local stand-in doesn't check keys
     if not key:
         print("ERROR: GIPHY_API_KEY not set in environment.")
         print("  Set it with: $env:GIPHY_API_KEY='your_key_here'  (PowerShell)")
@@ -49,6 +104,174 @@ def get_api_key() -> str:
     return key
 
 
+class GiphyRateLimited(Exception):
+    """Giphy refused a request (HTTP 429 after retries) or the hourly quota is used up."""
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/per_second apart, across threads, and counts them.
+
+    With per_hour, also keeps the time of every call in the last hour and
+    raises GiphyRateLimited instead of making a call past that budget. Once
+    Giphy itself refuses a call (exhaust()), every later call in the run is
+    refused too. Call times are loaded from and saved to `path` per API base,
+    so consecutive runs share the budget.
+    """
+
+    def __init__(self, per_second: float, per_hour: int = 0, path: "Path | None" = None):
+        self.interval = 1.0 / per_second
+        self.per_hour = per_hour
+        self.path = path
+        self.next_at = 0.0
+        self.calls = 0
+        self.exhausted = False
+        self.recent = deque()  # wall-clock times of calls in the last hour
+        self.lock = threading.Lock()
+        if path and path.exists():
+            try:
+                log = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                log = {}
+            cutoff = time.time() - 3600
+            self.recent.extend(t for t in log.get(GIPHY_API_BASE, []) if t > cutoff)
+
+    def wait(self) -> None:
+        with self.lock:
+            wall = time.time()
+            while self.recent and self.recent[0] <= wall - 3600:
+                self.recent.popleft()
+            if self.exhausted:
+                raise GiphyRateLimited("Giphy is rate-limiting this key")
+            if self.per_hour and len(self.recent) >= self.per_hour:
+                frees = time.strftime("%H:%M", time.localtime(self.recent[0] + 3600))
+                raise GiphyRateLimited(f"hourly quota of {self.per_hour} requests used (next frees at {frees})")
+            self.recent.append(wall)
+            self.calls += 1
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+    def exhaust(self) -> None:
+        with self.lock:
+            self.exhausted = True
+
+    def save(self) -> None:
+        if not self.path or not self.calls:
+            return
+        log = {}
+        if self.path.exists():
+            try:
+                log = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        with self.lock:
+            log[GIPHY_API_BASE] = list(self.recent)
+        self.path.write_text(json.dumps(log), encoding="utf-8")
+
+
+class QueryCache:
+    """
+    Disk-backed Giphy search cache with TTL and LRU eviction.
+
+    Entries live in a dict kept in least- to most-recently-used order (a hit
+    moves its key to the end), so eviction pops from the front. Keys carry
+    the API base, so stand-in results never mix with real ones. Thread-safe;
+    written back by save() only when an entry was added or expired. A hit's
+    reordering alone doesn't count: order only matters once put() evicts,
+    and it is saved along with that put.
+    """
+
+    def __init__(self, path: Path, ttl: float = GIPHY_CACHE_TTL, max_entries: int = GIPHY_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}  # key -> {"at": unix time stored, "results": [...]}
+        self.hits = self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding="utf-8")).get("entries", {})
+            except (OSError, ValueError):
+                print(f"WARNING: Ignoring unreadable query cache {path}")
+
+    @staticmethod
+    def key(query: str, offset: int, limit: int, rating: str) -> str:
+        return json.dumps([GIPHY_API_BASE, query, offset, limit, rating])
+
+    def get(self, key: str) -> "list[dict] | None":
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None or time.time() - entry["at"] > self.ttl:
+                self.misses += 1
+                self.dirty |= entry is not None
+                return None
+            self.entries[key] = entry
+            self.hits += 1
+            return [dict(r) for r in entry["results"]]
+
+    def put(self, key: str, results: list[dict]) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = {"at": time.time(), "results": [dict(r) for r in results]}
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.dirty = True
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.dirty:
+                return
+            now = time.time()
+            self.entries = {k: e for k, e in self.entries.items() if now - e["at"] <= self.ttl}
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"entries": self.entries}, separators=(",", ":")), encoding="utf-8")
+            tmp.replace(self.path)
+            self.dirty = False
+
+
+_query_cache = None  # set by open_query_cache(); None = no caching
+_session = None
+_session_lock = threading.Lock()
+_limiter = RateLimiter(GIPHY_MAX_RPS)  # replaced by open_rate_limiter() for CLI runs
+
+
+def get_session() -> "requests.Session":
+    """One keep-alive session for every Giphy call, pooled for SEARCH_WORKERS threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SEARCH_WORKERS)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def giphy_get(path: str, params: dict) -> dict:
+    """
+    GET a Giphy endpoint through the shared session and rate limiter.
+    Raises GiphyRateLimited when the quota is used up or Giphy still answers
+    429 after GIPHY_MAX_RETRIES retries (which ends requests for the run).
+    """
+    url = f"{GIPHY_API_BASE}{path}?{urlencode(params)}"
+    for attempt in range(GIPHY_MAX_RETRIES + 1):
+        _limiter.wait()
+        resp = get_session().get(url, timeout=10)
+        if resp.status_code == 429:
+            if attempt == GIPHY_MAX_RETRIES:
+                _limiter.exhaust()
+                raise GiphyRateLimited(f"HTTP 429 after {GIPHY_MAX_RETRIES} retries")
+            retry_after = resp.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.replace(".", "", 1).isdigit() else 2 ** attempt)
+            continue
+        resp.raise_for_status()
+        return resp.json()
+
+
 def search_giphy(query: str, api_key: str, limit: int = 3, offset: int = 0) -> list[dict]:
     """Search Giphy and return simplified result list."""
     params = {
@@ -59,51 +282,52 @@ def search_giphy(query: str, api_key: str, limit: int = 3, offset: int = 0) -> l
         "rating": GIPHY_RATING,
         "lang": "en",
     }
-    url = f"{GIPHY_API_BASE}/search?{urlencode(params)}"
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-
-    results = []
-    for gif in data.get("data", []):
-        images = gif.get("images", {})
-        original = images.get("original", {})
-        original_mp4 = images.get("original_mp4", {})
-        still = images.get("original_still", {})
-        fixed = images.get("fixed_width", {})
-
-        # Prefer original_mp4, fall back to fixed_width mp4
-        mp4_url = original_mp4.get("mp4", "") or fixed.get("mp4", "")
-
-        results.append({
-            "giphy_id": gif.get("id", ""),
-            "title": gif.get("title", ""),
-            "mp4_url": mp4_url,
-            "gif_url": original.get("url", ""),
-            "poster_url": still.get("url", ""),
-            "width": int(original.get("width", 0) or 0),
-            "height": int(original.get("height", 0) or 0),
-            "rating": gif.get("rating", ""),
-            "source_url": gif.get("url", ""),
-        })
-
+    key = QueryCache.key(query, offset, limit, GIPHY_RATING)
+    if _query_cache is not None:
+        cached = _query_cache.get(key)
+        if cached is not None:
+            return cached
+    data = giphy_get("/search", params)
+    results = [simplify_gif(gif) for gif in data.get("data", [])]
+    if _query_cache is not None:
+        _query_cache.put(key, results)
     return results
 
 
 def fetch_giphy_by_id(giphy_id: str, api_key: str) -> dict:
     """Fetch a specific Giphy GIF by ID."""
-    params = {"api_key": api_key}
-    url = f"{GIPHY_API_BASE}/{giphy_id}?{urlencode(params)}"
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    gif = resp.json().get("data", {})
+    gif = giphy_get(f"/{giphy_id}", {"api_key": api_key}).get("data", {})
+    return simplify_gif(gif)
+
+
+def fetch_giphy_by_ids(giphy_ids: list[str], api_key: str) -> tuple[dict, set]:
+    """
+    Fetch several GIFs through Giphy's multi-ID endpoint, GIPHY_IDS_PER_REQUEST
+    per call. Returns ({giphy_id: simplified GIF}, IDs skipped because the
+    request was rate limited); IDs Giphy doesn't return are in neither.
+    """
+    chunks = [giphy_ids[i:i + GIPHY_IDS_PER_REQUEST] for i in range(0, len(giphy_ids), GIPHY_IDS_PER_REQUEST)]
+    found, skipped = {}, set()
+    fetch = unless_limited(lambda chunk: giphy_get("", {"api_key": api_key, "ids": ",".join(chunk)}))
+    for chunk, data in zip(chunks, run_concurrently(fetch, chunks)):
+        if data is None:
+            skipped.update(chunk)
+            continue
+        for gif in data.get("data", []):
+            result = simplify_gif(gif)
+            found[result["giphy_id"]] = result
+    return found, skipped
 
+
+def simplify_gif(gif: dict) -> dict:
+    """Reduce a Giphy GIF object to the fields media slots use."""
     images = gif.get("images", {})
     original = images.get("original", {})
     original_mp4 = images.get("original_mp4", {})
     still = images.get("original_still", {})
     fixed = images.get("fixed_width", {})
 
+    # Prefer original_mp4, fall back to fixed_width mp4
     mp4_url = original_mp4.get("mp4", "") or fixed.get("mp4", "")
 
     return {
@@ -116,9 +340,88 @@ def fetch_giphy_by_id(giphy_id: str, api_key: str) -> dict:
         "height": int(original.get("height", 0) or 0),
         "rating": gif.get("rating", ""),
         "source_url": gif.get("url", ""),
+        "renditions": {
+            "mp4": gif_renditions(images, MP4_RENDITIONS, "mp4", "mp4_size"),
+            "still": gif_renditions(images, STILL_RENDITIONS, "url", "size"),
+        },
     }
 
 
+def gif_renditions(images: dict, names: tuple, url_key: str, size_key: str) -> list[dict]:
+    """The named Giphy renditions that exist, with dimensions and byte size (0 if unknown)."""
+    found = []
+    for name in names:
+        image = images.get(name) or {}
+        if image.get(url_key):
+            found.append({
+                "name": name,
+                "url": image[url_key],
+                "width": int(image.get("width", 0) or 0),
+                "height": int(image.get("height", 0) or 0),
+                "bytes": int(image.get(size_key, 0) or 0),
+            })
+    return found
+
+
+def search_slot(slot: dict, api_key: str, limit: int = CANDIDATES_PER_SLOT, offset: int = 0,
+                fallback_limit: int = 0) -> list[dict]:
+    """
+    Search a slot's primary query, topping up from its fallback query (from
+    offset 0, fallback_limit results, default just enough to fill `limit`)
+    when the primary returns fewer than `limit`. Deduplicated by giphy_id.
+    """
+    source = slot.get("source", {})
+    results = search_giphy(source.get("search_query", ""), api_key, limit=limit, offset=offset)
+    fallback = source.get("fallback_query", "")
+    if len(results) < limit and fallback:
+        extra = search_giphy(fallback, api_key, limit=fallback_limit or limit - len(results))
+        seen = {r["giphy_id"] for r in results}
+        for r in extra:
+            if r["giphy_id"] not in seen:
+                results.append(r)
+                seen.add(r["giphy_id"])
+    return results
+
+
+def open_rate_limiter(per_second: float = GIPHY_MAX_RPS, per_hour: int = GIPHY_HOURLY_QUOTA,
+                      path: Path = GIPHY_QUOTA_PATH) -> RateLimiter:
+    """Budget this run's requests, counting the calls earlier runs made this hour."""
+    global _limiter
+    _limiter = RateLimiter(per_second, per_hour, path)
+    return _limiter
+
+
+def unless_limited(fn):
+    """fn, returning None instead of raising when the call is rate limited."""
+    def call(item):
+        try:
+            return fn(item)
+        except GiphyRateLimited:
+            return None
+    return call
+
+
+def report_skipped(slot_ids: list[str]) -> None:
+    if slot_ids:
+        print(f"\nSkipped {len(slot_ids)} slot(s), rate limited by Giphy: {', '.join(slot_ids)}")
+        print("  Re-run once the hourly quota frees up to fill them in.")
+
+
+def open_query_cache(path: Path = GIPHY_CACHE_PATH) -> QueryCache:
+    """Turn on the search cache for this run."""
+    global _query_cache
+    _query_cache = QueryCache(path)
+    return _query_cache
+
+
+def run_concurrently(fn, items: list) -> list:
+    """Map fn over items on up to SEARCH_WORKERS threads, results in input order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
 # ── File I/O helpers ─────────────────────────────────────────────────
 
 def load_json(path: Path) -> dict:
@@ -139,6 +442,69 @@ def content_dir(content_path: Path) -> Path:
     return content_path.parent
 
 
+SIDECAR_NAMES = ("media_picks.json", "media_cache.json", ".resolve_state.json", "preview.html")
+
+
+def sidecar_path(content_path: Path, name: str) -> Path:
+    """
+    Where a content file's picks, state, cache or preview lives: next to it,
+    prefixed with its stem minus "_content", so week3_content.json gets
+    week3_media_picks.json. The name depends only on the content file, not
+    on what else shares its directory.
+    """
+    prefix = content_path.stem.removesuffix("_content")
+    dot = "." if name.startswith(".") else ""
+    return content_dir(content_path) / f"{dot}{prefix}_{name.lstrip('.')}"
+
+
+def migrate_sidecars(out_dir: Path) -> None:
+    """
+    Move sidecars left in out_dir under the old plain names (media_picks.json,
+    ...) to their content file's prefixed names. With one content file in the
+    directory the file is renamed; with several, its entries are split by
+    slot ID between the content files whose media_slots have them. A file
+    that can't be placed whole (unknown slots, an existing prefixed copy) is
+    left alone with a warning.
+    """
+    contents = sorted(out_dir.glob("*_content.json"))
+    if not contents:
+        return
+    owners = {slot["slot_id"]: path for path in contents for slot in load_json(path).get("media_slots", [])}
+    for name in SIDECAR_NAMES:
+        legacy = out_dir / name
+        if not legacy.exists():
+            continue
+        if len(contents) == 1 or name == "preview.html":
+            target = sidecar_path(contents[0], name)
+            if len(contents) > 1:
+                print(f"WARNING: {legacy} predates per-file sidecars; re-run --preview and delete it.")
+            elif target.exists():
+                print(f"WARNING: {legacy} predates per-file sidecars and {target.name} already exists; "
+                      f"merge or delete it by hand.")
+            else:
+                legacy.rename(target)
+                print(f"Migrated {legacy} -> {target.name}")
+            continue
+
+        data = load_json(legacy)
+        entries = data.get("slots", {}) if name == "media_cache.json" else data
+        split = {}
+        for slot_id, entry in entries.items():
+            split.setdefault(owners.get(slot_id), {})[slot_id] = entry
+        strays = sorted(split.pop(None, {}))
+        clashes = [sidecar_path(path, name).name for path in split if sidecar_path(path, name).exists()]
+        if strays or clashes:
+            reason = (f"slot(s) {', '.join(strays)} match no content file" if strays
+                      else f"prefixed copies already there: {', '.join(clashes)}")
+            print(f"WARNING: {legacy} predates per-file sidecars and can't be split ({reason}); "
+                  f"move its entries by hand.")
+            continue
+        for path, part in split.items():
+            save_json(sidecar_path(path, name), {**data, "slots": part} if name == "media_cache.json" else part)
+        legacy.unlink()
+        print(f"Migrated {legacy} -> {', '.join(sidecar_path(path, name).name for path in split)}")
+
+
 # ── Core operations ──────────────────────────────────────────────────
 
 def load_content_slots(content_path: Path) -> list[dict]:
@@ -154,12 +520,11 @@ def cmd_preview(content_path: Path) -> None:
     """Search Giphy for each slot, generate preview.html with 3 candidates."""
     api_key = get_api_key()
     slots = load_content_slots(content_path)
-    out_dir = content_dir(content_path)
-    picks_path = out_dir / "media_picks.json"
+    picks_path = sidecar_path(content_path, "media_picks.json")
     picks = load_json(picks_path)
 
     # State file for tracking offsets (for --more)
-    state_path = out_dir / ".resolve_state.json"
+    state_path = sidecar_path(content_path, ".resolve_state.json")
     state = load_json(state_path)
 
     giphy_slots = [s for s in slots if s.get("source", {}).get("type") != "custom"]
@@ -170,37 +535,34 @@ def cmd_preview(content_path: Path) -> None:
         return
 
     all_candidates = {}
-
-    for slot in giphy_slots:
+    offsets = {s["slot_id"]: state.get(s["slot_id"], {}).get("offset", 0) for s in giphy_slots}
+
+    print(f"  Searching Giphy for {len(giphy_slots)} slot(s)...")
+    started = time.perf_counter()
+    found = run_concurrently(unless_limited(lambda slot: search_slot(slot, api_key, offset=offsets[slot["slot_id"]])),
+                             giphy_slots)
+    skipped = []
+    for slot, results in zip(giphy_slots, found):
         slot_id = slot["slot_id"]
-        source = slot["source"]
-        query = source.get("search_query", "")
-        fallback = source.get("fallback_query", "")
-        offset = state.get(slot_id, {}).get("offset", 0)
-
-        print(f"  Searching Giphy for [{slot_id}]: \"{query}\" (offset={offset})")
-        results = search_giphy(query, api_key, limit=CANDIDATES_PER_SLOT, offset=offset)
-
-        # Use fallback if primary returned < 3 results
-        if len(results) < CANDIDATES_PER_SLOT and fallback:
-            print(f"    < {CANDIDATES_PER_SLOT} results, trying fallback: \"{fallback}\"")
-            extra = search_giphy(fallback, api_key, limit=CANDIDATES_PER_SLOT - len(results))
-            # Deduplicate by giphy_id
-            seen = {r["giphy_id"] for r in results}
-            for r in extra:
-                if r["giphy_id"] not in seen:
-                    results.append(r)
-                    seen.add(r["giphy_id"])
-
+        offset = offsets[slot_id]
+        if results is None:
+            skipped.append(slot_id)
+            all_candidates[slot_id] = []
+            continue
+        print(f"  [{slot_id}] \"{slot['source'].get('search_query', '')}\" (offset={offset}): "
+              f"{len(results)} result(s)")
         all_candidates[slot_id] = results[:CANDIDATES_PER_SLOT]
 
         # Save offset state for --more
         state.setdefault(slot_id, {})["offset"] = offset + len(results)
 
     save_json(state_path, state)
+    cache_note = f" ({_query_cache.hits} cached, {_query_cache.misses} fetched)" if _query_cache else ""
+    print(f"  Searched in {time.perf_counter() - started:.1f}s{cache_note}")
+    report_skipped(skipped)
 
     # Generate preview.html
-    preview_path = out_dir / "preview.html"
+    preview_path = sidecar_path(content_path, "preview.html")
     html = _build_preview_html(slots, all_candidates, picks)
     preview_path.write_text(html, encoding="utf-8")
 
@@ -218,7 +580,6 @@ def cmd_more(content_path: Path, slot_id: str) -> None:
     """Fetch next 3 candidates for a specific slot."""
     api_key = get_api_key()
     slots = load_content_slots(content_path)
-    out_dir = content_dir(content_path)
 
     slot = next((s for s in slots if s["slot_id"] == slot_id), None)
     if not slot:
@@ -229,7 +590,7 @@ def cmd_more(content_path: Path, slot_id: str) -> None:
         print(f"ERROR: Slot '{slot_id}' is a custom slot, not Giphy.")
         sys.exit(1)
 
-    state_path = out_dir / ".resolve_state.json"
+    state_path = sidecar_path(content_path, ".resolve_state.json")
     state = load_json(state_path)
     offset = state.get(slot_id, {}).get("offset", 0)
 
@@ -237,7 +598,11 @@ def cmd_more(content_path: Path, slot_id: str) -> None:
     query = source.get("search_query", "")
 
     print(f"Fetching more for [{slot_id}]: \"{query}\" (offset={offset})")
-    results = search_giphy(query, api_key, limit=CANDIDATES_PER_SLOT, offset=offset)
+    try:
+        results = search_giphy(query, api_key, limit=CANDIDATES_PER_SLOT, offset=offset)
+    except GiphyRateLimited as e:
+        print(f"ERROR: Rate limited by Giphy ({e}). Try again later.")
+        sys.exit(1)
 
     if not results:
         print("  No more results available.")
@@ -255,48 +620,51 @@ def cmd_more(content_path: Path, slot_id: str) -> None:
     print("\nRe-run --preview to update preview.html with these new candidates.")
 
 
-def cmd_candidates_json(content_path: Path, slot_id: str) -> None:
-    """Return JSON candidates for a slot to stdout. For agent/script use."""
+def cmd_candidates_json(content_path: Path, slot_ids: list[str]) -> None:
+    """
+    Return JSON candidates for one or more slots to stdout. For agent/script
+    use. One slot prints its object; several print a list, searched
+    concurrently.
+    """
     api_key = get_api_key()
     slots = load_content_slots(content_path)
 
-    slot = next((s for s in slots if s["slot_id"] == slot_id), None)
-    if not slot:
-        print(json.dumps({"error": f"Slot '{slot_id}' not found"}))
-        sys.exit(1)
-
-    if slot.get("source", {}).get("type") == "custom":
-        print(json.dumps({"error": f"Slot '{slot_id}' is custom, no Giphy candidates"}))
-        sys.exit(1)
-
-    source = slot["source"]
-    primary_query = source.get("search_query", "")
-    fallback_query = source.get("fallback_query", "")
-
-    results = search_giphy(primary_query, api_key, limit=CANDIDATES_PER_SLOT)
-    if len(results) < CANDIDATES_PER_SLOT and fallback_query:
-        seen = {r["giphy_id"] for r in results}
-        extra = search_giphy(fallback_query, api_key, limit=CANDIDATES_PER_SLOT)
-        for r in extra:
-            if r["giphy_id"] not in seen:
-                results.append(r)
-                seen.add(r["giphy_id"])
-
-    output = {
-        "slot_id": slot_id,
-        "intent": slot.get("intent", ""),
-        "alt_text": slot.get("alt_text", ""),
-        "primary_query": primary_query,
-        "fallback_query": fallback_query,
-        "candidates": results[:CANDIDATES_PER_SLOT],
-    }
-    print(json.dumps(output, indent=2))
+    wanted = []
+    for slot_id in slot_ids:
+        slot = next((s for s in slots if s["slot_id"] == slot_id), None)
+        if not slot:
+            print(json.dumps({"error": f"Slot '{slot_id}' not found"}))
+            sys.exit(1)
+
+        if slot.get("source", {}).get("type") == "custom":
+            print(json.dumps({"error": f"Slot '{slot_id}' is custom, no Giphy candidates"}))
+            sys.exit(1)
+        wanted.append(slot)
+
+    found = run_concurrently(unless_limited(lambda slot: search_slot(slot, api_key,
+                                                                     fallback_limit=CANDIDATES_PER_SLOT)),
+                             wanted)
+    outputs = []
+    for slot, results in zip(wanted, found):
+        if results is None:
+            outputs.append({"slot_id": slot["slot_id"], "error": "Skipped, rate limited by Giphy"})
+            continue
+        source = slot["source"]
+        outputs.append({
+            "slot_id": slot["slot_id"],
+            "intent": slot.get("intent", ""),
+            "alt_text": slot.get("alt_text", ""),
+            "primary_query": source.get("search_query", ""),
+            "fallback_query": source.get("fallback_query", ""),
+            "candidates": [{k: v for k, v in r.items() if k != "renditions"}
+                           for r in results[:CANDIDATES_PER_SLOT]],
+        })
+    print(json.dumps(outputs[0] if len(outputs) == 1 else outputs, indent=2))
 
 
 def cmd_pick(content_path: Path, slot_id: str, giphy_id: str) -> None:
     """Write a pick to media_picks.json. Never touches content JSON."""
     slots = load_content_slots(content_path)
-    out_dir = content_dir(content_path)
 
     slot = next((s for s in slots if s["slot_id"] == slot_id), None)
     if not slot:
@@ -307,7 +675,7 @@ def cmd_pick(content_path: Path, slot_id: str, giphy_id: str) -> None:
         print(f"ERROR: Slot '{slot_id}' is a custom slot. No Giphy pick needed.")
         sys.exit(1)
 
-    picks_path = out_dir / "media_picks.json"
+    picks_path = sidecar_path(content_path, "media_picks.json")
     picks = load_json(picks_path)
     picks[slot_id] = giphy_id
     save_json(picks_path, picks)
@@ -316,32 +684,52 @@ def cmd_pick(content_path: Path, slot_id: str, giphy_id: str) -> None:
     print(f"  Saved to: {picks_path}")
 
 
-def cmd_resolve(content_path: Path) -> None:
-    """Produce final media_cache.json with resolved URLs."""
+def plan_resolve(content_path: Path, force: bool = False) -> dict:
+    """
+    Work out what resolving one content file needs. Slots whose cached entry
+    still matches (same picked ID, or the same search for auto-picked slots)
+    are reused; the rest are picked IDs to fetch or slots to search.
+    force=True ignores the existing cache.
+    """
     slots = load_content_slots(content_path)
-    out_dir = content_dir(content_path)
-    picks_path = out_dir / "media_picks.json"
-    picks = load_json(picks_path)
-    cache_path = out_dir / "media_cache.json"
+    picks = load_json(sidecar_path(content_path, "media_picks.json"))
+    cache_path = sidecar_path(content_path, "media_cache.json")
+    cached_slots = {} if force else load_json(cache_path).get("slots", {})
 
-    # Check if we need the API key (any unresolved giphy slots?)
     giphy_slots = [s for s in slots if s.get("source", {}).get("type") != "custom"]
-    needs_api = False
+    reused = {}
     for slot in giphy_slots:
-        sid = slot["slot_id"]
-        if sid not in picks:
-            needs_api = True  # need to auto-pick via search
-            break
-        # Even with a pick, we need to fetch its metadata
-        needs_api = True
+        entry = reusable_entry(slot, picks.get(slot["slot_id"]), cached_slots.get(slot["slot_id"]))
+        if entry:
+            reused[slot["slot_id"]] = entry
+    return {
+        "content_path": content_path,
+        "slots": slots,
+        "picks": picks,
+        "cache_path": cache_path,
+        "cached_slots": cached_slots,
+        "reused": reused,
+        "to_fetch": sorted({picks[s["slot_id"]] for s in giphy_slots
+                            if s["slot_id"] not in reused and picks.get(s["slot_id"])}),
+        "to_search": [s for s in giphy_slots if s["slot_id"] not in reused and not picks.get(s["slot_id"])],
+    }
 
-    api_key = None
-    if needs_api:
-        api_key = get_api_key()
 
+def apply_resolve(plan: dict, fetched: dict, searched: dict, limited_ids: set = frozenset()) -> tuple[dict, list]:
+    """
+    Build and write one file's media_cache.json from its plan, the fetched
+    picks ({giphy_id: GIF}) and search results ({slot_id: [GIF, ...]}, None
+    where the search was rate limited). Picks in limited_ids weren't fetched
+    for the same reason. A rate-limited slot keeps its previous cache entry,
+    if it has one. The file is left alone if nothing changed. Returns the
+    resolved slots and the IDs of the rate-limited slots.
+    """
+    picks, reused = plan["picks"], plan["reused"]
+    cache_path, cached_slots = plan["cache_path"], plan["cached_slots"]
     resolved_slots = {}
+    skipped = []
 
-    for slot in slots:
+    for slot in plan["slots"]:
         sid = slot["slot_id"]
         source = slot.get("source", {})
         stype = source.get("type", "giphy")
@@ -358,27 +746,35 @@ def cmd_resolve(content_path: Path) -> None:
         # Giphy slot
         giphy_id = picks.get(sid)
 
-        if giphy_id:
-            # Fetch specific GIF metadata
-            print(f"  [{sid}] resolving picked ID: {giphy_id}")
-            result = fetch_giphy_by_id(giphy_id, api_key)
-        else:
-            # Auto-pick: search and take top result
-            query = source.get("search_query", "")
-            fallback = source.get("fallback_query", "")
-            print(f"  [{sid}] no pick — auto-selecting from: \"{query}\"")
+        if sid in reused:
+            resolved_slots[sid] = {**reused[sid], "alt_text": slot.get("alt_text", "")}
+            print(f"  [{sid}] unchanged: {reused[sid]['giphy_id']}")
+            continue
 
-            results = search_giphy(query, api_key, limit=1)
-            if not results and fallback:
-                print(f"    Trying fallback: \"{fallback}\"")
-                results = search_giphy(fallback, api_key, limit=1)
+        limited = giphy_id in limited_ids if giphy_id else searched[sid] is None
+        if limited:
+            skipped.append(sid)
+            if cached_slots.get(sid):
+                resolved_slots[sid] = cached_slots[sid]
+                print(f"  [{sid}] skipped (Giphy rate limit), kept previous: {cached_slots[sid].get('giphy_id', '?')}")
+            else:
+                print(f"  [{sid}] skipped (Giphy rate limit), left unresolved")
+            continue
 
+        if giphy_id:
+            result = fetched.get(giphy_id)
+            if not result:
+                print(f"  [{sid}] WARNING: Giphy returned nothing for picked ID {giphy_id}. Skipping.")
+                continue
+            print(f"  [{sid}] resolved picked ID: {giphy_id}")
+        else:
+            print(f"  [{sid}] no pick — auto-selecting from: \"{source.get('search_query', '')}\"")
+            results = searched[sid]
             if not results:
                 print(f"    WARNING: No Giphy results for [{sid}]. Skipping.")
                 continue
-
             result = results[0]
-            print(f"    Auto-picked: {result['giphy_id']} — {result['title']}")
+            print(f"    Auto-picked: {result['giphy_id']} — {result.get('title', '')}")
 
         resolved_slots[sid] = {
             "giphy_id": result["giphy_id"],
@@ -390,16 +786,342 @@ def cmd_resolve(content_path: Path) -> None:
             "rating": result["rating"],
             "source_url": result.get("source_url", ""),
         }
+        if result.get("renditions"):
+            resolved_slots[sid]["renditions"] = result["renditions"]
+        if not giphy_id:
+            # Remember which search chose it, so a later run can tell if it's stale
+            resolved_slots[sid]["auto_query"] = [source.get("search_query", ""), source.get("fallback_query", "")]
+
+    n_giphy = len([s for s in resolved_slots.values() if s.get("type") != "custom"])
+    n_custom = len([s for s in resolved_slots.values() if s.get("type") == "custom"])
+    if resolved_slots == cached_slots and cache_path.exists():
+        print(f"\nCache unchanged: {cache_path}")
+    else:
+        cache = {
+            "resolved_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "attribution": "Powered by GIPHY",
+            "slots": resolved_slots,
+        }
+        save_json(cache_path, cache)
+        print(f"\nCache written: {cache_path}")
+    print(f"  {len(resolved_slots)} slots resolved ({n_giphy} Giphy, {n_custom} custom); "
+          f"{len(reused)} reused, {len(plan['to_fetch'])} picked ID(s) fetched, "
+          f"{len(plan['to_search'])} searched")
+    return resolved_slots, skipped
+
+
+def cmd_resolve(content_path: Path, force: bool = False, mirror: bool = False) -> None:
+    """
+    Produce final media_cache.json with resolved URLs, incrementally.
+
+    Only alt text is refreshed on reused slots. New picks are fetched
+    together through Giphy's multi-ID endpoint, unpicked slots are searched.
+    With nothing changed this makes no requests and leaves the file alone.
+    mirror=True then downloads each slot's media into the local store.
+    """
+    plan = plan_resolve(content_path, force)
+    to_fetch, to_search = plan["to_fetch"], plan["to_search"]
+
+    # The API key is only needed if some slot isn't already resolved
+    api_key = None
+    if to_fetch or to_search:
+        api_key = get_api_key()
 
-    cache = {
-        "resolved_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "attribution": "Powered by GIPHY",
-        "slots": resolved_slots,
-    }
+    fetched, limited_ids = fetch_giphy_by_ids(to_fetch, api_key) if to_fetch else ({}, set())
+    searched = dict(zip((s["slot_id"] for s in to_search),
+                        run_concurrently(unless_limited(lambda slot: search_slot(slot, api_key, limit=1)),
+                                         to_search)))
+    resolved, skipped = apply_resolve(plan, fetched, searched, limited_ids)
+    print(f"  {_limiter.calls} API request(s)")
+    report_skipped(skipped)
+    if mirror:
+        mirror_media([(plan["cache_path"], resolved, plan["slots"])])
+
+
+def discover_content(root: Path = CONTENT_ROOT) -> list[Path]:
+    """Every *_content.json under root that has media slots."""
+    return [p for p in sorted(root.rglob("*_content.json")) if load_json(p).get("media_slots")]
+
+
+def search_key(slot: dict) -> tuple:
+    source = slot.get("source", {})
+    return source.get("search_query", ""), source.get("fallback_query", "")
+
+
+def cmd_resolve_all(root: Path = CONTENT_ROOT, force: bool = False, mirror: bool = False) -> None:
+    """
+    Resolve every content file under root in one run.
+
+    Plans every file first, then makes one deduplicated round of requests
+    for all of them: each GIF ID is fetched once (and not at all if any
+    file's media_cache.json already has it), each distinct search runs once.
+    Writes each file's own media_cache.json plus content/media_index.json.
+    mirror=True downloads every slot's media into the local store first,
+    each file once across all content.
+    """
+    files = discover_content(root)
+    if not files:
+        print(f"No content files with media slots under {root}")
+        return
+    for out_dir in sorted({content_dir(path) for path in files}):
+        migrate_sidecars(out_dir)
+    plans = [plan_resolve(path, force) for path in files]
+
+    # GIF metadata doesn't depend on the slot, so a GIF cached for any file
+    # serves a pick of the same GIF in every other file
+    known = {}
+    for plan in plans:
+        for entry in plan["cached_slots"].values():
+            if entry.get("giphy_id") and entry.get("mp4_url"):
+                known.setdefault(entry["giphy_id"], entry)
+    wanted = sorted({gid for plan in plans for gid in plan["to_fetch"]})
+    new_ids = [gid for gid in wanted if gid not in known]
+    searches = {}  # (query, fallback) -> first slot asking for it
+    for plan in plans:
+        for slot in plan["to_search"]:
+            searches.setdefault(search_key(slot), slot)
+
+    n_slots = sum(len(plan["slots"]) for plan in plans)
+    n_search_slots = sum(len(plan["to_search"]) for plan in plans)
+    print(f"{len(files)} content file(s), {n_slots} slots: "
+          f"{sum(len(plan['reused']) for plan in plans)} unchanged, "
+          f"{len(wanted)} GIF ID(s) to resolve ({len(wanted) - len(new_ids)} already known), "
+          f"{len(searches)} distinct search(es) for {n_search_slots} slot(s)")
 
-    save_json(cache_path, cache)
-    print(f"\nCache written: {cache_path}")
-    print(f"  {len(resolved_slots)} slots resolved ({len([s for s in resolved_slots.values() if s.get('type') != 'custom'])} Giphy, {len([s for s in resolved_slots.values() if s.get('type') == 'custom'])} custom)")
+    api_key = None
+    if new_ids or searches:
+        api_key = get_api_key()
+    fetched = {gid: known[gid] for gid in wanted if gid in known}
+    limited_ids = set()
+    if new_ids:
+        new, limited_ids = fetch_giphy_by_ids(new_ids, api_key)
+        fetched.update(new)
+    found = dict(zip(searches, run_concurrently(unless_limited(lambda slot: search_slot(slot, api_key, limit=1)),
+                                                list(searches.values()))))
+
+    resolved, skipped = {}, []
+    for plan in plans:
+        print(f"\n{plan['content_path']}")
+        searched = {slot["slot_id"]: found[search_key(slot)] for slot in plan["to_search"]}
+        slots, plan_skipped = apply_resolve(plan, fetched, searched, limited_ids)
+        resolved[plan["content_path"]] = (plan["cache_path"], slots)
+        skipped += plan_skipped
+    print(f"\n{_limiter.calls} API request(s)")
+    report_skipped(skipped)
+
+    if mirror:
+        mirror_media([(plan["cache_path"], resolved[plan["content_path"]][1], plan["slots"]) for plan in plans])
+
+    index_path = write_media_index(resolved, root)
+    print(f"\nIndex: {index_path}")
+    print(f"Done: {len(files)} content file(s)")
+
+
+def write_media_index(resolved: dict, root: Path = CONTENT_ROOT) -> Path:
+    """
+    content/media_index.json: each content file's cache, and every GIF in
+    use with the slots using it. Rewritten only when its contents change.
+    """
+    def rel(path):
+        path = Path(path).resolve()
+        return path.relative_to(PROJECT_DIR.resolve()).as_posix() if path.is_relative_to(PROJECT_DIR.resolve()) \
+            else path.as_posix()
+
+    files, gifs = {}, {}
+    for content_path, (cache_path, slots) in resolved.items():
+        files[rel(content_path)] = {"cache": rel(cache_path), "slots": len(slots)}
+        for sid, entry in slots.items():
+            if entry.get("type") == "custom":
+                continue
+            gif = gifs.setdefault(entry["giphy_id"], {
+                k: entry[k] for k in ("mp4_url", "poster_url", "width", "height", "rating", "source_url", "local")
+                if k in entry
+            })
+            gif.setdefault("used_by", []).append(f"{rel(content_path)}#{sid}")
+
+    path = root / "media_index.json"
+    index = {"attribution": "Powered by GIPHY", "files": files, "gifs": dict(sorted(gifs.items()))}
+    existing = load_json(path)
+    existing.pop("generated_at", None)
+    if existing != index:
+        save_json(path, {"generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"), **index})
+    return path
+
+
+def reusable_entry(slot: dict, pick: str, entry: dict) -> dict:
+    """The cached entry for a Giphy slot if it still reflects the slot's pick (or search), else None."""
+    if not entry or entry.get("type") == "custom" or not entry.get("mp4_url"):
+        return None
+    if pick:
+        # Same GIF, same metadata — whether it was picked or auto-picked before
+        if entry.get("giphy_id") != pick:
+            return None
+        entry = dict(entry)
+        entry.pop("auto_query", None)
+        return entry
+    source = slot.get("source", {})
+    if entry.get("auto_query") != [source.get("search_query", ""), source.get("fallback_query", "")]:
+        return None
+    return entry
+
+
+# ── Local media mirror ───────────────────────────────────────────────
+
+class MediaStore:
+    """
+    Content-addressed mirror of remote media under media/giphy/.
+
+    Files are named by the SHA-256 of their bytes, so a GIF reached from
+    several slots, content files or URLs is stored once. manifest.json maps
+    each source URL to its file, hash and byte size, so a URL already
+    mirrored (and still on disk) is never downloaded again. fetch() is
+    thread-safe.
+    """
+
+    def __init__(self, root: Path = MEDIA_STORE, manifest_path: Path = MEDIA_MANIFEST):
+        self.root = root
+        self.manifest_path = manifest_path
+        self.urls = load_json(manifest_path).get("urls", {})  # url -> {sha256, path, bytes, content_type}
+        self.downloaded = self.downloaded_bytes = 0
+        self.lock = threading.Lock()
+
+    def local(self, url: str) -> "dict | None":
+        record = self.urls.get(url)
+        if record and (PROJECT_DIR / record["path"]).exists():
+            return record
+        return None
+
+    def fetch(self, url: str) -> "dict | None":
+        """Download url into the store (unless mirrored already). Returns its record, None on failure."""
+        record = self.local(url)
+        if record:
+            return record
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        tmp = self.root / f".download-{threading.get_ident()}-{time.monotonic_ns()}"
+        try:
+            with get_session().get(url, stream=True, timeout=30) as resp:
+                resp.raise_for_status()
+                content_type = resp.headers.get("Content-Type", "").split(";")[0]
+                size = 0
+                with open(tmp, "wb") as f:
+                    for chunk in resp.iter_content(64 * 1024):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+        except (requests.RequestException, OSError) as e:
+            print(f"    WARNING: Could not mirror {url}: {e}")
+            tmp.unlink(missing_ok=True)
+            return None
+
+        sha = digest.hexdigest()
+        ext = Path(urlparse(url).path).suffix.lower() or MEDIA_EXTENSIONS.get(content_type, "")
+        path = self.root / f"{sha[:16]}{ext}"
+        if path.exists():
+            tmp.unlink()  # same bytes already stored under another URL
+        else:
+            tmp.replace(path)
+        record = {"sha256": sha, "path": path.relative_to(PROJECT_DIR).as_posix(), "bytes": size,
+                  "content_type": content_type}
+        with self.lock:
+            self.urls[url] = record
+            self.downloaded += 1
+            self.downloaded_bytes += size
+        return record
+
+    def save(self) -> None:
+        save_json(self.manifest_path, {"urls": dict(sorted(self.urls.items()))})
+
+
+def choose_rendition(renditions: list[dict], display_width: int) -> "dict | None":
+    """
+    The smallest rendition at least display_width wide — by byte size where
+    Giphy reports it for all of them, otherwise by pixel area — or the
+    widest one if none is that wide.
+    """
+    if not renditions:
+        return None
+    fitting = [r for r in renditions if r["width"] >= display_width]
+    if not fitting:
+        return max(renditions, key=lambda r: (r["width"], -r["bytes"]))
+    if all(r["bytes"] for r in fitting):
+        return min(fitting, key=lambda r: (r["bytes"], r["width"]))
+    return min(fitting, key=lambda r: (r["width"] * r["height"], r["bytes"]))
+
+
+def slot_renditions(entry: dict) -> tuple[list[dict], list[dict]]:
+    """(mp4, still) renditions of a resolved slot; entries cached before renditions were kept fall back to their one URL."""
+    renditions = entry.get("renditions") or {}
+    size = {"width": entry.get("width", 0), "height": entry.get("height", 0), "bytes": 0}
+    mp4 = renditions.get("mp4") or ([{"name": "original", "url": entry["mp4_url"], **size}]
+                                    if entry.get("mp4_url") else [])
+    still = renditions.get("still") or ([{"name": "original_still", "url": entry["poster_url"], **size}]
+                                        if entry.get("poster_url") else [])
+    return mp4, still
+
+
+def mirror_media(files: list[tuple]) -> None:
+    """
+    Mirror the right-sized MP4 and poster of every Giphy slot into the local
+    store and record them under each slot's "local" key. files is
+    [(cache_path, resolved_slots, content_slots)]; each slot's display width
+    is its content "display_width" or MEDIA_DISPLAY_WIDTH. Each URL is
+    downloaded once however many slots use it; cache files are rewritten
+    only if a slot's local copy changed.
+    """
+    store = MediaStore()
+    choices = {}  # (cache_path, slot_id) -> (mp4 rendition, still rendition)
+    for cache_path, resolved, content_slots in files:
+        widths = {s["slot_id"]: int(s.get("display_width") or MEDIA_DISPLAY_WIDTH) for s in content_slots}
+        for sid, entry in resolved.items():
+            if entry.get("type") == "custom":
+                continue
+            mp4, still = slot_renditions(entry)
+            width = widths.get(sid, MEDIA_DISPLAY_WIDTH)
+            choices[(cache_path, sid)] = (choose_rendition(mp4, width), choose_rendition(still, width))
+
+    urls = sorted({r["url"] for pair in choices.values() for r in pair if r})
+    missing = [url for url in urls if not store.local(url)]
+    print(f"\nMirroring media: {len(choices)} slot(s), {len(urls)} file(s), "
+          f"{len(urls) - len(missing)} already local")
+    run_concurrently(store.fetch, missing)
+    store.save()
+
+    local_bytes = original_bytes = 0
+    for cache_path, resolved, _ in files:
+        changed = False
+        for sid, entry in resolved.items():
+            if (cache_path, sid) not in choices:
+                continue
+            mp4, still = choices[(cache_path, sid)]
+            mp4_record = store.local(mp4["url"]) if mp4 else None
+            if not mp4_record:
+                print(f"  [{sid}] WARNING: no local copy, page will hot-link {entry.get('mp4_url', '?')}")
+                continue
+            local = {
+                "mp4": mp4_record["path"],
+                "mp4_bytes": mp4_record["bytes"],
+                "rendition": mp4["name"],
+                "width": mp4["width"] or entry.get("width", 0),
+                "height": mp4["height"] or entry.get("height", 0),
+            }
+            still_record = store.local(still["url"]) if still else None
+            if still_record:
+                local.update(poster=still_record["path"], poster_bytes=still_record["bytes"])
+            local_bytes += local["mp4_bytes"]
+            original = next((r for r in slot_renditions(entry)[0] if r["url"] == entry.get("mp4_url")), None)
+            original_bytes += (original or {}).get("bytes") or local["mp4_bytes"]
+            if entry.get("local") != local:
+                entry["local"] = local
+                changed = True
+        if changed:
+            cache = load_json(cache_path)
+            cache["slots"] = resolved
+            save_json(cache_path, cache)
+            print(f"  Local copies recorded in {cache_path}")
+
+    print(f"  Downloaded {store.downloaded} file(s) ({store.downloaded_bytes / 1024:.0f} KB); "
+          f"slot MP4s total {local_bytes / 1024:.0f} KB vs {original_bytes / 1024:.0f} KB for originals")
 
 
 # ── Preview HTML generator ───────────────────────────────────────────
@@ -508,37 +1230,76 @@ def main():
     parser = argparse.ArgumentParser(
         description="Resolve media slots in Jailyard content JSON via Giphy API."
     )
-    parser.add_argument(
-        "--content", required=True, type=Path,
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--content", type=Path,
         help="Path to content JSON (e.g. content/preseason-2026/preseason_content.json)"
     )
+    target.add_argument(
+        "--all-content", action="store_true",
+        help="With --resolve: every *_content.json under content/, in one deduplicated run"
+    )
 
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--preview", action="store_true", help="Generate preview.html with 3 candidates per slot")
     group.add_argument("--more", metavar="SLOT_ID", help="Fetch next 3 candidates for a specific slot")
     group.add_argument("--pick", nargs=2, metavar=("SLOT_ID", "GIPHY_ID"), help="Set a Giphy pick for a slot")
-    group.add_argument("--resolve", action="store_true", help="Produce final media_cache.json")
+    group.add_argument("--resolve", action="store_true",
+                       help="Produce final media_cache.json (only new or changed slots hit the API)")
     group.add_argument(
-        "--candidates-json", metavar="SLOT_ID",
-        help="Return JSON candidates for a slot to stdout (for agent use)"
+        "--candidates-json", metavar="SLOT_ID", nargs="+",
+        help="Return JSON candidates for one or more slots to stdout (for agent use)"
     )
 
+    parser.add_argument("--api-base", help=f"Giphy API base URL (default $GIPHY_API_BASE or {DEFAULT_GIPHY_API_BASE})")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the search cache")
+    parser.add_argument("--hourly-quota", type=int, default=GIPHY_HOURLY_QUOTA,
+                        help=f"Giphy requests allowed per rolling hour for this key, 0 for no limit "
+                             f"(default $GIPHY_HOURLY_QUOTA or {GIPHY_HOURLY_QUOTA}; beta keys get 100)")
+    parser.add_argument("--force", action="store_true",
+                        help="With --resolve, re-fetch every slot instead of reusing media_cache.json")
+    parser.add_argument("--mirror", action="store_true",
+                        help="With --resolve, download each slot's right-sized MP4 and poster into media/giphy/")
+
     args = parser.parse_args()
 
-    if not args.content.exists():
+    if args.api_base:
+        global GIPHY_API_BASE
+        GIPHY_API_BASE = args.api_base.rstrip("/")
+
+    if args.all_content and not args.resolve:
+        print("ERROR: --all-content only works with --resolve.")
+        sys.exit(2)
+    if args.mirror and not args.resolve:
+        print("ERROR: --mirror only works with --resolve.")
+        sys.exit(2)
+
+    if args.content and not args.content.exists():
         print(f"ERROR: Content file not found: {args.content}")
         sys.exit(2)
 
-    if args.preview:
-        cmd_preview(args.content)
-    elif args.more:
-        cmd_more(args.content, args.more)
-    elif args.pick:
-        cmd_pick(args.content, args.pick[0], args.pick[1])
-    elif args.resolve:
-        cmd_resolve(args.content)
-    elif args.candidates_json:
-        cmd_candidates_json(args.content, args.candidates_json)
+    if args.content:
+        migrate_sidecars(content_dir(args.content))
+
+    cache = None if args.no_cache else open_query_cache()
+    limiter = open_rate_limiter(per_hour=args.hourly_quota)
+    try:
+        if args.all_content:
+            cmd_resolve_all(force=args.force, mirror=args.mirror)
+        elif args.preview:
+            cmd_preview(args.content)
+        elif args.more:
+            cmd_more(args.content, args.more)
+        elif args.pick:
+            cmd_pick(args.content, args.pick[0], args.pick[1])
+        elif args.resolve:
+            cmd_resolve(args.content, force=args.force, mirror=args.mirror)
+        elif args.candidates_json:
+            cmd_candidates_json(args.content, args.candidates_json)
+    finally:
+        limiter.save()
+        if cache is not None:
+            cache.save()
 
 
 if __name__ == "__main__":